@@ -0,0 +1,281 @@
+# analysis.py — 패널별 집계 로직 (Streamlit 의존성 없음)
+# 모든 집계 함수는 by=[...] 키(예: ["champion"])를 앞에 붙여 한 번에 그룹 집계할 수 있다.
+import re
+import numpy as np
+import pandas as pd
+
+from catalog import ItemCatalog, NO_ITEM
+from confidence import add_intervals, pooled_rate
+
+SPELL_ALIASES = {
+    "점멸":"점멸","표식":"표식","눈덩이":"표식","유체화":"유체화","회복":"회복","점화":"점화",
+    "정화":"정화","탈진":"탈진","방어막":"방어막","총명":"총명","순간이동":"순간이동",
+    "flash":"점멸","mark":"표식","snowball":"표식","ghost":"유체화","haste":"유체화",
+    "heal":"회복","ignite":"점화","cleanse":"정화","exhaust":"탈진","barrier":"방어막",
+    "clarity":"총명","teleport":"순간이동",
+}
+
+# ===== 유틸 =====
+def item_columns(df: pd.DataFrame) -> list:
+    return [c for c in df.columns if re.fullmatch(r"item[0-6]_name", c)]
+
+def standard_korean_spell(s: str) -> str:
+    return SPELL_ALIASES.get(str(s).strip(), str(s).strip())
+
+def canonical_pair(a: str, b: str):
+    a_std = standard_korean_spell(a or "")
+    b_std = standard_korean_spell(b or "")
+    if a_std <= b_std:
+        return a_std, b_std
+    return b_std, a_std
+
+def pick_spell_cols(df_):
+    if {"spell1_name_fix","spell2_name_fix"}.issubset(df_.columns):
+        return "spell1_name_fix", "spell2_name_fix"
+    if {"spell1","spell2"}.issubset(df_.columns):
+        return "spell1", "spell2"
+    cands = [c for c in df_.columns if "spell" in c.lower()]
+    return (cands[0], cands[1]) if len(cands) >= 2 else (None, None)
+
+# ===== 스펠 / 룬 파편 인코딩 (로드 시 한 번) =====
+SPELL_STD_COLS = ["spell1_std","spell2_std"]
+SHARD_COLS = ["shard1","shard2","shard3"]
+
+def _factorize(s: pd.Series):
+    """행별 코드 + 고유값 (categorical이면 카테고리 그대로, 결측은 빈 문자열)"""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        uniq = np.append(s.cat.categories.to_numpy(dtype=object), "")
+        codes = s.cat.codes.to_numpy()
+        return np.where(codes < 0, len(uniq) - 1, codes), uniq
+    codes, uniq = pd.factorize(s.fillna(""))
+    return codes, np.asarray(uniq, dtype=object)
+
+def _recode(codes_uniqs: list, values: list) -> list:
+    """고유값별 변환 결과(values) -> 공유 정렬 카테고리의 Categorical (코드 순서 = 문자열 순서)"""
+    cats = sorted(set().union(*values))
+    lookups = [pd.Index(cats).get_indexer(v) for v in values]
+    return [pd.Categorical.from_codes(lk[codes], cats) for (codes, _), lk in zip(codes_uniqs, lookups)]
+
+def spell_std_columns(df: pd.DataFrame) -> list:
+    """[spell1_std, spell2_std] — SPELL_ALIASES 표준 이름 Categorical (두 컬럼 카테고리 공유).
+    로드 시 인코딩돼 있으면 그대로, 아니면 고유값만 변환"""
+    if set(SPELL_STD_COLS).issubset(df.columns):
+        return [df[c].array for c in SPELL_STD_COLS]
+    cu = [_factorize(df[c]) for c in pick_spell_cols(df)]
+    return _recode(cu, [[standard_korean_spell(u) for u in uniq] for _, uniq in cu])
+
+def shard_columns(df: pd.DataFrame) -> list:
+    """rune_shards("A|B|C") -> [shard1, shard2, shard3] Categorical (고유 문자열만 분해)"""
+    if set(SHARD_COLS).issubset(df.columns):
+        return [df[c].array for c in SHARD_COLS]
+    codes, uniq = _factorize(df["rune_shards"])
+    parts = [([x.strip() for x in str(u).split("|")] + ["", "", ""])[:3] if u else ["", "", ""] for u in uniq]
+    return [_recode([(codes, uniq)], [[p[j] for p in parts]])[0] for j in range(3)]
+
+def encode_attributes(df: pd.DataFrame) -> pd.DataFrame:
+    """스펠 표준 이름(spell1_std/spell2_std), 룬 파편(shard1~3) Categorical 컬럼 추가"""
+    s1, s2 = pick_spell_cols(df)
+    if s1 and s2:
+        for c, v in zip(SPELL_STD_COLS, spell_std_columns(df)):
+            df[c] = v
+    if "rune_shards" in df.columns:
+        for c, v in zip(SHARD_COLS, shard_columns(df)):
+            df[c] = v
+    return df
+
+def _empty(keys: list) -> pd.DataFrame:
+    return pd.DataFrame(columns=keys + ["games","wins"])
+
+def _count(df: pd.DataFrame, keys: list) -> pd.DataFrame:
+    if df.empty:
+        return _empty(keys)
+    return (df.groupby(keys, as_index=False, observed=True)
+              .agg(games=("win_clean","count"), wins=("win_clean","sum")))
+
+def with_rates(tbl: pd.DataFrame, games: int, sort: list, head: int = None,
+               ci: str = "wilson", rank_lower: bool = False) -> pd.DataFrame:
+    """games/wins 집계표에 승률·픽률(선택 게임 대비)·승률 구간(win_lo/win_hi, ci 방법) 추가 후 내림차순 정렬.
+    rank_lower: 승률 하한 → 게임수 순 (표본이 적은 100% 조합이 위로 오지 않게)"""
+    t = tbl.copy()
+    t["win_rate"] = (t["wins"]/t["games"]*100).round(2)
+    t["pick_rate"] = (t["games"]/games*100).round(2)
+    prior = pooled_rate(t) if ci else None
+    if ci and rank_lower:
+        t = add_intervals(t, ci, prior_rate=prior)   # 정렬 키라 전체 그룹에 계산
+        sort = ["win_lo", "games"]
+    t = t.sort_values(sort, ascending=[False]*len(sort))
+    t = t.head(head) if head else t
+    return add_intervals(t, ci, prior_rate=prior) if ci and not rank_lower else t   # 보이는 행만
+
+# ===== 슬롯 코드 엔진 =====
+def item_codes(df: pd.DataFrame, catalog: ItemCatalog) -> np.ndarray:
+    """행×슬롯 아이템 id 배열 (로드 시 인코딩된 itemN_id 컬럼 우선)"""
+    cols = item_columns(df)
+    ids = [c.replace("_name", "_id") for c in cols]
+    if set(ids).issubset(df.columns):
+        return df[ids].to_numpy(dtype=np.int64).reshape(len(df), len(ids))
+    return np.column_stack([catalog.encode(df[c]) for c in cols]).astype(np.int64) \
+        if cols else np.empty((len(df), 0), dtype=np.int64)
+
+def first_k_codes(codes: np.ndarray, mask_tbl: np.ndarray, k: int) -> np.ndarray:
+    """행별로 mask_tbl[code]가 참인 코드를 슬롯 순서대로 최대 k개 (없으면 -1)"""
+    out = np.full((len(codes), k), -1, dtype=np.int64)
+    if codes.shape[1] == 0 or k == 0:
+        return out   # 아이템 슬롯 컬럼이 없는 입력 (빈 배열에 argmax 불가)
+    hit = np.append(mask_tbl, False)[codes]          # NO_ITEM(-1)은 항상 False
+    rank = np.cumsum(hit, axis=1)
+    for j in range(k):
+        sel = hit & (rank == j + 1)
+        found = sel.any(axis=1)
+        out[found, j] = codes[found, sel[found].argmax(axis=1)]
+    return out
+
+# ===== 패널 집계 =====
+def champion_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """챔피언별 게임수/승수/매치수"""
+    if "champion" not in df.columns:
+        return pd.DataFrame(columns=["champion","games","wins","matches"])
+    g = (df.groupby("champion", as_index=False, observed=True)
+           .agg(games=("win_clean","count"), wins=("win_clean","sum")))
+    g["matches"] = (df.groupby("champion", observed=True)["matchId"].nunique().values
+                    if "matchId" in df.columns else g["games"])
+    return g
+
+def baseline_table(counts: pd.DataFrame, ci: str = "wilson") -> pd.DataFrame:
+    """champion_counts 결과 -> 챔피언별 베이스라인 승률표 (+ winrate_lo/winrate_hi 구간)"""
+    g = counts[["champion","games","wins"]].copy()
+    g["winrate"] = (g["wins"] / g["games"] * 100).round(2)
+    if ci:
+        g = add_intervals(g, ci, prefix="winrate")
+    return g.sort_values("champion")
+
+def champion_baseline(df_all: pd.DataFrame) -> pd.DataFrame:
+    if "champion" not in df_all.columns:
+        return pd.DataFrame(columns=["champion","games","wins","winrate"])
+    return baseline_table(champion_counts(df_all))
+
+def core_item_counts(df: pd.DataFrame, catalog: ItemCatalog, by=()) -> pd.DataFrame:
+    """코어템(정규화 이름)별 등장 게임수/승수 — 슬롯 단위 집계"""
+    by = list(by)
+    codes = item_codes(df, catalog)
+    hit = np.append(catalog.core_item_mask, False)[codes]
+    row, slot = np.nonzero(hit)
+    long = df[by + ["win_clean"]].iloc[row]
+    long.insert(len(by), "item_norm", catalog.norms[codes[row, slot]])
+    return _count(long, by + ["item_norm"])
+
+def core_build_counts(df: pd.DataFrame, catalog: ItemCatalog, by=()) -> pd.DataFrame:
+    """행별 첫 3코어(부츠 제외, 슬롯 순서 유지) 조합 집계"""
+    by = list(by)
+    tri = first_k_codes(item_codes(df, catalog), catalog.build_core_mask, 3)
+    full = (tri != NO_ITEM).all(axis=1)
+    out = df.loc[full, by + ["win_clean"]]
+    for j in range(3):
+        out.insert(len(by) + j, f"core{j+1}", catalog.names[tri[full, j]])
+    return _count(out, by + ["core1","core2","core3"])
+
+def spell_pair_counts(df: pd.DataFrame, by=()) -> pd.DataFrame:
+    """무순서 스펠 조합 집계"""
+    by = list(by)
+    s1, s2 = pick_spell_cols(df)
+    if not (s1 and s2):
+        return pd.DataFrame(columns=by + ["s1_std","s2_std","games","wins"])
+    tmp = df[by + ["win_clean"]].copy()
+    tmp["s1_std"], tmp["s2_std"] = _spell_pair_codes(df)
+    return _count(tmp, by + ["s1_std","s2_std"])
+
+def boots_counts(df: pd.DataFrame, catalog: ItemCatalog, by=()) -> pd.DataFrame:
+    """행별 첫 신발(슬롯 순서) 집계"""
+    by = list(by)
+    boots = row_first_boots(df, catalog)
+    out = df.loc[boots != "", by + ["win_clean"]]
+    out.insert(len(by), "boots", boots[boots != ""])
+    return _count(out, by + ["boots"])
+
+def rune_counts(df: pd.DataFrame, by=()) -> pd.DataFrame:
+    by = list(by)
+    if not {"rune_core","rune_sub"}.issubset(df.columns):
+        return pd.DataFrame(columns=by + ["rune_core","rune_sub","games","wins"])
+    return _count(df, by + ["rune_core","rune_sub"])
+
+def rune_page_counts(df: pd.DataFrame, by=()) -> pd.DataFrame:
+    """룬 페이지 전체(핵심룬 + 보조 + 파편 3개) 집계"""
+    by = list(by)
+    keys = ["rune_core","rune_sub"] + SHARD_COLS
+    has_shards = "rune_shards" in df.columns or set(SHARD_COLS).issubset(df.columns)
+    if not ({"rune_core","rune_sub"}.issubset(df.columns) and has_shards):
+        return pd.DataFrame(columns=by + keys + ["games","wins"])
+    tmp = df[by + ["rune_core","rune_sub","win_clean"]].copy()
+    for c, v in zip(SHARD_COLS, shard_columns(df)):
+        tmp[c] = v
+    return _count(tmp, by + keys)
+
+def panel_counts(df: pd.DataFrame, catalog: ItemCatalog, by=()) -> dict:
+    """패널 6종(코어템, 3코어, 스펠, 신발, 룬, 룬 페이지) games/wins 집계를 한 번에.
+    아이템 슬롯 컬럼(itemN_name)이 없으면 아이템 패널 3종은 빈 표"""
+    by = list(by)
+    has_items = bool(item_columns(df))
+    return {
+        "items":  core_item_counts(df, catalog, by=by) if has_items else _empty(by + ["item_norm"]),
+        "cores":  core_build_counts(df, catalog, by=by) if has_items else _empty(by + ["core1","core2","core3"]),
+        "spells": spell_pair_counts(df, by=by),
+        "boots":  boots_counts(df, catalog, by=by) if has_items else _empty(by + ["boots"]),
+        "runes":  rune_counts(df, by=by),
+        "pages":  rune_page_counts(df, by=by),
+    }
+
+# 패널별 정렬 기준 / 상위 N (None: 전체)
+PANEL_RANKING = {
+    "items":  (["games","win_rate"], 20),
+    "cores":  (["pick_rate","win_rate"], 3),
+    "spells": (["pick_rate","win_rate"], 10),
+    "boots":  (["pick_rate","win_rate"], None),
+    "runes":  (["pick_rate","win_rate"], 10),
+    "pages":  (["pick_rate","win_rate"], 10),
+}
+
+def rank_panel(tbl: pd.DataFrame, name: str, games: int, ci: str = "wilson", rank_lower: bool = False) -> pd.DataFrame:
+    """패널 집계표 -> 승률·픽률·승률 구간 추가, 패널 기준(rank_lower면 승률 하한)으로 정렬 후 상위 N"""
+    sort, head = PANEL_RANKING[name]
+    return with_rates(tbl, games, sort, head=head, ci=ci, rank_lower=rank_lower)
+
+def champion_summary(games: int, wins: int, matches: int, total_matches: int) -> dict:
+    """상단 요약 — 게임수, 승률, 픽률(전체 매치 대비 등장 매치 비율)"""
+    return {
+        "games": int(games),
+        "win_rate": round(wins/games*100, 2) if games else 0.0,
+        "pick_rate": round(matches/total_matches*100, 2) if total_matches else 0.0,
+    }
+
+# ===== 행 단위 속성 (필터 인덱스용) =====
+def row_spell_pairs(df: pd.DataFrame):
+    """행별 무순서 스펠쌍 (s1_std <= s2_std). 스펠 컬럼이 없으면 빈 문자열"""
+    s1, s2 = pick_spell_cols(df)
+    if not (s1 and s2) or df.empty:
+        empty = np.full(len(df), "", dtype=object)
+        return empty, empty.copy()
+    lo, hi = _spell_pair_codes(df)
+    return lo.to_numpy(dtype=object), hi.to_numpy(dtype=object)
+
+def _spell_pair_codes(df: pd.DataFrame):
+    """행별 무순서 스펠쌍 Categorical — 카테고리가 정렬돼 있어 코드 min/max = canonical_pair"""
+    a, b = spell_std_columns(df)
+    cats = a.categories
+    ca, cb = a.codes, b.codes
+    return (pd.Categorical.from_codes(np.minimum(ca, cb), cats),
+            pd.Categorical.from_codes(np.maximum(ca, cb), cats))
+
+def row_first_boots(df: pd.DataFrame, catalog: ItemCatalog) -> np.ndarray:
+    """행별 첫 신발 이름 (없으면 빈 문자열)"""
+    first = first_k_codes(item_codes(df, catalog), catalog.boots_mask, 1)[:, 0]
+    return np.append(catalog.names, "")[first]
+
+CHAMP_LIST_RE = re.compile(r"['\"]([^'\"]+)['\"]")
+
+def parse_champ_lists(s: pd.Series) -> list:
+    """team_champs/enemy_champs 문자열("['Lux', 'Ziggs', ...]") -> 행별 챔피언 리스트.
+    categorical이면 카테고리만 파싱"""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        parsed = [CHAMP_LIST_RE.findall(str(v)) for v in s.cat.categories] + [[]]
+        return [parsed[c] for c in s.cat.codes.to_numpy()]
+    return [CHAMP_LIST_RE.findall(str(v)) for v in s.fillna("")]
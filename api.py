@@ -0,0 +1,212 @@
+# api.py — 로컬 JSON 조회 API (대시보드와 같은 집계 로직)
+# 사용법: python api.py [참가자 CSV 또는 .arrow] [item_summary CSV] [포트] [큐브 디렉터리]
+#   GET /champions                       챔피언 목록 + 요약
+#   GET /champions/<챔피언>               요약 + 패널 6종 (items, cores, spells, boots, runes, pages)
+#   GET /champions/<챔피언>/<패널>         패널 하나
+#   GET /status                          데이터 version, 캐시 적중 통계
+#   필터 쿼리: rune_core, spells("A + B"), boots, ally, enemy (ally/enemy는 반복 또는 쉼표 구분)
+#   응답은 (챔피언, 필터, 데이터 version) 키의 LRU 캐시에 보관 — ingest.py로 version이 바뀌면 자연히 무효화.
+import sys, json, threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from analysis import item_columns, champion_summary, panel_counts, encode_attributes
+from bitmap_index import build_champion_index
+from cube import (CUBE_DIR, CUBE_TABLES, build_cube, load_cube, index_cube, cube_version,
+                  source_signature, with_batches)
+from report import load_inputs, champion_report, panel_report
+
+PORT = 8765
+CACHE_SIZE = 1024        # 리포트 캐시 항목 수
+INDEX_CACHE_SIZE = 32    # 챔피언별 비트맵 인덱스 보관 수
+SINGLE_FILTERS = ["rune_core", "spells", "boots"]
+MULTI_FILTERS = ["ally", "enemy"]
+
+class LRUCache:
+    """스레드 안전 LRU (항목 수 상한). maxsize 0이면 보관하지 않음"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            if key in self.data:
+                self.data.move_to_end(key)
+                self.hits += 1
+                return self.data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value) -> None:
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"size": len(self.data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+def parse_filters(query: dict) -> tuple:
+    """쿼리 파라미터 -> 정규화된 조건 튜플 ((attr, value), ...) — 캐시 키 겸 비트맵 조건"""
+    conds = []
+    for attr in SINGLE_FILTERS:
+        vals = query.get(attr, [])
+        if len(vals) > 1:
+            raise ValueError(f"`{attr}` 필터는 하나만 지정할 수 있습니다")
+        conds += [(attr, v) for v in vals if v]
+    for attr in MULTI_FILTERS:
+        conds += sorted({(attr, v.strip()) for raw in query.get(attr, []) for v in raw.split(",") if v.strip()})
+    unknown = set(query) - set(SINGLE_FILTERS) - set(MULTI_FILTERS)
+    if unknown:
+        raise ValueError(f"알 수 없는 필터: {sorted(unknown)}")
+    return tuple(conds)
+
+class Dataset:
+    """참가자 행 + 큐브 + 챔피언별 비트맵 인덱스. 큐브 version이 바뀌면 큐브와 증분 반영 행(ingest.py)을 다시 읽는다.
+    읽는 쪽이 쓰는 값 (version, df, icube, champions, indexes)은 한 튜플(state)로 묶어 refresh에서 한 번에 바꿔 끼운다
+    — 요청은 refresh()가 돌려준 튜플 하나로 일관된 상태만 보고, 반쯤 바뀐 df/큐브를 섞어 읽지 않는다"""
+
+    def __init__(self, players_path: str, items_path: str, cube_dir: str = CUBE_DIR,
+                 cache_size: int = CACHE_SIZE):
+        self.players_path, self.cube_dir = players_path, cube_dir
+        inputs = load_inputs(players_path, items_path)
+        self.base, self.catalog = inputs["df"], inputs["catalog"]   # base: 원본 행 (배치 행은 refresh에서 합침)
+        self.cache = LRUCache(cache_size)
+        self.lock = threading.Lock()
+        self.state = (None, None, None, [], None)
+        self.refresh()
+
+    def refresh(self) -> tuple:
+        """디스크 큐브 version 확인, 바뀌었으면 참가자 행(원본 + 배치)과 큐브를 다시 로드
+        (큐브가 없거나 원본과 어긋나면 메모리 빌드). 현재 state 튜플을 돌려준다"""
+        v = cube_version(self.cube_dir)
+        state = self.state
+        if v == state[0]:
+            return state
+        with self.lock:
+            if v != self.state[0]:
+                df = with_batches(self.base, self.cube_dir, self._encode)
+                cube = load_cube(self.cube_dir)
+                if cube is None or cube["meta"].get("source") != source_signature(self.players_path):
+                    cube = build_cube(df, self.catalog)
+                icube = index_cube(cube)
+                champions = sorted(icube["champions"].index.astype(str))
+                # 챔피언 키 인덱스는 행 기준이라 새 df와 함께 새로 시작
+                self.state = (v, df, icube, champions, LRUCache(INDEX_CACHE_SIZE))
+            return self.state
+
+
+    @property
+    def version(self):
+        return self.state[0]
+
+    @property
+    def champions(self) -> list:
+        return self.state[3]
+
+    def _encode(self, rows):
+        return encode_attributes(self.catalog.encode_frame(rows, item_columns(rows)))
+
+    def champion_index(self, champion: str, state: tuple = None):
+        _, df, _, _, indexes = state or self.refresh()
+        hit = indexes.get(champion)
+        if hit is None:
+            dsel = df[df["champion"] == champion].reset_index(drop=True)
+            hit = (dsel, build_champion_index(dsel, self.catalog))
+            indexes.put(champion, hit)
+        return hit
+
+    def report(self, champion: str, conds: tuple = (), state: tuple = None) -> dict:
+        """(챔피언, 필터, version) 캐시 조회 → 없으면 집계. state를 주면 그 스냅숏 기준"""
+        state = state or self.refresh()
+        version, _, icube, _, _ = state
+        key = (champion, conds, version)
+        rep = self.cache.get(key)
+        if rep is not None:
+            return rep
+        total = icube["meta"]["matches"]
+        if conds:
+            dsel, idx = self.champion_index(champion, state)
+            rows = dsel.iloc[idx.select(list(conds))]
+            matches = rows["matchId"].nunique() if "matchId" in rows.columns else len(rows)
+            summary = champion_summary(len(rows), rows["win_clean"].sum(), matches, total)
+            rep = panel_report(champion, panel_counts(rows, self.catalog), summary)
+        else:
+            rep = champion_report(icube, champion, total)
+        rep = {**rep, "filters": [list(c) for c in conds], "version": version}
+        self.cache.put(key, rep)
+        return rep
+
+    def listing(self) -> list:
+        _, _, icube, champions, _ = self.refresh()
+        cnt = icube["champions"]
+        total = icube["meta"]["matches"]
+        return [{"champion": c, **champion_summary(cnt.at[c, "games"], cnt.at[c, "wins"], cnt.at[c, "matches"], total)}
+                for c in champions]
+
+class Handler(BaseHTTPRequestHandler):
+    dataset: Dataset = None
+    protocol_version = "HTTP/1.1"   # keep-alive (부하 테스트 시 연결 재사용)
+    disable_nagle_algorithm = True  # 헤더/본문 분할 전송 시 지연 ACK로 ~40ms 묶이는 것 방지
+
+    def _send(self, status: int, obj) -> None:
+        body = json.dumps(obj, ensure_ascii=False, default=int).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        ds = self.dataset
+        try:
+            if parts == ["status"]:
+                version, df, _, _, indexes = ds.refresh()
+                return self._send(200, {"version": version, "rows": int(len(df)),
+                                        "cache": ds.cache.stats(), "indexes": indexes.stats()})
+            if parts == ["champions"]:
+                return self._send(200, ds.listing())
+            if len(parts) in (2, 3) and parts[0] == "champions":
+                champ, state = parts[1], ds.refresh()
+                if champ not in state[2]["champions"].index:
+                    return self._send(404, {"error": f"챔피언 없음: {champ}"})
+                rep = ds.report(champ, parse_filters(parse_qs(url.query)), state)
+                if len(parts) == 2:
+                    return self._send(200, rep)
+                panel = parts[2]
+                if panel not in CUBE_TABLES:
+                    return self._send(404, {"error": f"패널 없음: {panel} (가능: {list(CUBE_TABLES)})"})
+                summary = {k: v for k, v in rep.items() if k != "panels"}
+                return self._send(200, {**summary, "panel": panel, "rows": rep["panels"][panel]})
+            return self._send(404, {"error": "not found"})
+        except ValueError as e:
+            return self._send(400, {"error": str(e)})
+
+    def log_message(self, fmt, *args):   # 요청마다 stderr 출력하지 않음
+        pass
+
+def make_server(dataset: Dataset, host: str = "127.0.0.1", port: int = PORT) -> ThreadingHTTPServer:
+    handler = type("BoundHandler", (Handler,), {"dataset": dataset})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+if __name__ == "__main__":
+    players  = sys.argv[1] if len(sys.argv) > 1 else "aram_participants_with_icons_superlight.csv"
+    items    = sys.argv[2] if len(sys.argv) > 2 else "item_summary.csv"
+    port     = int(sys.argv[3]) if len(sys.argv) > 3 else PORT
+    cube_dir = sys.argv[4] if len(sys.argv) > 4 else CUBE_DIR
+
+    server = make_server(Dataset(players, items, cube_dir), port=port)
+    print(f"api -> http://127.0.0.1:{port}/champions")
+    server.serve_forever()
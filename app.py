@@ -1,17 +1,52 @@
 # app.py — ARAM 챔피언 대시보드 (+ 아이템 0 전처리, 스펠 무순서 집계)
-import os, re, json
+import os, re, json, time
+T_START = time.perf_counter()   # 첫 렌더 시간 기준 (아래 모듈 import 포함)
 import pandas as pd
 import streamlit as st
 
+import perf
+from assets import ASSET_DIR, AssetCache, assets_version, ddragon_version, image_source
+from analysis import (item_columns, standard_korean_spell, baseline_table, panel_counts, rank_panel,
+                      champion_summary, with_rates, encode_attributes)
+from bitmap_index import BitmapIndex, build_champion_index
+from buildpath import BuildTrie, build_trie
+from catalog import ItemCatalog
+from confidence import CI_METHODS, add_intervals
+from cube import (CUBE_DIR, CUBE_TABLES, build_cube, load_cube, index_cube, champion_table,
+                  source_signature, cube_version, merge_cubes, with_batches)
+from loaders import read_item_summary, read_champion_icons, read_rune_icons, read_spell_icons
+from snapshot import SNAPSHOT_PATH, load_snapshot, signatures, warm_part
+from store import (STORE_PATH, PARTITION_DIR, PLAYER_COLUMNS, load_participants, pick_source, read_manifest,
+                   read_partition, concat_partitions)
+from synergy import build_matrices, champion_pairs
+from winprob import MODEL_PATH, WinModel, load_model, train
+
 st.set_page_config(page_title="ARAM PS Dashboard", layout="wide")
 
 # ===== 파일 경로(리포 루트) =====
 PLAYERS_CSV   = "aram_participants_with_icons_superlight.csv"  # 참가자 행 데이터
+PLAYERS_STORE = STORE_PATH                                     # 변환된 컬럼형 저장소 (python store.py)
 ITEM_SUM_CSV  = "item_summary.csv"                  # item, icon_url, total_picks, wins, win_rate,+@
 CHAMP_CSV     = "champion_icons.csv"                           # champion, champion_icon (또는 icon/icon_url)
 RUNE_CSV      = "rune_icons.csv"                               # rune_core, rune_core_icon, rune_sub, rune_sub_icon
 SPELL_CSV     = "spell_icons.csv"                              # 스펠 이름 ↔ 아이콘 URL
-DD_VERSION    = "15.16.1"                                      # Data Dragon 폴백 버전
+WINPROB_JSON  = MODEL_PATH                                     # 승리 확률 모델 계수 (python winprob.py)
+ASSETS_DIR    = ASSET_DIR                                      # 로컬 아이콘 캐시 (python assets.py <미러>)
+DD_FALLBACK   = "15.16.1"                                      # 아이콘 CSV/캐시에서 버전을 못 찾을 때 Data Dragon 버전
+SNAPSHOT      = os.environ.get("ARAM_SNAPSHOT", SNAPSHOT_PATH) # 웜 스타트 스냅샷 (python snapshot.py, ""이면 끔)
+PARTS_DIR     = PARTITION_DIR                                  # 패치/날짜별 파티션 저장소 (python store.py <CSV> aram_partitions)
+PERF_DEFAULT  = os.environ.get("ARAM_PERF") == "1"             # 계측 기본값 (사이드바 Perf 토글)
+PARTITION_CACHE = 16                                           # 메모리에 유지할 파티션 수 (기간 전환 시 재사용)
+WINDOW_CACHE    = 4                                            # 메모리에 유지할 기간(파티션 조합) 프레임 수
+STRATEGY_POLL   = 2                                            # 전략 생성 대기 중 코멘트 조각 재실행 주기(초)
+WINDOW_LABELS   = {"patch": "패치", "date": "날짜", "match": "매치 구간(matchId)"}
+
+# ===== 계측 (켜져 있으면 세션별 기록기 활성화) =====
+def session_recorder():
+    """세션 기록기 (Perf가 꺼져 있으면 None) — 전체 실행과 fragment 재실행이 같은 기록기를 쓴다"""
+    return st.session_state.setdefault("perf", perf.Recorder()) if st.session_state.get("perf_on", PERF_DEFAULT) else None
+
+perf.activate(session_recorder())
 
 # ===== 유틸 =====
 def _exists(path: str) -> bool:
@@ -20,124 +55,240 @@ def _exists(path: str) -> bool:
         st.warning(f"파일 없음: `{path}`")
     return ok
 
-def _norm(x: str) -> str:
-    return re.sub(r"\s+", "", str(x)).strip().lower()
-
-# ===== 로더 =====
-@st.cache_data
-def load_players(path: str) -> pd.DataFrame:
-    if not _exists(path):
-        st.stop()
-    df = pd.read_csv(path)
-
-    # 승패 정리
-    if "win_clean" not in df.columns:
-        if "win" in df.columns:
-            df["win_clean"] = df["win"].astype(str).str.lower().isin(["true","1","t","yes"]).astype(int)
-        else:
-            df["win_clean"] = 0
-
-    # 아이템 이름 정리 + "0" 전처리 (아이템 구매 전 종료 케이스 제외)
-    for c in [c for c in df.columns if re.fullmatch(r"item[0-6]_name", c)]:
-        df[c] = df[c].fillna("").astype(str).str.strip()
-        df[c] = df[c].replace({"0": "", 0: ""})
+@perf.cached("load_snapshot", st.cache_resource(max_entries=1))
+def load_warm_state(path: str, mtime: float = 0.0) -> dict:
+    """웜 스타트 스냅샷 — 파일 하나 읽기로 정리된 프레임/카탈로그/아이콘 맵/큐브 (다시 만들면 mtime이 바뀜)"""
+    return load_snapshot(path) or {}
 
-    # 기본 텍스트 컬럼
-    for c in ["spell1","spell2","spell1_name_fix","spell2_name_fix","rune_core","rune_sub","champion","matchId"]:
-        if c in df.columns:
-            df[c] = df[c].fillna("").astype(str).str.strip()
-    return df
+def _warm(part: str):
+    """이번 실행의 입력 서명과 맞는 스냅샷 부분 (없으면 None — 원래 로더가 읽는다)"""
+    return warm_part(WARM, part, WARM_SOURCES)
 
-@st.cache_data
+# ===== 로더 =====
+@perf.cached("load_partition", st.cache_resource(max_entries=PARTITION_CACHE))
+def load_partition(part_dir: str, key: str) -> pd.DataFrame:
+    """파티션 하나 (PLAYER_COLUMNS만) — 기간을 바꿔도 겹치는 파티션은 다시 읽지 않는다(읽기 전용)"""
+    return read_partition(part_dir, key, PLAYER_COLUMNS)
+
+@perf.cached("load_players", st.cache_resource(max_entries=WINDOW_CACHE))
+def load_players(path: str, items_path: str, window: tuple = (), version: int = 0) -> pd.DataFrame:
+    """참가자 행 + 아이템 슬롯을 카탈로그 id(itemN_id)로, 스펠/룬 파편을 Categorical로 인코딩.
+    window: 파티션 키 목록 (path = 파티션 디렉터리). 비어 있으면 path 전체(.arrow/CSV) + 증분 반영 행
+    (ingest.py — 큐브 카운터와 같은 참가자 집합). version: 증분 반영 version — 바뀌면 새 배치 행까지 다시 읽는다.
+    .arrow 저장소는 메모리 맵 — 재실행마다 복사하지 않도록 리소스 캐시로 공유(읽기 전용)"""
+    if window:
+        df = concat_partitions([load_partition(path, k) for k in window])
+    else:
+        warm = _warm("players")
+        if warm is not None:
+            return warm
+        if not _exists(path):
+            st.stop()
+        df = with_batches(load_participants(path, PLAYER_COLUMNS), CUBE_DIR)
+    return encode_attributes(load_item_catalog(items_path).encode_frame(df, item_columns(df)))
+
+@perf.cached("load_item_summary", st.cache_data)
 def load_item_summary(path: str) -> pd.DataFrame:
     if not _exists(path):
         return pd.DataFrame()
-    g = pd.read_csv(path)
+    g = read_item_summary(path)
     need = {"item","icon_url","total_picks","wins","win_rate"}
     if not need.issubset(g.columns):
         st.warning(f"`{path}` 헤더 확인 필요 (기대: {sorted(need)}, 실제: {list(g.columns)})")
-    if "item" in g.columns:
-        g = g[g["item"].astype(str).str.strip() != ""]
-        g = g[g["item"] != "0"]  # 혹시 요약 파일에도 0이 남아있다면 제거
     return g
 
-@st.cache_data
-def load_champion_icons(path: str) -> dict:
+@perf.cached("load_item_catalog", st.cache_data)
+def load_item_catalog(path: str) -> ItemCatalog:
+    """item_summary 단일 로드 -> 이름/id/코어·신발·제외 마스크/아이콘"""
+    warm = _warm("catalog")
+    if warm is not None:
+        return warm
+    return ItemCatalog(load_item_summary(path))
+
+@perf.cached("load_partition_cube", st.cache_resource(max_entries=PARTITION_CACHE))
+def load_partition_cube(part_dir: str, key: str, items_path: str) -> dict:
+    """파티션 하나의 집계 큐브 (기간 큐브는 파티션 큐브 합산)"""
+    df = load_partition(part_dir, key).copy(deep=False)   # 캐시된 파티션 프레임에 컬럼을 더하지 않도록
+    catalog = load_item_catalog(items_path)
+    return build_cube(encode_attributes(catalog.encode_frame(df, item_columns(df))), catalog)
+
+@perf.cached("load_stats_cube", st.cache_resource(max_entries=WINDOW_CACHE))
+def load_stats_cube(cube_dir: str, players_path: str, items_path: str, version: int = 0, window: tuple = ()) -> dict:
+    """사전 집계 큐브 로드. 없거나 원본과 어긋나면 메모리에서 한 번 빌드.
+    version: 증분 반영(ingest.py) 횟수 — 바뀌면 캐시 키가 달라져 새 카운터를 읽는다.
+    window: 파티션 기간이면 파티션별 큐브를 합산 (파티션은 매치 단위로 나뉘어 겹치지 않음).
+    조회 전용이라 리소스 캐시로 공유 (cache_data는 적중 때마다 큐브 전체를 역직렬화)"""
+    if window:
+        parts = [load_partition_cube(players_path, k, items_path) for k in window]
+        cube = parts[0]
+        for p in parts[1:]:
+            cube = merge_cubes(cube, p)
+            cube["meta"]["matches"] = cube["meta"]["matches"] + p["meta"]["matches"]
+        return index_cube(cube)
+    cube = _warm("cube")
+    if cube is None:
+        cube = load_cube(cube_dir)
+    if cube is None or cube["meta"].get("source") != source_signature(players_path):
+        cube = build_cube(load_players(players_path, items_path, (), version), load_item_catalog(items_path))
+    return index_cube(cube)
+
+@perf.cached("load_synergy", st.cache_data)
+def load_synergy(players_path: str, items_path: str, window: tuple = (), version: int = 0) -> dict:
+    """챔피언 × 챔피언 아군 시너지 / 적군 상성 게임수·승수 행렬"""
+    return build_matrices(load_players(players_path, items_path, window, version))
+
+@perf.cached("load_winprob", st.cache_data)
+def load_winprob(model_path: str, players_path: str, items_path: str, window: tuple = (), version: int = 0) -> dict:
+    """오프라인 학습 계수 로드. 없으면 참가자 행(선택 기간)으로 메모리에서 한 번 학습"""
+    model = load_model(model_path)
+    return model if model is not None else train(load_players(players_path, items_path, window, version))
+
+@perf.cached("load_champion_index", st.cache_resource(max_entries=64))
+def load_champion_index(players_path: str, items_path: str, champion: str, window: tuple = (), version: int = 0):
+    """선택 챔피언 행 + 교차 필터용 비트맵 인덱스 (챔피언·기간별 1회 구성)"""
+    df_all = load_players(players_path, items_path, window, version)
+    dsel = df_all[df_all["champion"] == champion].reset_index(drop=True)
+    return dsel, build_champion_index(dsel, load_item_catalog(items_path))
+
+@perf.cached("load_filtered_panels", st.cache_data(max_entries=64))
+def load_filtered_panels(players_path: str, items_path: str, champion: str, conds: tuple, window: tuple = (),
+                         version: int = 0) -> dict:
+    """필터 조합의 패널 집계 + 시너지 행렬 — (챔피언, 조건) 키로 보관해 재실행 때 다시 세지 않는다"""
+    dsel, cindex = load_champion_index(players_path, items_path, champion, window, version)
+    dview = dsel.iloc[cindex.select(list(conds))]
+    return {
+        "tables": panel_counts(dview, load_item_catalog(items_path)),
+        "synergy": build_matrices(dview, names=load_synergy(players_path, items_path, window, version)["names"]),
+        "games": len(dview), "wins": int(dview["win_clean"].sum()),
+        "matches": dview["matchId"].nunique() if "matchId" in dview.columns else len(dview),
+    }
+
+@perf.cached("load_build_trie", st.cache_resource(max_entries=64))
+def load_build_trie(players_path: str, items_path: str, champion: str, conds: tuple, window: tuple = (),
+                    version: int = 0) -> BuildTrie:
+    """선택 챔피언(+필터) 행의 코어템 구매 순서 트라이 — 조회 전용이라 리소스 캐시로 공유"""
+    dsel, cindex = load_champion_index(players_path, items_path, champion, window, version)
+    return build_trie(dsel.iloc[cindex.select(list(conds))], load_item_catalog(items_path))
+
+@perf.cached("load_assets", st.cache_resource)
+def load_assets(asset_dir: str, version: float = 0.0) -> AssetCache:
+    """아이콘 URL -> 로컬 data URI. version: index.json 수정 시각 — 다시 동기화하면 새로 읽는다"""
+    warm = _warm("assets")
+    return warm if warm is not None else AssetCache(asset_dir)
+
+@perf.cached("load_champion_icons", st.cache_data)
+def load_champion_icons(path: str, assets_version: float = 0.0) -> dict:
+    warm = _warm("champion")
+    if warm is not None:
+        return warm
     if not _exists(path):
         return {}
-    df = pd.read_csv(path)
-    name_col = next((c for c in ["champion","Champion","championName"] if c in df.columns), None)
-    icon_col = next((c for c in ["champion_icon","icon","icon_url"] if c in df.columns), None)
-    if not name_col or not icon_col:
-        return {}
-    df[name_col] = df[name_col].astype(str).str.strip()
-    return dict(zip(df[name_col], df[icon_col]))
+    return read_champion_icons(path, load_assets(ASSETS_DIR, assets_version).localize_column)
 
-@st.cache_data
-def load_rune_icons(path: str) -> dict:
+@perf.cached("load_rune_icons", st.cache_data)
+def load_rune_icons(path: str, assets_version: float = 0.0) -> dict:
+    warm = _warm("rune")
+    if warm is not None:
+        return warm
     if not _exists(path):
         return {"core": {}, "sub": {}, "shards": {}}
-    df = pd.read_csv(path)
-    core_map, sub_map, shard_map = {}, {}, {}
-    if "rune_core" in df.columns:
-        ic = "rune_core_icon" if "rune_core_icon" in df.columns else None
-        if ic: core_map = dict(zip(df["rune_core"].astype(str), df[ic].astype(str)))
-    if "rune_sub" in df.columns:
-        ic = "rune_sub_icon" if "rune_sub_icon" in df.columns else None
-        if ic: sub_map = dict(zip(df["rune_sub"].astype(str), df[ic].astype(str)))
-    if "rune_shard" in df.columns:
-        ic = "rune_shard_icon" if "rune_shard_icon" in df.columns else ("rune_shards_icons" if "rune_shards_icons" in df.columns else None)
-        if ic: shard_map = dict(zip(df["rune_shard"].astype(str), df[ic].astype(str)))
-    return {"core": core_map, "sub": sub_map, "shards": shard_map}
-
-@st.cache_data
-def load_spell_icons(path: str) -> dict:
+    return read_rune_icons(path, load_assets(ASSETS_DIR, assets_version).localize_column)
+
+@perf.cached("load_spell_icons", st.cache_data)
+def load_spell_icons(path: str, assets_version: float = 0.0) -> dict:
     """스펠명(여러 형태) -> 아이콘 URL"""
+    warm = _warm("spell")
+    if warm is not None:
+        return warm
     if not _exists(path):
         return {}
-    df = pd.read_csv(path)
-    cand_name = [c for c in df.columns if _norm(c) in {"spell","spellname","name","spell1_name_fix","spell2_name_fix","스펠","스펠명"}]
-    cand_icon = [c for c in df.columns if _norm(c) in {"icon","icon_url","spelli con","spell_icon"} or "icon" in c.lower()]
-    m = {}
-    if cand_name and cand_icon:
-        name_col, icon_col = cand_name[0], cand_icon[0]
-        for n, i in zip(df[name_col].astype(str), df[icon_col].astype(str)):
-            m[_norm(n)] = i
-            m[str(n).strip()] = i
-    else:
-        if df.shape[1] >= 2:
-            for n, i in zip(df.iloc[:,0].astype(str), df.iloc[:,1].astype(str)):
-                m[_norm(n)] = i
-                m[str(n).strip()] = i
-    return m
+    return read_spell_icons(path, load_assets(ASSETS_DIR, assets_version).localize_column)
 
-# ===== 데이터 로드 =====
-df        = load_players(PLAYERS_CSV)
-item_sum  = load_item_summary(ITEM_SUM_CSV)
-champ_map = load_champion_icons(CHAMP_CSV)
-rune_maps = load_rune_icons(RUNE_CSV)
-spell_map = load_spell_icons(SPELL_CSV)
+# ===== 데이터 원본 / 기간 (파티션 저장소가 있으면 선택 기간의 파티션만 로드) =====
+st.sidebar.title("ARAM PS Controls")
+manifest = read_manifest(PARTS_DIR, PLAYERS_CSV)
+if manifest and manifest["partitions"]:
+    PLAYERS_SRC = PARTS_DIR
+    part_keys = [p["key"] for p in manifest["partitions"]]
+    lo, hi = (st.sidebar.select_slider(WINDOW_LABELS.get(manifest["kind"], "기간"), part_keys,
+                                       value=(part_keys[-1], part_keys[-1]), key="window")
+              if len(part_keys) > 1 else (part_keys[0], part_keys[0]))
+    WINDOW = tuple(part_keys[part_keys.index(lo):part_keys.index(hi) + 1])
+else:
+    PLAYERS_SRC = pick_source(PLAYERS_STORE, PLAYERS_CSV)
+    WINDOW = ()
+
+# ===== 웜 스타트 (스냅샷이 있으면 입력 서명이 맞는 부분을 로더 대신 한 번에) =====
+WARM_SOURCES = signatures(PLAYERS_SRC, ITEM_SUM_CSV, {"champion": CHAMP_CSV, "rune": RUNE_CSV, "spell": SPELL_CSV},
+                          ASSETS_DIR, CUBE_DIR)
+WARM = load_warm_state(SNAPSHOT, os.path.getmtime(SNAPSHOT)) if os.path.exists(SNAPSHOT) else {}
 
-ITEM_ICON_MAP = dict(zip(item_sum.get("item", []), item_sum.get("icon_url", [])))
+# ===== 데이터 로드 =====
+DATA_VER  = cube_version(CUBE_DIR)   # 증분 반영(ingest.py) version — 큐브와 참가자 행 캐시를 함께 갱신
+df        = load_players(PLAYERS_SRC, ITEM_SUM_CSV, WINDOW, DATA_VER)
+catalog   = load_item_catalog(ITEM_SUM_CSV)
+assets_v  = assets_version(ASSETS_DIR)
+assets    = load_assets(ASSETS_DIR, assets_v)
+champ_map = load_champion_icons(CHAMP_CSV, assets_v)
+rune_maps = load_rune_icons(RUNE_CSV, assets_v)
+spell_map = load_spell_icons(SPELL_CSV, assets_v)
+cube      = load_stats_cube(CUBE_DIR, PLAYERS_SRC, ITEM_SUM_CSV, DATA_VER, WINDOW)
+
+# 아이템 아이콘: item_summary URL -> 로컬 캐시(있으면). Data Dragon 버전은 캐시/CSV URL에서
+ITEM_ICON_MAP      = {k: assets.localize(v) for k, v in catalog.icon_map.items()}
+ITEM_NORM_ICON_MAP = {k: assets.localize(v) for k, v in catalog.norm_icon_map.items()}
+DD_VERSION         = assets.version or ddragon_version(catalog.icons, DD_FALLBACK)
+perf.lap("load", rows=len(df))
 
 # ===== 사이드바 =====
-st.sidebar.title("ARAM PS Controls")
 champs = sorted(df["champion"].dropna().unique().tolist()) if "champion" in df.columns else []
-selected = st.sidebar.selectbox("Champion", champs, index=0 if champs else None)
-
-# ===== 상단 요약 =====
-dsel = df[df["champion"] == selected].copy() if len(champs) else df.head(0).copy()
-games = len(dsel)
-match_cnt_all = df["matchId"].nunique() if "matchId" in df.columns else len(df)
-match_cnt_sel = dsel["matchId"].nunique() if "matchId" in dsel.columns else games
-winrate = round(dsel["win_clean"].mean()*100, 2) if games else 0.0
-pickrate = round((match_cnt_sel / match_cnt_all * 100), 2) if match_cnt_all else 0.0
+# 기간을 바꾸면 챔피언 목록이 달라져 위젯이 새로 만들어지므로, 직전 선택을 기본값으로 유지
+prev = st.session_state.get("selected_champion")
+selected = st.sidebar.selectbox("Champion", champs,
+                                index=(champs.index(prev) if prev in champs else 0) if champs else None)
+st.session_state["selected_champion"] = selected
+
+# ===== 교차 필터 (핵심룬 / 스펠 / 신발 / 아군 / 적군) =====
+dsel, cindex = load_champion_index(PLAYERS_SRC, ITEM_SUM_CSV, selected, WINDOW, DATA_VER) if champs else (df.head(0), BitmapIndex(0))
+ALL = "전체"
+st.sidebar.subheader("필터")
+f_rune  = st.sidebar.selectbox("핵심룬", [ALL] + cindex.values("rune_core"))
+f_spell = st.sidebar.selectbox("스펠 조합", [ALL] + cindex.values("spells"))
+f_boots = st.sidebar.selectbox("첫 신발", [ALL] + cindex.values("boots"))
+f_ally  = st.sidebar.multiselect("아군에 포함", cindex.values("ally"))
+f_enemy = st.sidebar.multiselect("상대에 포함", cindex.values("enemy"))
+conds = [(a, v) for a, v in [("rune_core", f_rune), ("spells", f_spell), ("boots", f_boots)] if v != ALL]
+conds += [("ally", c) for c in f_ally] + [("enemy", c) for c in f_enemy]
+
+# ===== 승률 신뢰구간 (모든 표에 하한/상한 열, 선택 시 하한으로 정렬) =====
+st.sidebar.subheader("승률 신뢰구간")
+CI_LABELS = {"wilson": "Wilson 95%", "bayes": "베이즈 수축 95%", "bootstrap": "부트스트랩 95%"}
+ci_method  = st.sidebar.selectbox("구간 방법", CI_METHODS, format_func=CI_LABELS.get, key="ci_method")
+rank_lower = st.sidebar.toggle("승률 하한으로 정렬", key="rank_lower",
+                               help="표본이 적은 조합(예: 2게임 100%)이 위로 오지 않도록 구간 하한 → 게임수 순으로 정렬")
+CI_COLS = {"win_lo": "하한(%)", "win_hi": "상한(%)"}
+
+# ===== 상단 요약 (필터 없으면 큐브 조회, 있으면 남은 행만 집계) =====
+match_cnt_all = cube["meta"]["matches"]
+if conds:
+    dview  = dsel.iloc[cindex.select(conds)]
+    fp     = load_filtered_panels(PLAYERS_SRC, ITEM_SUM_CSV, selected, tuple(conds), WINDOW, DATA_VER)
+    tables = fp["tables"]
+    summary = champion_summary(fp["games"], fp["wins"], fp["matches"], match_cnt_all)
+else:
+    dview  = dsel
+    tables = {name: champion_table(cube, name, selected) for name in CUBE_TABLES}
+    champ_cnt = cube["champions"]
+    row = champ_cnt.loc[selected] if selected in champ_cnt.index else {"games": 0, "wins": 0, "matches": 0}
+    summary = champion_summary(row["games"], row["wins"], row["matches"], match_cnt_all)
+games, winrate, pickrate = summary["games"], summary["win_rate"], summary["pick_rate"]
+perf.lap("filters", rows=len(dview))
 
 c0, ctitle = st.columns([1, 5])
 with c0:
     cicon = champ_map.get(selected, "")
     if cicon:
-        st.image(cicon, width=64)
+        st.image(image_source(cicon), width=64)
 with ctitle:
     st.title(f"{selected}")
 
@@ -146,147 +297,114 @@ c1.metric("Games", f"{games}")
 c2.metric("Win Rate", f"{winrate}%")
 c3.metric("Pick Rate", f"{pickrate}%")
 
-# ===== 코어템 3개 조합 추천 =====
-st.subheader("3코어 조합 통계")
-
-# dsel: 선택 챔피언 데이터 (이미 필터링된 DataFrame)
-# df_items: item_summary CSV (item, is_core, is_boots 컬럼 포함)
-df_items = pd.read_csv(ITEM_SUM_CSV)
-
-item_cols = [c for c in dsel.columns if re.fullmatch(r"item[0-6]_name", c)]
-
-def is_core_item(item_name: str) -> bool:
-    """CSV 기준: 코어템인지, 부츠인지 판단. 없으면 False 처리"""
-    if not item_name or item_name == "포로 간식":
-        return False
-    sub = df_items[df_items["item"] == item_name]
-    if sub.empty:
-        return False
-    is_core = str(sub["is_core"].iloc[0]).strip().lower() in ["true","1","yes"]
-    is_boots = str(sub["is_boots"].iloc[0]).strip().lower() in ["true","1","yes"]
-    return is_core and not is_boots
-if games and item_cols:
-    core_builds = []
-
-    for _, row in dsel.iterrows():
-        items = [row[c] for c in item_cols if row[c]]  # 비어있는 값 제거
-        # CSV 기준 코어템만, 부츠 제외, 순서 유지
-        items = [i for i in items if is_core_item(i)]
-        core = items[:3]  # 첫 3개만
-        if len(core) == 3:
-            core_builds.append((tuple(core), row["win_clean"]))
-
-    if core_builds:
-        core_df = pd.DataFrame(core_builds, columns=["core","win_clean"])
-        core_df["core1"] = core_df["core"].apply(lambda x: x[0])
-        core_df["core2"] = core_df["core"].apply(lambda x: x[1])
-        core_df["core3"] = core_df["core"].apply(lambda x: x[2])
-
-        # 조합별 통계
-        builds = (
-            core_df.groupby(["core1","core2","core3"])
-            .agg(games=("win_clean","count"), wins=("win_clean","sum"))
-            .reset_index()
-        )
-        builds["pick_rate"] = (builds["games"]/games*100).round(2)
-        builds["win_rate"] = (builds["wins"]/builds["games"]*100).round(2)
-
-        # 아이콘 매핑
-        builds["core1_icon"] = builds["core1"].map(ITEM_ICON_MAP)
-        builds["core2_icon"] = builds["core2"].map(ITEM_ICON_MAP)
-        builds["core3_icon"] = builds["core3"].map(ITEM_ICON_MAP)
-
-        # 정렬: 픽률 내림차순 → 승률 내림차순, 상위 3개
-        builds = builds.sort_values(["pick_rate","win_rate"], ascending=[False, False]).head(3)
-
-        st.dataframe(
-            builds.reset_index(drop=True)[[
-                "core1_icon","core1","core2_icon","core2","core3_icon","core3",
-                "pick_rate","win_rate","games",
-            ]].to_dict("records"),
-            use_container_width=True,
-            column_config={
-                "core1_icon": st.column_config.ImageColumn("코어1", width="small"),
-                "core2_icon": st.column_config.ImageColumn("코어2", width="small"),
-                "core3_icon": st.column_config.ImageColumn("코어3", width="small"),
-                "core1":"아이템1","core2":"아이템2","core3":"아이템3",
-                "pick_rate":"픽률(%)","win_rate":"승률(%)","games":"게임수",
-            }
-        )
-    else:
-        st.info("3개 코어템을 완성한 게임이 없습니다.")
-        
+# 세션 첫 렌더(요약 지표까지) 시간 — 프로세스 첫 세션이면 콜드 스타트로 기록
+if "first_render" not in st.session_state:
+    st.session_state["first_render"] = perf.first_render(
+        time.perf_counter() - T_START, snapshot=[k for k in WARM.get("parts", {}) if _warm(k) is not None])
+
+# ===== 코어템 3개 조합 추천 + 빌드 경로 트리 =====
+BUILD_TREE_DEPTH = 5   # 경로 선택 최대 깊이
+
+@st.experimental_fragment
+def build_tree_panel(trie: BuildTrie) -> None:
+    """접두사(앞 N개 코어템) 선택 -> 다음 코어템 분포. 경로 선택 시 이 패널만 재실행"""
+    perf.mark(session_recorder())
+    st.subheader("빌드 경로")
+    path = []
+    for d in range(BUILD_TREE_DEPTH):
+        nxt = trie.next_items(path, top=20)
+        if nxt.empty:
+            break
+        pick = st.selectbox(f"{d+1}번째 코어", ["—"] + nxt["item"].tolist(), key=f"build_path_{d}")
+        if pick == "—":
+            break
+        path.append(pick)
+    stat = trie.stats(path)
+    st.caption(f"{' → '.join(path) or '전체'}: {stat['games']}게임 · 승률 {stat['win_rate']}% · 여기서 종료 {stat['ends']}게임")
+    nxt = add_intervals(trie.next_items(path), ci_method)
+    nxt["icon"] = nxt["item"].map(ITEM_ICON_MAP)
+    st.dataframe(
+        nxt[["icon","item","share","win_rate","win_lo","win_hi","games"]].to_dict("records"),
+        use_container_width=True,
+        column_config={
+            "icon": st.column_config.ImageColumn("", width="small"),
+            "item":"다음 코어템", "share":"비중(%)", "win_rate":"승률(%)", **CI_COLS, "games":"게임수",
+        }
+    )
+    # 펼치는 트리: 첫 코어 상위 5개 → 둘째 상위 5개 → 셋째 상위 3개
+    for r in trie.next_items([], top=5).itertuples():
+        with st.expander(f"{r.item} — {r.games}게임 · 승률 {r.win_rate}%"):
+            lines = []
+            for c in trie.next_items([r.item], top=5).itertuples():
+                lines.append(f"- {c.item} ({c.share}%, 승률 {c.win_rate}%)")
+                lines += [f"    - {g.item} ({g.share}%, 승률 {g.win_rate}%)"
+                          for g in trie.next_items([r.item, c.item], top=3).itertuples()]
+            st.markdown("\n".join(lines) or "다음 코어템 없음")
+    perf.lap("build_tree", rows=stat["games"])
+
+col_builds, col_tree = st.columns([3, 2])
+with col_builds:
+    st.subheader("3코어 조합 통계")
+
+    builds = tables["cores"]
+    if games and item_columns(df):
+        if not builds.empty:
+            builds = rank_panel(builds, "cores", games, ci_method, rank_lower)
+
+            # 아이콘 매핑
+            builds["core1_icon"] = builds["core1"].map(ITEM_ICON_MAP)
+            builds["core2_icon"] = builds["core2"].map(ITEM_ICON_MAP)
+            builds["core3_icon"] = builds["core3"].map(ITEM_ICON_MAP)
+
+            st.dataframe(
+                builds.reset_index(drop=True)[[
+                    "core1_icon","core1","core2_icon","core2","core3_icon","core3",
+                    "pick_rate","win_rate","win_lo","win_hi","games",
+                ]].to_dict("records"),
+                use_container_width=True,
+                column_config={
+                    "core1_icon": st.column_config.ImageColumn("코어1", width="small"),
+                    "core2_icon": st.column_config.ImageColumn("코어2", width="small"),
+                    "core3_icon": st.column_config.ImageColumn("코어3", width="small"),
+                    "core1":"아이템1","core2":"아이템2","core3":"아이템3",
+                    "pick_rate":"픽률(%)","win_rate":"승률(%)", **CI_COLS, "games":"게임수",
+                }
+            )
+        else:
+            st.info("3개 코어템을 완성한 게임이 없습니다.")
+perf.lap("core_builds", rows=games)
+with col_tree:
+    if games and item_columns(df):
+        build_tree_panel(load_build_trie(PLAYERS_SRC, ITEM_SUM_CSV, selected, tuple(conds), WINDOW, DATA_VER))
+
 # ===== 코어템 통계 =====
 st.subheader("코어템 통계")
 
-# CSV 불러오기
-df_items = pd.read_csv(ITEM_SUM_CSV)
-
-# 문자열/숫자 모두 처리 가능하게 bool 변환
-def to_bool(x):
-    return str(x).strip().lower() in ["true","1","yes"]
-
-df_items["is_core"]  = df_items["is_core"].apply(to_bool)
-df_items["is_boots"] = df_items["is_boots"].apply(to_bool)
-
-# 아이템 이름 정규화
-def norm_item(x):
-    return str(x).strip().lower()
-
-df_items["item_norm"] = df_items["item"].apply(norm_item)
-
-# dsel 아이템 컬럼 정규화
-item_cols = [c for c in dsel.columns if re.fullmatch(r"item[0-6]_name", c)]
-for c in item_cols:
-    dsel[c+"_norm"] = dsel[c].apply(norm_item)
-
-# CSV 기준 코어템 + 부츠 제외
-core_items_set = set(df_items.loc[df_items["is_core"] & (~df_items["is_boots"]), "item_norm"])
-
-# dsel_long으로 아이템 컬럼 합치기
-dsel_long = pd.melt(
-    dsel,
-    id_vars=["win_clean"],
-    value_vars=[c+"_norm" for c in item_cols],
-    value_name="item_norm"
-)[["item_norm","win_clean"]]
-
-# 포로 간식, 부츠 제외, 코어템만 필터링
-dsel_core = dsel_long[
-    dsel_long["item_norm"].isin(core_items_set) &
-    (~dsel_long["item_norm"].isin(["포로 간식","물약","수당"]))
-]
-
-if not dsel_core.empty:
-    # 집계
-    top_items = (
-        dsel_core.groupby("item_norm", as_index=False)
-        .agg(games=("win_clean","count"), wins=("win_clean","sum"))
-    )
-    top_items["win_rate"] = (top_items["wins"]/top_items["games"]*100).round(2)
-    top_items["pick_rate"] = (top_items["games"]/games*100).round(2)
+top_items = tables["items"]
 
-    # 아이콘 매핑 (원래 이름 기준)
-    item_map = dict(zip(df_items["item_norm"], df_items["icon_url"]))
-    top_items["icon_url"] = top_items["item_norm"].map(item_map)
+if not top_items.empty:
+    # 상위 20개 (게임수 → 승률)
+    top_items = rank_panel(top_items, "items", games, ci_method, rank_lower)
 
-    # 상위 20개
-    top_items = top_items.sort_values(["games","win_rate"], ascending=[False,False]).head(20)
+    # 아이콘 매핑 (원래 이름 기준)
+    top_items["icon_url"] = top_items["item_norm"].map(ITEM_NORM_ICON_MAP)
 
     # Streamlit 출력 (픽률, 승률, 게임수 순)
     st.dataframe(
-        top_items.reset_index(drop=True)[["icon_url","item_norm","pick_rate","win_rate","games"]].to_dict("records"),
+        top_items.reset_index(drop=True)[["icon_url","item_norm","pick_rate","win_rate","win_lo","win_hi","games"]].to_dict("records"),
         use_container_width=True,
         column_config={
             "icon_url": st.column_config.ImageColumn("아이콘", width="small"),
             "item_norm": "아이템",
             "pick_rate": "픽률(%)",
             "win_rate": "승률(%)",
+            **CI_COLS,
             "games": "게임수"
         }
     )
 else:
     st.info("선택 챔피언의 코어템 데이터가 없습니다.")
+perf.lap("core_items", rows=games)
 
 
 # ===== 스펠 & 신발 통계 =====
@@ -295,117 +413,72 @@ col1, col2 = st.columns(2)
 
 # ===================== 스펠 통계 (기존) =====================
 with col1:
-    SPELL_ALIASES = {
-        "점멸":"점멸","표식":"표식","눈덩이":"표식","유체화":"유체화","회복":"회복","점화":"점화",
-        "정화":"정화","탈진":"탈진","방어막":"방어막","총명":"총명","순간이동":"순간이동",
-        "flash":"점멸","mark":"표식","snowball":"표식","ghost":"유체화","haste":"유체화",
-        "heal":"회복","ignite":"점화","cleanse":"정화","exhaust":"탈진","barrier":"방어막",
-        "clarity":"총명","teleport":"순간이동",
-    }
     KOR_TO_DDRAGON = {
         "점멸":"SummonerFlash","표식":"SummonerSnowball","유체화":"SummonerHaste","회복":"SummonerHeal",
         "점화":"SummonerDot","정화":"SummonerBoost","탈진":"SummonerExhaust","방어막":"SummonerBarrier",
         "총명":"SummonerMana","순간이동":"SummonerTeleport",
     }
 
-    def standard_korean_spell(s: str) -> str:
-        return SPELL_ALIASES.get(str(s).strip(), str(s).strip())
-
     def ddragon_spell_icon(s: str) -> str:
         kor = standard_korean_spell(s)
         key = KOR_TO_DDRAGON.get(kor)
         if not key: return ""
-        return f"https://ddragon.leagueoflegends.com/cdn/{DD_VERSION}/img/spell/{key}.png"
-
-    def canonical_pair(a: str, b: str):
-        a_std = standard_korean_spell(a or "")
-        b_std = standard_korean_spell(b or "")
-        if a_std <= b_std:
-            return a_std, b_std
-        return b_std, a_std
-
-    def pick_spell_cols(df_):
-        if {"spell1_name_fix","spell2_name_fix"}.issubset(df_.columns):
-            return "spell1_name_fix", "spell2_name_fix"
-        if {"spell1","spell2"}.issubset(df_.columns):
-            return "spell1", "spell2"
-        cands = [c for c in df_.columns if "spell" in c.lower()]
-        return (cands[0], cands[1]) if len(cands) >= 2 else (None, None)
-
-    s1, s2 = pick_spell_cols(dsel)
+        return assets.localize(f"https://ddragon.leagueoflegends.com/cdn/{DD_VERSION}/img/spell/{key}.png")
 
 # --- 스펠 통계 (픽률 추가) ---
-if games and s1 and s2:
-    tmp = dsel[[s1, s2, "win_clean"]].copy()
-    tmp["s1_std"], tmp["s2_std"] = zip(*tmp.apply(lambda r: canonical_pair(r[s1], r[s2]), axis=1))
-    
-    sp = (
-        tmp.groupby(["s1_std","s2_std"], as_index=False)
-           .agg(games=("win_clean","count"), wins=("win_clean","sum"))
-    )
-    sp["win_rate"] = (sp["wins"]/sp["games"]*100).round(2)
-    sp["pick_rate"] = (sp["games"]/games*100).round(2)  # 전체 선택 게임 대비 비율
-    sp = sp.sort_values(["pick_rate","win_rate"], ascending=[False,False]).head(10)
+sp = tables["spells"]
+if games and not sp.empty:
+    sp = rank_panel(sp, "spells", games, ci_method, rank_lower)
     
     sp["spell1_icon"] = sp["s1_std"].apply(ddragon_spell_icon)
     sp["spell2_icon"] = sp["s2_std"].apply(ddragon_spell_icon)
 else:
-    sp = pd.DataFrame(columns=["s1_std","s2_std","spell1_icon","spell2_icon","pick_rate","win_rate","games"])
+    sp = pd.DataFrame(columns=["s1_std","s2_std","spell1_icon","spell2_icon","pick_rate","win_rate","win_lo","win_hi","games"])
 
 # --- 신발 처리 (픽률 포함) ---
-boots_set = set(df_items.loc[df_items["is_boots"], "item"].astype(str).str.strip())
-item_cols = [c for c in dsel.columns if re.fullmatch(r"item[0-6]_name", c)]
-
-boots_list = []
-for _, row in dsel.iterrows():
-    boots = [row[c] for c in item_cols if str(row[c]).strip() in boots_set]
-    if boots:
-        boots_list.append((boots[0], row["win_clean"]))
-
-if boots_list:
-    boots_df = pd.DataFrame(boots_list, columns=["boots","win_clean"])
-    boots_stat = (
-        boots_df.groupby("boots", as_index=False)
-                .agg(games=("win_clean","count"), wins=("win_clean","sum"))
-    )
-    boots_stat["win_rate"] = (boots_stat["wins"]/boots_stat["games"]*100).round(2)
-    boots_stat["pick_rate"] = (boots_stat["games"]/games*100).round(2)
-    boots_stat = boots_stat.sort_values(["pick_rate","win_rate"], ascending=[False, False])
-    boots_stat["icon_url"] = boots_stat["boots"].map(dict(zip(df_items["item"], df_items["icon_url"])))
+boots_stat = tables["boots"]
+
+if not boots_stat.empty:
+    boots_stat = rank_panel(boots_stat, "boots", games, ci_method, rank_lower)
+    boots_stat["icon_url"] = boots_stat["boots"].map(ITEM_ICON_MAP)
 else:
-    boots_stat = pd.DataFrame(columns=["boots","pick_rate","win_rate","games","icon_url"])
+    boots_stat = pd.DataFrame(columns=["boots","pick_rate","win_rate","win_lo","win_hi","games","icon_url"])
 
 # --- 두 표 나란히 출력 ---
 c1, c2 = st.columns(2)
 with c1:
     st.subheader("스펠")
     st.dataframe(
-        sp[["spell1_icon","spell2_icon","pick_rate","win_rate","games"]].to_dict("records"),
+        sp[["spell1_icon","spell2_icon","pick_rate","win_rate","win_lo","win_hi","games"]].to_dict("records"),
         use_container_width=True,
         column_config={
             "spell1_icon": st.column_config.ImageColumn("스펠1", width="small"),
             "spell2_icon": st.column_config.ImageColumn("스펠2", width="small"),
             "pick_rate":"픽률(%)",
             "win_rate":"승률(%)",
+            **CI_COLS,
             "games":"게임수"
         }
     )
 with c2:
     st.subheader("신발")
     st.dataframe(
-        boots_stat[["icon_url","boots","pick_rate","win_rate","games"]].to_dict("records"),
+        boots_stat[["icon_url","boots","pick_rate","win_rate","win_lo","win_hi","games"]].to_dict("records"),
         use_container_width=True,
         column_config={
             "icon_url": st.column_config.ImageColumn("아이콘", width="small"),
             "boots":"아이템",
             "pick_rate":"픽률(%)",
             "win_rate":"승률(%)",
+            **CI_COLS,
             "games":"게임수"
         }
     )
 
 
 
+perf.lap("spells_boots", rows=games)
+
 # ===== 룬 추천 =====
 st.subheader("룬 통계")
 core_map = rune_maps.get("core", {})
@@ -414,114 +487,229 @@ sub_map  = rune_maps.get("sub", {})
 def _rune_core_icon(name: str) -> str: return core_map.get(name, "")
 def _rune_sub_icon(name: str)  -> str: return sub_map.get(name, "")
 
-if games and {"rune_core","rune_sub"}.issubset(dsel.columns):
-    ru = (
-        dsel.groupby(["rune_core","rune_sub"])
-        .agg(games=("win_clean","count"), wins=("win_clean","sum"))
-        .reset_index()
-    )
-    ru["win_rate"] = (ru["wins"]/ru["games"]*100).round(2)
-    ru["pick_rate"] = (ru["games"]/games*100).round(2)  # 전체 선택 게임 대비 비율
-    ru = ru.sort_values(["pick_rate","win_rate"], ascending=[False,False]).head(10)
+ru = tables["runes"]
+if games and not ru.empty:
+    ru = rank_panel(ru, "runes", games, ci_method, rank_lower)
     ru["rune_core_icon"] = ru["rune_core"].apply(_rune_core_icon)
     ru["rune_sub_icon"]  = ru["rune_sub"].apply(_rune_sub_icon)
 
     st.dataframe(
-        ru[["rune_core_icon","rune_sub_icon","pick_rate","win_rate","games"]].to_dict("records"),
+        ru[["rune_core_icon","rune_sub_icon","pick_rate","win_rate","win_lo","win_hi","games"]].to_dict("records"),
         use_container_width=True,
         column_config={
             "rune_core_icon": st.column_config.ImageColumn("핵심룬", width="small"),
             "rune_sub_icon":  st.column_config.ImageColumn("보조트리", width="small"),
             "pick_rate":"픽률(%)",
             "win_rate":"승률(%)",
+            **CI_COLS,
             "games":"게임수"
         }
     )
 else:
     st.info("룬 컬럼(rune_core, rune_sub)이 없습니다.")
 
-# ===== (선택) 한 패널: 5v5 평균 승률 vs 평균 승률 + GPT 전략 =====
-st.header("5v5 평균 승률 비교 & 전략 (단일 패널)")
-with st.container():
-    st.markdown(
-        "- **챔피언 10명**을 입력하세요: **앞 5명=팀 A(아군)**, **뒤 5명=팀 B(적군)**. (쉼표 또는 공백 구분)\n"
-        "- 모델 학습 전이므로 **챔피언별 베이스라인 승률의 단순 평균**을 비교합니다."
+pg = tables.get("pages", pd.DataFrame())
+if games and not pg.empty:
+    st.caption("룬 페이지 (핵심룬 + 보조트리 + 파편)")
+    pg = rank_panel(pg, "pages", games, ci_method, rank_lower)
+    pg["rune_core_icon"] = pg["rune_core"].apply(_rune_core_icon)
+    pg["rune_sub_icon"]  = pg["rune_sub"].apply(_rune_sub_icon)
+    st.dataframe(
+        pg[["rune_core_icon","rune_sub_icon","shard1","shard2","shard3","pick_rate","win_rate","win_lo","win_hi","games"]].to_dict("records"),
+        use_container_width=True,
+        column_config={
+            "rune_core_icon": st.column_config.ImageColumn("핵심룬", width="small"),
+            "rune_sub_icon":  st.column_config.ImageColumn("보조트리", width="small"),
+            "shard1":"파편1",
+            "shard2":"파편2",
+            "shard3":"파편3",
+            "pick_rate":"픽률(%)",
+            "win_rate":"승률(%)",
+            **CI_COLS,
+            "games":"게임수"
+        }
     )
+perf.lap("runes", rows=games)
+
+# ===== 시너지 / 상성 (슬라이더 조작 시 이 패널만 재실행) =====
+@st.experimental_fragment
+def synergy_panel(mats: dict, selected: str, games: int) -> None:
+    perf.mark(session_recorder())
+    st.subheader("시너지 / 상성")
+    min_pair_games = st.slider("최소 게임수 (시너지/상성)", 1, 50, 3)
+
+    def _pair_table(side: str, ascending: bool) -> pd.DataFrame:
+        t = champion_pairs(mats, selected, side)
+        t = t[t["games"] >= min_pair_games]
+        if t.empty or not games:
+            return pd.DataFrame(columns=["icon","champion","pick_rate","win_rate","win_lo","win_hi","games"])
+        t = with_rates(t, games, ["games"], ci=ci_method)
+        # 하한 정렬: 좋은 아군은 하한이 높은 순, 어려운 적은 상한이 낮은 순 (둘 다 표본이 적으면 뒤로)
+        key = ("win_hi" if ascending else "win_lo") if rank_lower else "win_rate"
+        t = t.sort_values([key,"games"], ascending=[ascending, False]).head(10)
+        t["icon"] = t["champion"].map(champ_map)
+        return t
+
+    pair_cfg = {
+        "icon": st.column_config.ImageColumn("", width="small"),
+        "champion":"챔피언",
+        "pick_rate":"동반율(%)",
+        "win_rate":"승률(%)",
+        **CI_COLS,
+        "games":"게임수"
+    }
+    c1, c2 = st.columns(2)
+    with c1:
+        st.markdown("**함께하면 좋은 아군**")
+        st.dataframe(_pair_table("ally", ascending=False)[["icon","champion","pick_rate","win_rate","win_lo","win_hi","games"]].to_dict("records"),
+                     use_container_width=True, column_config=pair_cfg)
+    with c2:
+        st.markdown("**상대하기 어려운 적**")
+        st.dataframe(_pair_table("enemy", ascending=True)[["icon","champion","pick_rate","win_rate","win_lo","win_hi","games"]].to_dict("records"),
+                     use_container_width=True, column_config={**pair_cfg, "pick_rate":"상대 빈도(%)"})
+    perf.lap("synergy", rows=games)
+
+synergy_panel(fp["synergy"] if conds else load_synergy(PLAYERS_SRC, ITEM_SUM_CSV, WINDOW, DATA_VER), selected, games)
+
+# ===== (선택) 한 패널: 5v5 평균 승률 vs 평균 승률 + GPT 전략 (입력 시 이 패널만 재실행) =====
+@st.experimental_fragment
+def matchup_panel() -> None:
+    perf.mark(session_recorder())
+    st.header("5v5 평균 승률 비교 & 전략 (단일 패널)")
+    with st.container():
+        st.markdown(
+            "- **챔피언 10명**을 입력하세요: **앞 5명=팀 A(아군)**, **뒤 5명=팀 B(적군)**. (쉼표 또는 공백 구분)\n"
+            "- **챔피언별 베이스라인 승률의 단순 평균**과 함께, 조합 로지스틱 회귀 모델의 **팀 A 승리 확률**을 보여줍니다."
+        )
 
-    @st.cache_data
-    def champion_baseline(df_all: pd.DataFrame) -> pd.DataFrame:
-        if "champion" not in df_all.columns:
-            return pd.DataFrame(columns=["champion","games","wins","winrate"])
-        g = (df_all.groupby("champion", as_index=False)
-                    .agg(games=("win_clean","count"), wins=("win_clean","sum")))
-        g["winrate"] = (g["wins"] / g["games"] * 100).round(2)
-        return g.sort_values("champion")
-
-    base_tbl = champion_baseline(df)
-    base_map = dict(zip(base_tbl["champion"], base_tbl["winrate"]))
-
-    raw = st.text_area(
-        "챔피언 10명 입력 (예: Lux Ziggs Sona Seraphine Ashe, Darius Garen Katarina Yasuo Aatrox)",
-        placeholder="Lux Ziggs Sona Seraphine Ashe, Darius Garen Katarina Yasuo Aatrox"
-    )
-    api_key = st.text_input("OpenAI API 키 (선택: 전략 생성용)", type="password", placeholder="sk-...")
-
-    def avg_winrate(lst):
-        vals = [base_map.get(x, None) for x in lst]
-        known = [v for v in vals if v is not None]
-        return round(sum(known)/len(known), 2) if known else None, [x for x,v in zip(lst, vals) if v is None]
-
-    if raw.strip():
-        toks = re.split(r"[,\s]+", raw.strip())
-        toks = [t for t in toks if t]
-        if len(toks) >= 10:
-            ally, enemy = toks[:5], toks[5:10]
-            a_avg, a_missing = avg_winrate(ally)
-            b_avg, b_missing = avg_winrate(enemy)
-
-            c1, c2 = st.columns(2)
-            with c1:
-                st.metric("Team A 평균 승률", f"{a_avg if a_avg is not None else 'N/A'}%")
-                st.caption("A: " + ", ".join(ally))
-                if a_missing: st.error("A 데이터 없음: " + ", ".join(a_missing))
-            with c2:
-                st.metric("Team B 평균 승률", f"{b_avg if b_avg is not None else 'N/A'}%")
-                st.caption("B: " + ", ".join(enemy))
-                if b_missing: st.error("B 데이터 없음: " + ", ".join(b_missing))
-
-            st.divider()
-            st.subheader("전략 코멘트 (선택)")
-            if api_key:
-                try:
-                    import openai
-                    openai.api_key = api_key
-                    a_show = f"{a_avg}%" if a_avg is not None else "N/A"
-                    b_show = f"{b_avg}%" if b_avg is not None else "N/A"
-                    prompt = f"""
-너는 LoL ARAM 코치다. 아래 정보를 바탕으로 3~5줄 전략을 제시하라.
-
-Team A: {', '.join(ally)} (avg {a_show})
-Team B: {', '.join(enemy)} (avg {b_show})
-
-조건:
-- 단순 평균 승률 기반임을 전제(시너지/상성 미반영)
-- 초반/중반/후반 전략 중 핵심 1~2개
-- 과도한 확신/허풍 금지, 간결하게
-""".strip()
-                    resp = openai.chat.completions.create(
-                        model="gpt-4o-mini",
-                        messages=[{"role":"user","content":prompt}],
-                        temperature=0.6,
-                        max_tokens=220,
-                    )
-                    st.write(resp.choices[0].message.content.strip())
-                except Exception as e:
-                    st.error(f"전략 생성 실패: {e}")
-            else:
-                st.info("전략 코멘트를 보려면 OpenAI API 키를 입력하세요.")
-        else:
-            st.warning("챔피언 10명을 입력해야 합니다 (앞5=팀 A, 뒤5=팀 B).")
+        base_tbl = baseline_table(cube["champions"].reset_index(), ci_method)
+        base_map = dict(zip(base_tbl["champion"], base_tbl["winrate"]))
+        base_ci  = dict(zip(base_tbl["champion"], zip(base_tbl["winrate_lo"], base_tbl["winrate_hi"])))
+        win_model = WinModel(load_winprob(WINPROB_JSON, PLAYERS_SRC, ITEM_SUM_CSV, WINDOW, DATA_VER))
 
-# ===== 원본(선택 챔피언) =====
-with st.expander("Raw rows (selected champion)"):
-    st.dataframe(dsel, use_container_width=True)
+        raw = st.text_area(
+            "챔피언 10명 입력 (예: Lux Ziggs Sona Seraphine Ashe, Darius Garen Katarina Yasuo Aatrox)",
+            placeholder="Lux Ziggs Sona Seraphine Ashe, Darius Garen Katarina Yasuo Aatrox"
+        )
+        api_key = st.text_input("OpenAI API 키 (선택: 전략 생성용)", type="password", placeholder="sk-...")
+
+        def avg_winrate(lst):
+            vals = [base_map.get(x, None) for x in lst]
+            known = [v for v in vals if v is not None]
+            return round(sum(known)/len(known), 2) if known else None, [x for x,v in zip(lst, vals) if v is None]
+
+        def avg_interval(lst) -> str:
+            """챔피언별 승률 구간의 평균 (표본이 적은 챔피언이 섞이면 넓어진다)"""
+            known = [base_ci[x] for x in lst if x in base_ci]
+            if not known:
+                return ""
+            lo, hi = (round(sum(v) / len(v), 2) for v in zip(*known))
+            return f" · 구간 평균 {lo}–{hi}% ({CI_LABELS[ci_method]})"
+
+        st.session_state["strategy_request"] = None
+        if raw.strip():
+            toks = re.split(r"[,\s]+", raw.strip())
+            toks = [t for t in toks if t]
+            if len(toks) >= 10:
+                ally, enemy = toks[:5], toks[5:10]
+                a_avg, a_missing = avg_winrate(ally)
+                b_avg, b_missing = avg_winrate(enemy)
+
+                c1, c2 = st.columns(2)
+                with c1:
+                    st.metric("Team A 평균 승률", f"{a_avg if a_avg is not None else 'N/A'}%")
+                    st.caption("A: " + ", ".join(ally) + avg_interval(ally))
+                    if a_missing: st.error("A 데이터 없음: " + ", ".join(a_missing))
+                with c2:
+                    st.metric("Team B 평균 승률", f"{b_avg if b_avg is not None else 'N/A'}%")
+                    st.caption("B: " + ", ".join(enemy) + avg_interval(enemy))
+                    if b_missing: st.error("B 데이터 없음: " + ", ".join(b_missing))
+
+                p_a = win_model.score(ally, enemy)
+                st.metric("모델 예측: Team A 승리 확률", f"{p_a*100:.1f}%")
+                st.markdown("**5번째 픽 추천** (팀 A 앞 4명 + 팀 B 5명 고정)")
+                st.dataframe(win_model.best_fifth(ally[:4], enemy).to_dict("records"),
+                             use_container_width=True,
+                             column_config={"champion":"챔피언", "win_prob":"예상 승률(%)"})
+
+                st.session_state["strategy_request"] = (ally, enemy, a_avg, b_avg, api_key)
+            else:
+                st.warning("챔피언 10명을 입력해야 합니다 (앞5=팀 A, 뒤5=팀 B).")
+    perf.lap("5v5")
+    if st.session_state["strategy_request"] != st.session_state.get("strategy_shown"):
+        # 요청이 바뀜 — 전체 재실행으로 전략 조각을 다시 만든다 (주기 재실행 여부는 조각을 만들 때 정해짐)
+        st.session_state["strategy_shown"] = st.session_state["strategy_request"]
+        st.rerun()
+
+@st.cache_resource
+def strategy_service():
+    """세션 공용 전략 생성기 (스레드 풀 + 영구 캐시). 10명이 입력됐을 때만 import"""
+    from strategy import StrategyService
+    return StrategyService()
+
+def strategy_status(req) -> tuple:
+    """요청의 (상태, 답변) — StrategyService.request 상태 또는 ("no_backend", None). 생성 작업은 여기서 시작된다"""
+    ally, enemy, a_avg, b_avg, api_key = req
+    from strategy import pick_backend
+    backend = pick_backend(api_key)
+    if backend is None:
+        return "no_backend", None
+    return strategy_service().request(ally, enemy, backend, a_avg, b_avg)
+
+# 전략 코멘트는 백그라운드에서 생성 — 생성 중일 때만 이 조각을 STRATEGY_POLL초마다 다시 그리고,
+# 답(또는 실패)이 나오면 전체 재실행 한 번으로 주기 재실행을 끈다 (run_every는 조각을 만들 때 정해짐)
+def strategy_panel() -> None:
+    perf.mark(session_recorder())
+    req = st.session_state.get("strategy_request")
+    if not req:
+        return
+    st.subheader("전략 코멘트 (선택)")
+    status, answer = strategy_status(req)
+    if status == "no_backend":
+        st.info("전략 코멘트를 보려면 OpenAI API 키를 입력하세요.")
+    elif status == "done":
+        st.write(answer)
+    elif status == "pending":
+        st.caption("전략 생성 중… (완료되면 자동으로 표시됩니다)")
+    elif status == "busy":
+        st.caption("전략 생성 요청이 많습니다. 잠시 후 자동으로 다시 시도합니다.")
+    else:
+        st.error(f"전략 생성 실패: {answer}")
+    if st.session_state.get("strategy_polling") and status not in ("pending", "busy"):
+        st.rerun()
+
+matchup_panel()
+_req = st.session_state.get("strategy_request")
+st.session_state["strategy_shown"] = _req
+st.session_state["strategy_polling"] = bool(_req) and strategy_status(_req)[0] in ("pending", "busy")
+st.experimental_fragment(strategy_panel, run_every=STRATEGY_POLL if st.session_state["strategy_polling"] else None)()
+
+# ===== 원본(선택 챔피언) — 현재 페이지 행만 전송 =====
+RAW_PAGE_SIZES = [50, 200, 1000]
+
+@st.experimental_fragment
+def raw_rows_panel(dview: pd.DataFrame) -> None:
+    perf.mark(session_recorder())
+    with st.expander("Raw rows (selected champion)"):
+        c1, c2 = st.columns([1, 1])
+        size = c1.selectbox("페이지 크기", RAW_PAGE_SIZES, key="raw_page_size")
+        pages = max(1, -(-len(dview) // size))
+        page = c2.number_input(f"페이지 (1–{pages})", 1, pages, 1, key="raw_page")
+        lo = (min(page, pages) - 1) * size
+        st.dataframe(dview.iloc[lo:lo + size], use_container_width=True)
+        st.caption(f"{lo + 1 if len(dview) else 0:,}–{min(lo + size, len(dview)):,} / {len(dview):,}행")
+    perf.lap("raw_rows", rows=min(size, len(dview)))
+
+raw_rows_panel(dview)
+
+# ===== Perf 패널 (구간별 최근 / 롤링 백분위, 로더 캐시 적중) =====
+st.sidebar.divider()
+st.sidebar.toggle("Perf", value=PERF_DEFAULT, key="perf_on",
+                  help="구간별 시간·행 수·캐시 적중을 기록합니다 (로그: aram.perf)")
+rec = perf.active()
+if rec is not None:
+    with st.sidebar.expander("Perf", expanded=True):
+        st.dataframe(rec.table(), use_container_width=True, hide_index=True,
+                     column_config={"section":"구간", "last_ms":"최근(ms)", "rows":"행 수", "n":"횟수",
+                                    "p50_ms":"p50", "p90_ms":"p90", "p99_ms":"p99",
+                                    "hits":"캐시 적중", "misses":"캐시 미적중"})
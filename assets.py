@@ -0,0 +1,185 @@
+# assets.py — 아이콘 로컬 캐시 (미러 디렉터리 → 내용 주소 저장소 → 카테고리별 data URI 번들)
+# 사용법: python assets.py [미러 디렉터리] [캐시 디렉터리]
+#   아이콘 CSV 4종(champion_icons, item_summary, rune_icons, spell_icons)의 URL마다 로컬 미러에서 파일을 찾아
+#   sha256 이름(objects/ab/abcd….png)으로 저장하고, 카테고리별 번들(bundle_<카테고리>.json: sha -> data URI)로 묶는다.
+#   대시보드는 번들을 한 번 읽어 CSV의 URL 컬럼을 data URI로 바꿔 쓴다 — 화면을 그릴 때 원격 요청이 없다.
+#   미러 배치는 Data Dragon 압축본 그대로(<버전>/img/…, img/perk-images/…) 또는 <호스트>/<경로>.
+#   URL의 /cdn/<버전>/ 과 같은 버전 파일이 없으면 미러에 있는 다른(최신) 버전으로 대체한다.
+#   st.column_config.ImageColumn은 스프라이트 영역을 지정할 수 없어 스프라이트 시트 대신 data URI로 묶는다.
+import os, re, sys, json, base64, hashlib, shutil
+from collections import Counter
+from urllib.parse import urlsplit
+import pandas as pd
+
+ASSET_DIR = "aram_assets"
+ICON_PX = 64   # 번들에 넣을 때 줄일 최대 변 길이 (표의 small 이미지 칸 기준)
+
+# 카테고리 -> (CSV, URL 컬럼들)
+ICON_SOURCES = {
+    "champion": ("champion_icons.csv", ["champion_icon","icon","icon_url"]),
+    "item":     ("item_summary.csv",   ["icon_url"]),
+    "rune":     ("rune_icons.csv",     ["rune_core_icon","rune_sub_icon","rune_shard_icon","rune_shards_icons"]),
+    "spell":    ("spell_icons.csv",    ["spell1_icon","spell2_icon","icon","icon_url","spell_icon"]),
+}
+
+MIME = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".webp": "image/webp", ".svg": "image/svg+xml"}
+CDN_RE = re.compile(r"/cdn/([0-9][0-9.]*)/")
+
+def ddragon_version(urls, default: str = None) -> str:
+    """URL들의 /cdn/<버전>/ 중 가장 흔한 버전 (없으면 default)"""
+    found = Counter(m.group(1) for u in urls if isinstance(u, str) for m in [CDN_RE.search(u)] if m)
+    return found.most_common(1)[0][0] if found else default
+
+def version_free(url: str) -> str:
+    """버전 무관 키 — /cdn/<버전>/ 을 /cdn/*/ 로"""
+    return CDN_RE.sub("/cdn/*/", url)
+
+def _version_key(v: str):
+    return tuple(int(x) if x.isdigit() else 0 for x in v.split("."))
+
+def mirror_versions(mirror: str) -> list:
+    """미러 최상위(또는 cdn/)의 버전 디렉터리 (최신 순)"""
+    out = []
+    for base in (mirror, os.path.join(mirror, "cdn")):
+        if os.path.isdir(base):
+            out += [d for d in os.listdir(base) if re.fullmatch(r"[0-9][0-9.]*", d)]
+    return sorted(set(out), key=_version_key, reverse=True)
+
+def resolve(url: str, mirror: str, versions: list):
+    """URL -> 미러 파일 경로 (없으면 None)"""
+    parts = urlsplit(url)
+    path = parts.path.lstrip("/")
+    cands = [os.path.join(mirror, parts.netloc, path), os.path.join(mirror, path)]
+    m = CDN_RE.search("/" + path)
+    if m:
+        rest = path[m.end() - 1:]                   # cdn/<버전>/ 뒤 (img/item/…)
+        for v in [m.group(1)] + [v for v in versions if v != m.group(1)]:
+            cands += [os.path.join(mirror, v, rest), os.path.join(mirror, "cdn", v, rest)]
+        cands.append(os.path.join(mirror, rest))
+    return next((c for c in cands if os.path.isfile(c)), None)
+
+def icon_urls(root: str = ".") -> dict:
+    """카테고리 -> 아이콘 CSV의 고유 URL 목록"""
+    out = {}
+    for cat, (fname, cols) in ICON_SOURCES.items():
+        path = os.path.join(root, fname)
+        if not os.path.exists(path):
+            continue
+        df = pd.read_csv(path)
+        urls = [u for c in cols if c in df.columns for u in df[c].dropna().astype(str)]
+        out[cat] = sorted({u.strip() for u in urls if u.strip().startswith("http")})
+    return out
+
+def _object_path(out_dir: str, sha: str, ext: str) -> str:
+    return os.path.join(out_dir, "objects", sha[:2], sha + ext)
+
+def _shrink(data: bytes, ext: str) -> tuple:
+    """ICON_PX보다 크면 PNG로 축소 (Pillow가 없거나 열 수 없는 형식이면 그대로)"""
+    try:
+        from io import BytesIO
+        from PIL import Image
+        im = Image.open(BytesIO(data))
+        if max(im.size) <= ICON_PX:
+            return data, ext
+        im.thumbnail((ICON_PX, ICON_PX))
+        buf = BytesIO()
+        im.save(buf, format="PNG", optimize=True)
+        return buf.getvalue(), ".png"
+    except Exception:
+        return data, ext
+
+def sync_assets(mirror: str, out_dir: str = ASSET_DIR, root: str = ".") -> dict:
+    """미러 -> 내용 주소 캐시 + 카테고리별 data URI 번들 + index.json. 반환: index"""
+    versions = mirror_versions(mirror)
+    index = {"version": None, "urls": {}, "missing": []}
+    all_urls = []
+    for cat, urls in icon_urls(root).items():
+        bundle = {}
+        for url in urls:
+            all_urls.append(url)
+            src = resolve(url, mirror, versions)
+            if src is None:
+                index["missing"].append(url)
+                continue
+            with open(src, "rb") as f:
+                data = f.read()
+            ext = os.path.splitext(src)[1].lower() or ".png"
+            sha = hashlib.sha256(data).hexdigest()
+            obj = _object_path(out_dir, sha, ext)
+            if not os.path.exists(obj):   # 같은 내용은 한 번만 저장
+                os.makedirs(os.path.dirname(obj), exist_ok=True)
+                shutil.copyfile(src, obj + ".tmp")
+                os.replace(obj + ".tmp", obj)
+            if sha not in bundle:
+                small, sext = _shrink(data, ext)
+                bundle[sha] = f"data:{MIME.get(sext, 'image/png')};base64," + base64.b64encode(small).decode("ascii")
+            index["urls"][url] = {"sha": sha, "category": cat, "file": os.path.relpath(obj, out_dir)}
+        _write_json(os.path.join(out_dir, f"bundle_{cat}.json"), bundle)
+    index["version"] = ddragon_version(all_urls)
+    _write_json(os.path.join(out_dir, "index.json"), index)   # index가 마지막 — 번들이 모두 쓰인 뒤에만 보임
+    return index
+
+def _write_json(path: str, obj) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def _read_json(path: str, default=None):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def assets_version(out_dir: str = ASSET_DIR) -> float:
+    """index.json 수정 시각 (없으면 0) — 다시 동기화하면 바뀌는 캐시 키"""
+    path = os.path.join(out_dir, "index.json")
+    return os.path.getmtime(path) if os.path.exists(path) else 0.0
+
+def image_source(uri: str):
+    """st.image 입력 — data URI면 바이트로 (st.image는 data URI 문자열을 파일 경로로 취급)"""
+    if isinstance(uri, str) and uri.startswith("data:"):
+        return base64.b64decode(uri.split(",", 1)[1])
+    return uri
+
+class AssetCache:
+    """URL -> 캐시된 data URI. 캐시에 없는 URL은 그대로 돌려준다(원격 폴백)"""
+
+    def __init__(self, out_dir: str = ASSET_DIR):
+        self.uris, self.version = {}, None
+        index = _read_json(os.path.join(out_dir, "index.json"))
+        if index is None:
+            return
+        self.version = index.get("version")
+        bundles = {}
+        for url, ent in index["urls"].items():
+            cat = ent["category"]
+            if cat not in bundles:
+                bundles[cat] = _read_json(os.path.join(out_dir, f"bundle_{cat}.json"), {})
+            uri = bundles[cat].get(ent["sha"])
+            if uri:
+                self.uris[url] = uri
+                self.uris.setdefault(version_free(url), uri)
+
+    def __len__(self) -> int:
+        return len(self.uris)
+
+    def localize(self, url) -> str:
+        if not isinstance(url, str) or not url:
+            return url
+        return self.uris.get(url) or self.uris.get(version_free(url)) or url
+
+    def localize_column(self, s: pd.Series) -> pd.Series:
+        """URL 컬럼 재작성 (고유값만 조회)"""
+        return s.map({u: self.localize(u) for u in s.dropna().unique()})
+
+if __name__ == "__main__":
+    mirror  = sys.argv[1] if len(sys.argv) > 1 else "ddragon_mirror"
+    out_dir = sys.argv[2] if len(sys.argv) > 2 else ASSET_DIR
+
+    idx = sync_assets(mirror, out_dir)
+    print(f"assets -> {out_dir}: {len(idx['urls'])} icons cached, {len(idx['missing'])} missing "
+          f"(ddragon {idx['version']})")
+    for url in idx["missing"][:10]:
+        print("  missing:", url)
@@ -0,0 +1,75 @@
+# bench_cold_start.py — 참가자 로드 콜드 스타트: CSV(read_csv + 정리) vs Arrow 저장소(메모리 맵)
+# 사용법: python benchmarks/bench_cold_start.py [참가자 CSV] [--rows N] [--workdir DIR]
+#   참가자 행을 matchId만 바꿔 N행까지 복제한 합성 CSV를 만들고, 저장소로 변환한 뒤
+#   각 경로를 새 프로세스에서 로드해 시간/메모리(RSS)를 측정한다.
+import os, sys, json, time, argparse, subprocess
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from store import convert_csv
+
+CHILD = r"""
+import sys, time, json
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+from store import load_participants
+from catalog import ItemCatalog
+from loaders import read_item_summary
+from analysis import item_columns
+df = load_participants({path!r})
+ItemCatalog(read_item_summary({items!r})).encode_frame(df, item_columns(df))
+t = time.perf_counter() - t0
+status = open("/proc/self/status").read()
+kb = lambda key: int(status.split(key + ":")[1].split()[0]) // 1024
+print(json.dumps({{"rows": len(df), "seconds": round(t, 2), "rss_mb": kb("VmRSS"), "peak_rss_mb": kb("VmHWM")}}))
+"""
+
+def synth_csv(src: str, out: str, rows: int, chunk_reps: int = 50) -> None:
+    """원본 행을 rows행까지 복제 (복제본마다 matchId 접미사로 구분)"""
+    base = pd.read_csv(src)
+    written, rep = 0, 0
+    with open(out, "w", encoding="utf-8") as f:
+        while written < rows:
+            parts = []
+            for _ in range(chunk_reps):
+                part = base.copy()
+                part["matchId"] = part["matchId"].astype(str) + f"_{rep}"
+                parts.append(part)
+                rep += 1
+            block = pd.concat(parts, ignore_index=True).head(rows - written)
+            block.to_csv(f, index=False, header=written == 0)
+            written += len(block)
+
+def measure(path: str, items: str) -> dict:
+    code = CHILD.format(root=ROOT, path=path, items=items)
+    res = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if res.returncode != 0:
+        return {"error": res.stderr.strip().splitlines()[-1] if res.stderr else f"exit {res.returncode}"}
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("players", nargs="?", default="aram_participants_with_icons_superlight.csv")
+    ap.add_argument("--items", default="item_summary.csv")
+    ap.add_argument("--rows", type=int, default=5_000_000)
+    ap.add_argument("--workdir", default="bench_data")
+    args = ap.parse_args()
+
+    os.makedirs(args.workdir, exist_ok=True)
+    csv_path = os.path.join(args.workdir, f"players_{args.rows}.csv")
+    arrow_path = os.path.join(args.workdir, f"players_{args.rows}.arrow")
+    if not os.path.exists(csv_path):
+        synth_csv(args.players, csv_path, args.rows)
+    t0 = time.perf_counter()
+    convert_csv(csv_path, arrow_path)
+    t_conv = time.perf_counter() - t0
+
+    print(f"rows: {args.rows:,}  csv {os.path.getsize(csv_path)/1e6:.0f} MB  "
+          f"arrow {os.path.getsize(arrow_path)/1e6:.0f} MB  (convert {t_conv:.1f}s)")
+    for label, path in [("csv  (before)", csv_path), ("arrow (after)", arrow_path)]:
+        r = measure(path, args.items)
+        if "error" in r:
+            print(f"{label}: 실패 — {r['error']}")
+        else:
+            print(f"{label}: {r['seconds']:7.2f}s  rss {r['rss_mb']:6,} MB  peak {r['peak_rss_mb']:6,} MB")
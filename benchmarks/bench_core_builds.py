@@ -0,0 +1,79 @@
+# bench_core_builds.py — 3코어 조합 추출: 기존 iterrows 루프 vs 벡터화 엔진
+# 사용법: python benchmarks/bench_core_builds.py [참가자 CSV] [--rows N] [--loop-rows M]
+#   N: 참가자 행을 복제해 만든 벤치마크 크기, M: 기존 루프는 느리므로 앞 M행만 측정 후 행당 시간으로 환산
+import os, sys, time, argparse
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis import item_columns, item_codes, first_k_codes, panel_counts
+from catalog import ItemCatalog
+from loaders import read_players
+
+def legacy_triples(dsel: pd.DataFrame, df_items: pd.DataFrame) -> list:
+    """app.py 기존 구현 그대로 (행마다 is_core_item -> df_items 전체 필터)"""
+    item_cols = item_columns(dsel)
+
+    def is_core_item(item_name: str) -> bool:
+        if not item_name or item_name == "포로 간식":
+            return False
+        sub = df_items[df_items["item"] == item_name]
+        if sub.empty:
+            return False
+        is_core = str(sub["is_core"].iloc[0]).strip().lower() in ["true","1","yes"]
+        is_boots = str(sub["is_boots"].iloc[0]).strip().lower() in ["true","1","yes"]
+        return is_core and not is_boots
+
+    out = []
+    for _, row in dsel.iterrows():
+        items = [row[c] for c in item_cols if row[c]]
+        items = [i for i in items if is_core_item(i)]
+        core = items[:3]
+        out.append(tuple(core) if len(core) == 3 else None)
+    return out
+
+def vector_triples(dsel: pd.DataFrame, catalog: ItemCatalog) -> list:
+    tri = first_k_codes(item_codes(dsel, catalog), catalog.build_core_mask, 3)
+    return [tuple(catalog.names[t]) if (t >= 0).all() else None for t in tri]
+
+def _time(fn, *args):
+    t0 = time.perf_counter()
+    res = fn(*args)
+    return time.perf_counter() - t0, res
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("players", nargs="?", default="aram_participants_with_icons_superlight.csv")
+    ap.add_argument("--items", default="item_summary.csv")
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--loop-rows", type=int, default=3_000)
+    args = ap.parse_args()
+
+    base = read_players(args.players)
+    df_items = pd.read_csv(args.items)
+    reps = -(-args.rows // len(base))
+    big = pd.concat([base] * reps, ignore_index=True).head(args.rows)
+
+    sample = big.head(args.loop_rows)
+    t_loop, ref = _time(legacy_triples, sample, df_items)
+    catalog = ItemCatalog(df_items)
+    t_vec_s, got = _time(vector_triples, sample, catalog)
+    assert ref == got, "벡터화 결과가 기존 루프와 다릅니다"
+
+    # 아이템 슬롯 컬럼(itemN_name)이 없는 입력: 기존 루프처럼 조합 없음 + 아이템 패널 빈 표
+    bare = sample.drop(columns=item_columns(sample))
+    assert legacy_triples(bare, df_items) == vector_triples(bare, catalog) == [None] * len(bare), \
+        "아이템 컬럼 없는 입력의 결과가 기존 루프와 다릅니다"
+    bare_panels = panel_counts(bare, catalog)
+    assert all(bare_panels[p].empty for p in ("items", "cores", "boots")), "아이템 컬럼 없는 입력에 아이템 패널이 생겼습니다"
+
+    codes_t0 = time.perf_counter()
+    codes = item_codes(big, catalog)
+    t_encode = time.perf_counter() - codes_t0
+    t_vec, _ = _time(first_k_codes, codes, catalog.build_core_mask, 3)
+
+    per_row = t_loop / len(sample)
+    print(f"legacy loop   : {len(sample):>10,} rows  {t_loop:8.3f}s  ({per_row*1e6:8.1f} us/row)")
+    print(f"vectorized    : {len(sample):>10,} rows  {t_vec_s:8.3f}s  (same triples: OK, no-item-columns: OK)")
+    print(f"vectorized    : {len(big):>10,} rows  encode {t_encode:.3f}s + extract {t_vec:.3f}s")
+    print(f"legacy (est.) : {len(big):>10,} rows  {per_row*len(big):8.1f}s")
+    print(f"speedup       : {per_row*len(big)/(t_encode+t_vec):8.0f}x")
@@ -0,0 +1,66 @@
+# bench_first_render.py — 대시보드 첫 렌더 시간: 원래 로더(콜드) vs 웜 스타트 스냅샷
+# 사용법: python benchmarks/bench_first_render.py [--runs N] [--snapshot PATH] [--target-ms MS]
+#   리포 루트의 기본 입력으로 스냅샷을 만들고, 모드마다 새 프로세스에서 AppTest로 app.py를 한 번 실행한다.
+#   first_render = 앱 스크립트 시작 ~ 요약 지표 (앱이 aram.perf 로거에 남기는 값),
+#   process      = 프로세스 시작 ~ 첫 실행 끝 (파이썬/Streamlit import 포함).
+import os, sys, json, argparse, subprocess
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from snapshot import build_snapshot, save_snapshot
+from store import STORE_PATH, pick_source
+
+CHILD = r"""
+import time, json, logging
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+events = []
+class Grab(logging.Handler):
+    def emit(self, record):
+        msg = record.getMessage()
+        if '"first_render"' in msg:
+            events.append(json.loads(msg))
+log = logging.getLogger("aram.perf")
+log.addHandler(Grab())
+log.setLevel(logging.INFO)
+at = AppTest.from_file("app.py", default_timeout=300).run()
+print(json.dumps({"first_render_ms": events[0]["ms"] if events else None,
+                  "process_ms": round((time.perf_counter() - t0) * 1000, 1),
+                  "snapshot": events[0].get("snapshot") if events else None,
+                  "exceptions": len(at.exception)}))
+"""
+
+def run_once(snapshot: str) -> dict:
+    env = {**os.environ, "ARAM_SNAPSHOT": snapshot}
+    res = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, env=env, capture_output=True, text=True)
+    if res.returncode != 0:
+        return {"error": res.stderr.strip().splitlines()[-1] if res.stderr else f"exit {res.returncode}"}
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--snapshot", default=os.path.join("bench_data", "aram_snapshot.pkl"))
+    ap.add_argument("--players", default="aram_participants_with_icons_superlight.csv")
+    ap.add_argument("--items", default="item_summary.csv")
+    ap.add_argument("--target-ms", type=float, default=1000.0)
+    args = ap.parse_args()
+
+    os.chdir(ROOT)
+    os.makedirs(os.path.dirname(args.snapshot) or ".", exist_ok=True)
+    save_snapshot(build_snapshot(pick_source(STORE_PATH, args.players), args.items), args.snapshot)
+    print(f"snapshot: {args.snapshot} ({os.path.getsize(args.snapshot) / 1e6:.1f} MB)")
+
+    for label, snap in [("cold loaders ", ""), ("warm snapshot", os.path.abspath(args.snapshot))]:
+        rs = [run_once(snap) for _ in range(args.runs)]
+        errs = [r["error"] for r in rs if "error" in r]
+        if errs:
+            print(f"{label}: 실패 — {errs[0]}")
+            continue
+        fr = np.array([r["first_render_ms"] for r in rs], dtype=float)
+        pr = np.array([r["process_ms"] for r in rs], dtype=float)
+        ok = "OK" if np.median(fr) < args.target_ms else "over"
+        print(f"{label}: first_render p50 {np.median(fr):7.1f} ms  max {fr.max():7.1f} ms  "
+              f"process p50 {np.median(pr):7.1f} ms  snapshot={rs[0]['snapshot']}  "
+              f"exceptions={sum(r['exceptions'] for r in rs)}  [{ok} vs {args.target_ms:.0f} ms]")
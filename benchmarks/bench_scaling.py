@@ -0,0 +1,134 @@
+# bench_scaling.py — 패널별 규모 확장 벤치마크 (10만 / 100만 / 1천만 행)
+# 사용법: python benchmarks/bench_scaling.py [원본 CSV] [--sizes 100000,1000000,10000000]
+#                                          [--source arrow|csv] [--workdir DIR] [--out JSON]
+#   크기마다 synth_players.py로 합성 CSV를 만들고(있으면 재사용) 저장소로 변환한 뒤,
+#   새 프로세스에서 구간별(load_players, 3코어, 코어템, 스펠, 신발, 룬, 룬 페이지, champion_baseline,
+#   승률 구간: 전 챔피언 전 그룹 Wilson/부트스트랩, 최다 챔피언 한 명의 전 그룹 부트스트랩)
+#   벽시계 시간과 최대 RSS를 잰다. 구간 사이에 /proc/self/clear_refs로 최대 RSS를 초기화하므로
+#   peak_rss_mb는 해당 구간 동안의 최대치, delta_mb는 구간 시작 대비 증가분이다.
+#   결과는 JSON(기본 <workdir>/bench_scaling.json)으로 기록 — 회귀 추적용.
+import os, sys, json, time, platform, argparse, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from store import convert_csv
+from synth_players import generate
+
+CHILD = r"""
+import sys, time, json
+sys.path.insert(0, {root!r})
+from store import load_participants
+from catalog import ItemCatalog
+from loaders import read_item_summary
+from analysis import (item_columns, core_build_counts, core_item_counts, spell_pair_counts,
+                      boots_counts, rune_counts, rune_page_counts, champion_baseline, encode_attributes)
+from confidence import intervals
+
+def rss():
+    status = open("/proc/self/status").read()
+    kb = lambda key: int(status.split(key + ":")[1].split()[0]) // 1024
+    return kb("VmRSS"), kb("VmHWM")
+
+def reset_peak():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+out, state = {{}}, {{}}
+def section(name, fn):
+    reset_peak()
+    before, _ = rss()
+    t0 = time.perf_counter()
+    state[name] = fn()
+    t = time.perf_counter() - t0
+    _, peak = rss()
+    out[name] = {{"seconds": round(t, 3), "peak_rss_mb": peak, "delta_mb": peak - before}}
+    print(json.dumps({{"section": name, **out[name]}}), flush=True)   # 중간 종료(OOM) 시에도 완료 구간은 남김
+
+def load():
+    catalog = ItemCatalog(read_item_summary({items!r}))
+    df = load_participants({path!r})
+    state["df"], state["catalog"] = encode_attributes(catalog.encode_frame(df, item_columns(df))), catalog
+
+section("load_players", load)
+df, catalog = state["df"], state["catalog"]
+by = ["champion"]
+section("core_builds",       lambda: core_build_counts(df, catalog, by=by))
+section("core_items",        lambda: core_item_counts(df, catalog, by=by))
+section("spells",            lambda: spell_pair_counts(df, by=by))
+section("boots",             lambda: boots_counts(df, catalog, by=by))
+section("runes",             lambda: rune_counts(df, by=by))
+section("rune_pages",        lambda: rune_page_counts(df, by=by))
+section("champion_baseline", lambda: champion_baseline(df))
+panels = [state[k] for k in ["core_builds","core_items","spells","boots","runes","rune_pages"]]
+top = df["champion"].value_counts().index[0]
+champ = [t[t["champion"] == top] for t in panels]
+def ci_all(tables, method):
+    return [intervals(t["wins"].to_numpy(), t["games"].to_numpy(), method) for t in tables]
+section("ci_wilson_all",          lambda: ci_all(panels, "wilson"))
+section("ci_bootstrap_champion",  lambda: ci_all(champ, "bootstrap"))
+section("ci_bootstrap_all",       lambda: ci_all(panels, "bootstrap"))
+out["ci_groups"] = {{"all": sum(len(t) for t in panels), "champion": sum(len(t) for t in champ)}}
+print(json.dumps({{"ci_groups": out["ci_groups"]}}))
+print(json.dumps({{"rows": len(df), "peak_reset": reset_peak()}}))
+"""
+
+def measure(path: str, items: str) -> dict:
+    code = CHILD.format(root=ROOT, path=path, items=items)
+    p = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    lines = [json.loads(x) for x in p.stdout.splitlines() if x.startswith("{")]
+    out = {"sections": {}}
+    for r in lines:
+        if "section" in r:
+            out["sections"][r.pop("section")] = r
+        else:
+            out.update(r)
+    if p.returncode != 0:
+        out["error"] = (p.stderr.strip().splitlines() or [f"exit {p.returncode}"])[-1]
+    return out
+
+def environment() -> dict:
+    import numpy, pandas, pyarrow
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "cpus": os.cpu_count(), "numpy": numpy.__version__, "pandas": pandas.__version__,
+            "pyarrow": pyarrow.__version__, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("src", nargs="?", default="aram_participants_clean_preprocessed.csv")
+    ap.add_argument("--items", default="item_summary.csv")
+    ap.add_argument("--sizes", default="100000,1000000,10000000")
+    ap.add_argument("--source", choices=["arrow","csv"], default="arrow")
+    ap.add_argument("--workdir", default="bench_data")
+    ap.add_argument("--out", default=None)
+    args = ap.parse_args()
+
+    os.makedirs(args.workdir, exist_ok=True)
+    report = {"env": environment(), "source": args.source, "results": []}
+    for rows in [int(x) for x in args.sizes.split(",") if x]:
+        csv_path = os.path.join(args.workdir, f"players_synth_{rows}.csv")
+        arrow_path = os.path.join(args.workdir, f"players_synth_{rows}.arrow")
+        entry = {"rows": rows}
+        if not os.path.exists(csv_path):
+            t0 = time.perf_counter()
+            generate(args.src, csv_path, rows)
+            entry["generate_seconds"] = round(time.perf_counter() - t0, 2)
+        if args.source == "arrow" and not os.path.exists(arrow_path):
+            t0 = time.perf_counter()
+            convert_csv(csv_path, arrow_path)
+            entry["convert_seconds"] = round(time.perf_counter() - t0, 2)
+        entry.update(measure(arrow_path if args.source == "arrow" else csv_path, args.items))
+        report["results"].append(entry)
+
+        print(f"{rows:>11,} rows" + (f": 실패 — {entry['error']}" if "error" in entry else ""))
+        for name, r in entry["sections"].items():
+            print(f"  {name:22s} {r['seconds']:8.3f}s  peak {r['peak_rss_mb']:6,} MB  (+{r['delta_mb']:,} MB)")
+
+    out = args.out or os.path.join(args.workdir, "bench_scaling.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"results -> {out}")
@@ -0,0 +1,78 @@
+# load_api.py — api.py 부하 테스트: 캐시 적중 / 미적중 조회의 p50·p99 지연과 처리량(RPS)
+# 사용법: python benchmarks/load_api.py [참가자 CSV 또는 .arrow] [--requests N] [--concurrency C]
+#   서버를 같은 프로세스에서 임의 포트로 띄우고, 챔피언 × (필터 없음 / 핵심룬 필터) × 패널 URL을
+#   C개 스레드가 keep-alive 연결로 나눠 요청한다. 미적중 구간은 리포트 캐시를 끈 상태로 측정.
+import os, sys, json, time, argparse, threading, http.client
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlencode
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from api import Dataset, LRUCache, make_server
+from cube import CUBE_TABLES
+
+def query_urls(ds: Dataset) -> list:
+    """챔피언마다 패널 URL (필터 없음 + 가장 많이 쓴 핵심룬 필터)"""
+    urls = []
+    for i, champ in enumerate(ds.champions):
+        panel = list(CUBE_TABLES)[i % len(CUBE_TABLES)]
+        base = f"/champions/{quote(champ)}/{panel}"
+        urls.append(base)
+        runes = ds.report(champ)["panels"]["runes"]
+        if runes:
+            urls.append(base + "?" + urlencode({"rune_core": runes[0]["rune_core"]}))
+    return urls
+
+def run(port: int, urls: list, n: int, concurrency: int) -> dict:
+    lat = np.zeros(n)
+    per = [list(range(k, n, concurrency)) for k in range(concurrency)]
+
+    def worker(slots):
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        for j in slots:
+            t = time.perf_counter()
+            conn.request("GET", urls[j % len(urls)])
+            resp = conn.getresponse()
+            resp.read()
+            lat[j] = time.perf_counter() - t
+            if resp.status != 200:
+                raise RuntimeError(f"{urls[j % len(urls)]} -> {resp.status}")
+        conn.close()
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as ex:
+        list(ex.map(worker, per))
+    wall = time.perf_counter() - t0
+    return {"requests": n, "concurrency": concurrency, "seconds": round(wall, 3),
+            "rps": round(n / wall, 1),
+            "p50_ms": round(float(np.percentile(lat, 50)) * 1000, 2),
+            "p99_ms": round(float(np.percentile(lat, 99)) * 1000, 2)}
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("players", nargs="?", default="aram_participants_with_icons_superlight.csv")
+    ap.add_argument("--items", default="item_summary.csv")
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--out", default=None, help="결과 JSON 파일 (선택)")
+    args = ap.parse_args()
+
+    ds = Dataset(args.players, args.items)
+    server = make_server(ds, port=0)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = query_urls(ds)
+
+    results = {}
+    run(port, urls, len(urls), args.concurrency)              # 예열: 모든 키를 캐시에 적재
+    results["cached"] = run(port, urls, args.requests, args.concurrency)
+    ds.cache = LRUCache(0)
+    results["uncached"] = run(port, urls, min(args.requests, len(urls) * 2), args.concurrency)
+    server.shutdown()
+
+    for label, r in results.items():
+        print(f"{label:9s}: {r['requests']:6,} req  {r['rps']:8.1f} req/s  p50 {r['p50_ms']:7.2f} ms  p99 {r['p99_ms']:7.2f} ms")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
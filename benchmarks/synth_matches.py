@@ -0,0 +1,82 @@
+# synth_matches.py — 참가자 CSV를 원본 매치 상세 JSON(match-v5 형태) 파일로 되돌리는 픽스처 생성기
+# 사용법: python benchmarks/synth_matches.py [참가자 CSV] [--out DIR] [--per-file N] [--dup-every K]
+#   flatten.py를 네트워크 없이 검증/측정하기 위한 입력을 만든다. 이름 -> id는 flatten.py 사전의 역매핑,
+#   아이템은 item_summary 아이콘 파일명의 match-v5 id. 매치마다 파일 하나(--per-file > 1이면 매치 리스트)로 기록하고,
+#   --dup-every K면 K번째 파일마다 직전 매치를 다른 폴더에 한 번 더 써서 중복 제거를 확인할 수 있다.
+#   python flatten.py <DIR> 로 다시 평탄화하면 원본과 같은 행이 나온다(gameVersion/gameCreation 제외).
+import os, sys, json, argparse
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from flatten import SPELL_NAMES, RUNE_STYLES, KEYSTONES, SHARD_NAMES, item_names
+from loaders import clean_players
+
+def _ids(table: dict) -> dict:
+    return {v: k for k, v in table.items()}
+
+def _id(rev: dict, name) -> int:
+    """이름 -> id (빈 값 0, 미등록 id 문자열은 숫자로)"""
+    name = "" if pd.isna(name) else str(name).strip()
+    if not name:
+        return 0
+    return rev.get(name, int(name) if name.isdigit() else 0)
+
+def to_matches(df: pd.DataFrame, items_path: str) -> list:
+    """참가자 행 -> 매치 상세 dict 리스트 (매치 안 참가자 순서 유지)"""
+    item_ids = _ids(item_names(items_path))
+    spells, styles, keys, shards = _ids(SPELL_NAMES), _ids(RUNE_STYLES), _ids(KEYSTONES), _ids(SHARD_NAMES)
+    items = sorted(c for c in df.columns if c.startswith("item") and c.endswith("_name"))
+    out = []
+    for mid, g in df.groupby("matchId", sort=False):
+        parts = []
+        for r in g.itertuples(index=False):
+            sh = (str(r.rune_shards).split("|") + ["", "", ""])[:3] if not pd.isna(r.rune_shards) else ["", "", ""]
+            parts.append({
+                "summonerName": r.summonerName, "riotIdGameName": r.riotIdGameName, "riotIdTagline": r.riotIdTagline,
+                "teamId": int(r.teamId), "championName": r.champion, "win": bool(r.win),
+                "kills": int(r.kills), "deaths": int(r.deaths), "assists": int(r.assists), "goldEarned": int(r.gold),
+                "totalDamageDealtToChampions": int(r.damage_total), "magicDamageDealtToChampions": int(r.damage_magic),
+                "physicalDamageDealtToChampions": int(r.damage_physical),
+                "trueDamageDealtToChampions": int(r.damage_true),
+                **{f"item{j}": _id(item_ids, getattr(r, c)) for j, c in enumerate(items)},
+                "summoner1Id": _id(spells, r.spell1), "summoner2Id": _id(spells, r.spell2),
+                "perks": {
+                    "statPerks": dict(zip(["offense","flex","defense"], [_id(shards, s) for s in sh])),
+                    "styles": [
+                        {"description": "primaryStyle", "style": 0, "selections": [{"perk": _id(keys, r.rune_core)}]},
+                        {"description": "subStyle", "style": _id(styles, r.rune_sub), "selections": []},
+                    ],
+                },
+            })
+        out.append({"metadata": {"matchId": mid}, "info": {"gameMode": "ARAM", "participants": parts}})
+    return out
+
+def write_fixtures(src_csv: str, out_dir: str, items_path: str, per_file: int = 1, dup_every: int = 0) -> int:
+    """매치 JSON 파일 기록. 반환: 파일 수"""
+    matches = to_matches(clean_players(pd.read_csv(src_csv)), items_path)
+    os.makedirs(os.path.join(out_dir, "a"), exist_ok=True)
+    n = 0
+    for i in range(0, len(matches), per_file):
+        chunk = matches[i:i + per_file]
+        with open(os.path.join(out_dir, "a", f"{i:08d}.json"), "w", encoding="utf-8") as f:
+            json.dump(chunk[0] if per_file == 1 else chunk, f, ensure_ascii=False)
+        n += 1
+        if dup_every and n % dup_every == 0:
+            os.makedirs(os.path.join(out_dir, "b"), exist_ok=True)
+            with open(os.path.join(out_dir, "b", f"{i:08d}.json"), "w", encoding="utf-8") as f:
+                json.dump(chunk[-1], f, ensure_ascii=False)
+            n += 1
+    return n
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("src", nargs="?", default="aram_participants_with_icons_superlight.csv")
+    ap.add_argument("--items", default="item_summary.csv")
+    ap.add_argument("--out", default=os.path.join("bench_data", "matches"))
+    ap.add_argument("--per-file", type=int, default=1)
+    ap.add_argument("--dup-every", type=int, default=0)
+    args = ap.parse_args()
+
+    n = write_fixtures(args.src, args.out, args.items, args.per_file, args.dup_every)
+    print(f"fixtures -> {args.out}: {n:,} files")
@@ -0,0 +1,158 @@
+# synth_players.py — 실제 분포를 따르는 합성 참가자 테이블 생성기
+# 사용법: python benchmarks/synth_players.py [원본 CSV] --rows N [--out 파일] [--seed S]
+#   원본(참가자 CSV)에서 챔피언 빈도, 챔피언별 아이템/스펠/룬 분포, 슬롯별 빈칸 비율,
+#   룬 파편 문자열, 수치 컬럼을 추정한 뒤 매치 단위(10명, 팀 100/200)로 샘플링한다.
+#   - 챔피언: 매치마다 10명을 빈도 가중 비복원 추출 → team_champs / enemy_champs 일관
+#   - 승패: 챔피언별 (수축된) 승률의 로짓 합 차이로 팀 승리 확률 결정
+#   - 아이템: 슬롯마다 P(아이템|챔피언) × P(슬롯|아이템) 으로 비복원 추출 (첫 슬롯 전설템, 둘째 신발 등 위치 경향 유지)
+#   청크 단위로 CSV에 이어 쓰므로 1천만 행도 메모리에 한 번에 올리지 않는다.
+#   아이템 컬럼은 분석 코드가 읽는 itemN_name 이름으로 기록한다.
+import os, sys, re, argparse
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from loaders import clean_players
+
+TEAM = 5
+ITEM_SLOTS = 6            # item0~5 (item6 = 장신구 슬롯은 따로 추정)
+ALPHA = 2.0               # 챔피언별 분포 평활 강도 (전역 분포 유사 카운트)
+MATCH_CHUNK = 20_000      # 청크당 매치 수 (20만 행)
+NUMERIC = ["kills","deaths","assists","gold","damage_total","damage_magic","damage_physical","damage_true"]
+COLUMNS = (["matchId","summonerName","riotIdGameName","riotIdTagline","teamId","champion","win"] + NUMERIC
+           + [f"item{j}_name" for j in range(ITEM_SLOTS + 1)]
+           + ["team_champs","enemy_champs","spell1","spell2","rune_core","rune_sub","rune_shards"])
+
+def _item_cols(df: pd.DataFrame) -> list:
+    """itemN_name 또는 itemN 컬럼 (슬롯 순)"""
+    named = sorted(c for c in df.columns if re.fullmatch(r"item[0-6]_name", c))
+    return named or sorted(c for c in df.columns if re.fullmatch(r"item[0-6]", c))
+
+def _cond_probs(keys: pd.Series, vals: pd.Series, champs: list, alpha: float = ALPHA):
+    """챔피언별 범주 분포 P(값|챔피언) — (챔피언 수 × 범주 수) 행렬, 전역 분포로 평활"""
+    cats = sorted(pd.unique(vals.dropna()))
+    ct = pd.crosstab(keys, vals).reindex(index=champs, columns=cats, fill_value=0).to_numpy(float)
+    glob = ct.sum(axis=0) / max(ct.sum(), 1)
+    p = ct + alpha * glob
+    return np.array(cats, dtype=object), p / p.sum(axis=1, keepdims=True)
+
+class PlayerModel:
+    """원본 참가자 행에서 추정한 생성 분포"""
+
+    def __init__(self, src: pd.DataFrame):
+        df = clean_players(src)
+        self.champs = sorted(df["champion"].unique())
+        cnt = df["champion"].value_counts().reindex(self.champs).to_numpy(float)
+        self.champ_p = (cnt + 1) / (cnt + 1).sum()
+        g = df.groupby("champion")["win_clean"].agg(["sum","count"]).reindex(self.champs)
+        wr = ((g["sum"] + 5) / (g["count"] + 10)).to_numpy()          # 10게임 사전분포로 수축
+        self.strength = np.log(wr / (1 - wr))
+
+        items = _item_cols(df)
+        long = df[["champion"] + items[:ITEM_SLOTS]].melt("champion", value_name="item")
+        long = long[long["item"].astype(str).str.strip() != ""].dropna()
+        self.items, self.item_p = _cond_probs(long["champion"], long["item"], self.champs)
+        pos = pd.crosstab(long["item"], long["variable"]).reindex(index=self.items, columns=items[:ITEM_SLOTS], fill_value=0)
+        self.slot_aff = ((pos + 1) / (pos.sum(axis=1).to_numpy()[:, None] + ITEM_SLOTS)).to_numpy()
+        self.slot_empty = [float((df[c].fillna("").astype(str).str.strip() == "").mean()) for c in items[:ITEM_SLOTS]]
+        last = df[items[ITEM_SLOTS]].fillna("").astype(str) if len(items) > ITEM_SLOTS else pd.Series([""])
+        vc = last.value_counts(normalize=True)
+        self.trinkets, self.trinket_p = vc.index.to_numpy(object), vc.to_numpy()
+
+        pair = df["spell1"].astype(str) + "\x1f" + df["spell2"].astype(str)
+        self.spells, self.spell_p = _cond_probs(df["champion"], pair, self.champs)
+        rune = df["rune_core"].astype(str) + "\x1f" + df["rune_sub"].astype(str)
+        self.runes, self.rune_p = _cond_probs(df["champion"], rune, self.champs)
+        vc = df["rune_shards"].fillna("").astype(str).value_counts(normalize=True)
+        self.shards, self.shard_p = vc.index.to_numpy(object), vc.to_numpy()
+        self.numeric = df[NUMERIC].to_numpy()     # 행 단위 부트스트랩 (컬럼 간 상관 유지)
+
+    def _pick_rows(self, rng, p: np.ndarray, champ: np.ndarray) -> np.ndarray:
+        """행마다 챔피언 조건부 범주 하나 (역CDF)"""
+        cdf = np.cumsum(p, axis=1)[champ]
+        u = rng.random((len(champ), 1))
+        return np.minimum((cdf < u).sum(axis=1), p.shape[1] - 1)
+
+    def sample(self, rng, n_matches: int, match_offset: int) -> pd.DataFrame:
+        k = len(self.champs)
+        # 매치당 10명 비복원 추출 (Gumbel top-k)
+        keys = np.log(self.champ_p) + rng.gumbel(size=(n_matches, k))
+        picks = np.argpartition(-keys, 2 * TEAM, axis=1)[:, :2 * TEAM]
+        rng.permuted(picks, axis=1, out=picks)
+        team_a, team_b = picks[:, :TEAM], picks[:, TEAM:]
+        z = self.strength[team_a].sum(axis=1) - self.strength[team_b].sum(axis=1)
+        a_wins = rng.random(n_matches) < 1 / (1 + np.exp(-z))
+
+        names = np.array(self.champs, dtype=object)
+        fmt = lambda m: np.array(["[" + ", ".join(f"'{c}'" for c in row) + "]" for row in names[m]], dtype=object)
+        a_str, b_str = fmt(team_a), fmt(team_b)
+
+        # 참가자 행: 매치별 10행 (앞 5 = 팀 100, 뒤 5 = 팀 200)
+        n = n_matches * 2 * TEAM
+        champ = picks.ravel()
+        m_idx = np.repeat(np.arange(n_matches), 2 * TEAM)
+        is_a = np.tile(np.r_[np.ones(TEAM, bool), np.zeros(TEAM, bool)], n_matches)
+        out = pd.DataFrame({
+            "matchId": "KR_" + pd.Series(9_000_000_000 + match_offset + m_idx).astype(str),
+            "summonerName": [f"player{i % 250_000}#KR1" for i in rng.integers(0, 10**9, n)],
+            "teamId": np.where(is_a, 100, 200),
+            "champion": names[champ],
+            "win": np.where(is_a, a_wins[m_idx], ~a_wins[m_idx]).astype(np.int64),
+        })
+        out["riotIdGameName"] = out["summonerName"].str.split("#").str[0]
+        out["riotIdTagline"] = "KR1"
+        num = self.numeric[rng.integers(0, len(self.numeric), n)]
+        for j, c in enumerate(NUMERIC):
+            out[c] = num[:, j]
+
+        # 아이템: 슬롯 순서대로 한 개씩 비복원 추출 (Gumbel-max), 빈 슬롯은 그 자리 비움
+        base = np.log(self.item_p[champ])
+        used = np.zeros(base.shape, dtype=bool)
+        slots = np.empty((n, ITEM_SLOTS), dtype=object)
+        for j in range(ITEM_SLOTS):
+            keys_j = base + np.log(self.slot_aff[:, j]) + rng.gumbel(size=base.shape)
+            keys_j[used] = -np.inf
+            pick = keys_j.argmax(axis=1)
+            used[np.arange(n), pick] = True
+            slots[:, j] = self.items[pick]
+        empty = rng.random((n, ITEM_SLOTS)) < np.array(self.slot_empty)
+        slots[empty] = ""
+        for j in range(ITEM_SLOTS):
+            out[f"item{j}_name"] = slots[:, j]
+        out[f"item{ITEM_SLOTS}_name"] = self.trinkets[rng.choice(len(self.trinkets), n, p=self.trinket_p)]
+
+        out["team_champs"] = np.where(is_a, a_str[m_idx], b_str[m_idx])
+        out["enemy_champs"] = np.where(is_a, b_str[m_idx], a_str[m_idx])
+        sp = pd.Series(self.spells[self._pick_rows(rng, self.spell_p, champ)]).str.split("\x1f", expand=True)
+        out["spell1"], out["spell2"] = sp[0].to_numpy(), sp[1].to_numpy()
+        ru = pd.Series(self.runes[self._pick_rows(rng, self.rune_p, champ)]).str.split("\x1f", expand=True)
+        out["rune_core"], out["rune_sub"] = ru[0].to_numpy(), ru[1].to_numpy()
+        out["rune_shards"] = self.shards[rng.choice(len(self.shards), n, p=self.shard_p)]
+        return out[COLUMNS]
+
+def generate(src_csv: str, out_csv: str, rows: int, seed: int = 0) -> int:
+    """원본 분포로 rows행(10의 배수로 올림) 합성 CSV 기록. 반환: 기록 행 수"""
+    model = PlayerModel(pd.read_csv(src_csv))
+    rng = np.random.default_rng(seed)
+    n_matches = -(-rows // (2 * TEAM))
+    tmp = out_csv + ".tmp"
+    written = 0
+    for start in range(0, n_matches, MATCH_CHUNK):
+        part = model.sample(rng, min(MATCH_CHUNK, n_matches - start), start)
+        part.to_csv(tmp, mode="w" if start == 0 else "a", header=start == 0, index=False)
+        written += len(part)
+    os.replace(tmp, out_csv)
+    return written
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("src", nargs="?", default="aram_participants_clean_preprocessed.csv")
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--out", default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    out = args.out or os.path.join("bench_data", f"players_synth_{args.rows}.csv")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    print(f"synth -> {out}: {generate(args.src, out, args.rows, args.seed):,} rows")
@@ -0,0 +1,75 @@
+# bitmap_index.py — 챔피언 뷰 교차 필터용 비트맵 인덱스
+# 속성값마다 행 id 비트맵(np.packbits로 8배 압축)을 보관하고, 필터 조합은 비트맵 AND로 계산한다.
+import numpy as np
+import pandas as pd
+
+from analysis import row_spell_pairs, row_first_boots, parse_champ_lists
+from catalog import ItemCatalog
+
+class BitmapIndex:
+    """(속성, 값) -> 압축 비트맵. 한 행이 여러 값을 가질 수 있다(아군/적군 챔피언)."""
+
+    def __init__(self, n_rows: int):
+        self.n = n_rows
+        self.bitmaps = {}   # (attr, value) -> packed uint8
+        self.counts = {}    # (attr, value) -> 행 수
+
+    def _put(self, attr: str, value, rows: np.ndarray) -> None:
+        bits = np.zeros(self.n, dtype=bool)
+        bits[rows] = True
+        self.bitmaps[(attr, value)] = np.packbits(bits)
+        self.counts[(attr, value)] = int(bits.sum())
+
+    def _add_pairs(self, attr: str, rows: np.ndarray, values) -> None:
+        """(행, 값) 쌍을 값별로 묶어 비트맵 생성 (빈 문자열은 색인하지 않음)"""
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        for k, u in enumerate(uniques):
+            if u != "":
+                self._put(attr, u, rows[order[bounds[k]:bounds[k + 1]]])
+
+    def add(self, attr: str, values) -> None:
+        """행마다 값 하나"""
+        self._add_pairs(attr, np.arange(self.n), values)
+
+    def add_multi(self, attr: str, lists: list) -> None:
+        """행마다 값 여러 개"""
+        rows = np.repeat(np.arange(len(lists)), [len(x) for x in lists])
+        self._add_pairs(attr, rows, [v for x in lists for v in x])
+
+    def values(self, attr: str) -> list:
+        """속성값 목록 (행 수 내림차순)"""
+        vals = [(v, c) for (a, v), c in self.counts.items() if a == attr]
+        return [v for v, _ in sorted(vals, key=lambda x: (-x[1], str(x[0])))]
+
+    def select(self, conds: list) -> np.ndarray:
+        """[(attr, value), ...] 모두 만족하는 행 위치 (조건 없으면 전체)"""
+        if not conds:
+            return np.arange(self.n)
+        acc = None
+        for key in conds:
+            bm = self.bitmaps.get(key)
+            if bm is None:
+                return np.arange(0)
+            acc = bm if acc is None else np.bitwise_and(acc, bm)
+        return np.flatnonzero(np.unpackbits(acc, count=self.n))
+
+def spell_label(a: str, b: str) -> str:
+    return f"{a} + {b}"
+
+def build_champion_index(dsel: pd.DataFrame, catalog: ItemCatalog) -> BitmapIndex:
+    """선택 챔피언 행에 대해 핵심룬/스펠쌍/첫 신발/아군/적군 비트맵 구성"""
+    idx = BitmapIndex(len(dsel))
+    if "rune_core" in dsel.columns:
+        idx.add("rune_core", dsel["rune_core"].astype(str).to_numpy())
+    s1, s2 = row_spell_pairs(dsel)
+    idx.add("spells", [spell_label(a, b) if a or b else "" for a, b in zip(s1, s2)])
+    idx.add("boots", row_first_boots(dsel, catalog))
+    champs = dsel["champion"].astype(str).to_numpy() if "champion" in dsel.columns else [""] * len(dsel)
+    if "team_champs" in dsel.columns:
+        allies = parse_champ_lists(dsel["team_champs"])
+        idx.add_multi("ally", [[c for c in lst if c != me] for lst, me in zip(allies, champs)])
+    if "enemy_champs" in dsel.columns:
+        idx.add_multi("enemy", parse_champ_lists(dsel["enemy_champs"]))
+    return idx
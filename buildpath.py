@@ -0,0 +1,92 @@
+# buildpath.py — 빌드 경로 트라이 (코어템 구매 순서 접두사 트리)
+# 행마다 코어템(3코어와 같은 기준: 코어, 부츠·포로 간식 제외)을 슬롯 순서대로 나열해
+# 접두사 트리를 한 번 만들고, 노드마다 게임수/승수를 둔다. 노드는 깊이별로 (부모, 아이템) 정렬 순서로
+# 배열에 쌓이므로 parent 배열이 단조 증가 — 자식 목록은 searchsorted 두 번으로 찾는다.
+import numpy as np
+import pandas as pd
+
+from analysis import item_codes, first_k_codes
+from catalog import ItemCatalog
+
+ROOT = 0
+
+class BuildTrie:
+    """노드 배열: parent, item(카탈로그 id), depth, games, wins. 루트(0)는 전체 행"""
+
+    def __init__(self, seqs: np.ndarray, win: np.ndarray, names: np.ndarray):
+        self.names = names
+        n, depth = seqs.shape
+        k = len(names) + 1
+        parent, item, level = [np.array([-1])], [np.array([-1])], [np.array([0])]
+        games, wins = [np.array([n])], [np.array([float(win.sum())])]
+        node = np.zeros(n, dtype=np.int64)   # 행별 현재 노드
+        next_id = 1
+        for d in range(depth):
+            live = seqs[:, d] >= 0                         # 왼쪽 정렬 — 빈 칸 이후는 모두 빈 칸
+            if not live.any():
+                break
+            key = node[live] * k + seqs[live, d]
+            uniq, inv = np.unique(key, return_inverse=True)
+            ids = next_id + np.arange(len(uniq))
+            parent.append(uniq // k)
+            item.append(uniq % k)
+            level.append(np.full(len(uniq), d + 1))
+            games.append(np.bincount(inv, minlength=len(uniq)))
+            wins.append(np.bincount(inv, weights=win[live], minlength=len(uniq)))
+            node[live] = ids[inv]
+            node[~live] = -1
+            next_id += len(uniq)
+        self.parent = np.concatenate(parent)
+        self.item = np.concatenate(item)
+        self.depth = np.concatenate(level)
+        self.games = np.concatenate(games).astype(np.int64)
+        self.wins = np.concatenate(wins).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def children(self, v: int) -> np.ndarray:
+        return np.arange(np.searchsorted(self.parent, v, side="left"), np.searchsorted(self.parent, v, side="right"))
+
+    def find(self, prefix: list):
+        """아이템 이름 접두사 -> 노드 id (없으면 None)"""
+        v = ROOT
+        for name in prefix:
+            ch = self.children(v)
+            hit = ch[self.names[self.item[ch]] == name]
+            if not len(hit):
+                return None
+            v = int(hit[0])
+        return v
+
+    def next_items(self, prefix: list, top: int = 10) -> pd.DataFrame:
+        """접두사 다음 아이템 분포: item, games, wins, win_rate, share(접두사 게임 대비 %)"""
+        v = self.find(prefix)
+        cols = ["item","games","wins","win_rate","share"]
+        if v is None:
+            return pd.DataFrame(columns=cols)
+        ch = self.children(v)
+        ch = ch[np.lexsort((-self.wins[ch], -self.games[ch]))][:top]
+        g = self.games[ch]
+        return pd.DataFrame({
+            "item": self.names[self.item[ch]],
+            "games": g,
+            "wins": self.wins[ch],
+            "win_rate": np.round(self.wins[ch] / np.maximum(g, 1) * 100, 2),
+            "share": np.round(g / max(int(self.games[v]), 1) * 100, 2),
+        })
+
+    def stats(self, prefix: list) -> dict:
+        """접두사 노드의 게임수/승률과 여기서 끝난(다음 코어템 없음) 게임수"""
+        v = self.find(prefix)
+        if v is None:
+            return {"games": 0, "win_rate": 0.0, "ends": 0}
+        g = int(self.games[v])
+        return {"games": g, "win_rate": round(float(self.wins[v]) / g * 100, 2) if g else 0.0,
+                "ends": g - int(self.games[self.children(v)].sum())}
+
+def build_trie(df: pd.DataFrame, catalog: ItemCatalog) -> BuildTrie:
+    """참가자 행 -> 코어템 구매 순서 트라이 (깊이 = 아이템 슬롯 수)"""
+    codes = item_codes(df, catalog)
+    seqs = first_k_codes(codes, catalog.build_core_mask, codes.shape[1])
+    return BuildTrie(seqs, df["win_clean"].to_numpy(dtype=np.float64), catalog.names)
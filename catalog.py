@@ -0,0 +1,82 @@
+# catalog.py — 아이템 카탈로그: 이름 <-> 정수 id, 분류 비트마스크, 아이콘 URL
+import numpy as np
+import pandas as pd
+
+# 분류 비트
+CORE     = 1   # is_core
+BOOTS    = 2   # is_boots
+EXCLUDED = 4   # 코어템 통계 제외 (포로 간식, 물약, 수당)
+SNACK    = 8   # 포로 간식 (3코어 조합에서도 제외)
+
+EXCLUDED_ITEMS = ["포로 간식","물약","수당"]
+NO_ITEM = -1   # 빈 슬롯 / 카탈로그에 없는 이름
+
+def to_bool(x) -> bool:
+    """문자열/숫자 모두 처리 가능하게 bool 변환"""
+    return str(x).strip().lower() in ["true","1","yes"]
+
+def norm_item(x) -> str:
+    return str(x).strip().lower()
+
+class ItemCatalog:
+    """item_summary 한 번 로드 -> id별 이름/정규화 이름/플래그/아이콘 배열.
+    같은 이름이 여러 행이면 첫 행 기준."""
+
+    def __init__(self, df_items: pd.DataFrame):
+        first = df_items.dropna(subset=["item"]).drop_duplicates("item")
+        self.names = first["item"].astype(str).to_numpy(dtype=object)
+        self.norms = np.array([norm_item(n) for n in self.names], dtype=object)
+        self.icons = (first["icon_url"].to_numpy(dtype=object)
+                      if "icon_url" in first.columns else np.full(len(first), "", dtype=object))
+        flags = np.zeros(len(first), dtype=np.uint8)
+        for col, bit in [("is_core", CORE), ("is_boots", BOOTS)]:
+            if col in first.columns:
+                flags |= np.where(first[col].apply(to_bool), bit, 0).astype(np.uint8)
+        flags |= np.where(np.isin(self.norms, EXCLUDED_ITEMS), EXCLUDED, 0).astype(np.uint8)
+        flags |= np.where(self.names == "포로 간식", SNACK, 0).astype(np.uint8)
+        self.flags = flags
+        self.ids = {n: i for i, n in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    # --- 마스크 (id -> bool) ---
+    def mask(self, require: int, forbid: int = 0) -> np.ndarray:
+        return ((self.flags & require) == require) & ((self.flags & forbid) == 0)
+
+    @property
+    def build_core_mask(self) -> np.ndarray:
+        """3코어 조합용: 코어 & 비부츠, 포로 간식 제외"""
+        return self.mask(CORE, BOOTS | SNACK)
+
+    @property
+    def core_item_mask(self) -> np.ndarray:
+        """코어템 통계용: 코어 & 비부츠, 포로 간식/물약/수당 제외"""
+        return self.mask(CORE, BOOTS | EXCLUDED)
+
+    @property
+    def boots_mask(self) -> np.ndarray:
+        return self.mask(BOOTS)
+
+    # --- 인코딩 ---
+    def encode(self, values) -> np.ndarray:
+        """이름 배열 -> id 배열 (빈 값/미등록은 NO_ITEM). Categorical이면 카테고리만 매핑"""
+        if isinstance(getattr(values, "dtype", None), pd.CategoricalDtype):
+            cat_ids = self.encode(values.cat.categories.to_numpy(dtype=object))
+            return np.append(cat_ids, NO_ITEM).astype(np.int16)[values.cat.codes.to_numpy()]
+        return pd.Series(values, dtype=object).map(self.ids).fillna(NO_ITEM).to_numpy(dtype=np.int16)
+
+    def encode_frame(self, df: pd.DataFrame, cols: list) -> pd.DataFrame:
+        """itemN_name 컬럼마다 itemN_id(int16) 컬럼 추가"""
+        for c in cols:
+            df[c.replace("_name", "_id")] = self.encode(df[c])
+        return df
+
+    # --- 아이콘 ---
+    @property
+    def icon_map(self) -> dict:
+        return dict(zip(self.names, self.icons))
+
+    @property
+    def norm_icon_map(self) -> dict:
+        return dict(zip(self.norms, self.icons))
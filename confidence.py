@@ -0,0 +1,82 @@
+# confidence.py — 승률 신뢰구간 (집계표의 모든 그룹을 NumPy 배치 한 번으로)
+# games/wins 배열을 받아 그룹별 [하한, 상한]을 한꺼번에 계산한다. 입력은 이미 집계된 수치라
+# 비용은 원본 행 수와 무관하게 그룹 수(부트스트랩은 그룹 수 × 표본 수)에 비례한다.
+#   wilson    : Wilson 점수 구간 — 게임수가 적으면 0.5 쪽으로 넓어진다
+#   bayes     : 베타 사전분포(표 전체 승률, PRIOR_GAMES게임 분량)로 수축한 사후 평균 ± z·사후 표준편차
+#               (scipy 없이 정규 근사)
+#   bootstrap : 그룹 안 승패를 복원 추출 — 재표집 승수는 Binomial(games, 승률)이므로
+#               (그룹 × 표본) 이항 난수 한 번과 분위수로 모든 그룹을 동시에 처리.
+#               승률은 plus-four(승+2)/(게임+4)로 다듬어 뽑는다 — 2게임 100% 같은 그룹이 [100, 100]으로
+#               굳어 하한 정렬 맨 위에 오는 것을 막는다
+import numpy as np
+import pandas as pd
+
+CI_METHODS = ("wilson", "bayes", "bootstrap")
+Z95 = 1.959964          # 양측 95%
+PRIOR_GAMES = 20        # bayes: 사전분포 강도(가상 게임수)
+BOOT_SAMPLES = 2000     # bootstrap: 그룹당 재표집 수
+BOOT_CHUNK = 4096       # bootstrap: 한 번에 처리할 그룹 수 (그룹 × 표본 배열 크기 제한)
+
+def _arrays(wins, games):
+    w = np.asarray(wins, dtype=np.float64)
+    n = np.asarray(games, dtype=np.float64)
+    return w, n, np.where(n > 0, w / np.maximum(n, 1), np.nan)
+
+def wilson(wins, games, z: float = Z95):
+    """Wilson 점수 구간 (0~1). 게임수 0이면 nan"""
+    w, n, p = _arrays(wins, games)
+    z2 = z * z
+    denom = 1 + z2 / np.maximum(n, 1)
+    center = (p + z2 / (2 * np.maximum(n, 1))) / denom
+    half = z * np.sqrt(p * (1 - p) / np.maximum(n, 1) + z2 / (4 * np.maximum(n, 1) ** 2)) / denom
+    return center - half, center + half
+
+def bayes(wins, games, prior_rate: float = None, prior_games: float = PRIOR_GAMES, z: float = Z95):
+    """Beta(prior_rate·k, (1-prior_rate)·k) 사전분포의 사후 평균 ± z·사후 표준편차 (0~1로 자름).
+    prior_rate 생략 시 표 전체 승률(합계 wins / 합계 games)"""
+    w, n, _ = _arrays(wins, games)
+    if prior_rate is None:
+        prior_rate = w.sum() / n.sum() if n.sum() > 0 else 0.5
+    a, b = w + prior_rate * prior_games, n - w + (1 - prior_rate) * prior_games
+    mean = a / (a + b)
+    sd = np.sqrt(a * b / ((a + b) ** 2 * (a + b + 1)))
+    return np.clip(mean - z * sd, 0, 1), np.clip(mean + z * sd, 0, 1)
+
+def bootstrap(wins, games, samples: int = BOOT_SAMPLES, level: float = 0.95, seed: int = 0):
+    """그룹별 백분위 부트스트랩 구간 — (그룹 × samples) 이항 표본(plus-four 승률)을 한 번에 뽑아 분위수.
+    같은 (wins, games) 그룹은 한 번만 뽑는다 (긴 꼬리의 1/1, 0/1, 1/2 … 그룹이 대부분이라 표본 수가 크게 준다)"""
+    w, n, _ = _arrays(wins, games)
+    pairs, inv = np.unique(np.column_stack([w, n]), axis=0, return_inverse=True)
+    uw, un = pairs[:, 0], pairs[:, 1].astype(np.int64)
+    lo, hi = np.full(len(un), np.nan), np.full(len(un), np.nan)
+    rng = np.random.default_rng(seed)
+    q = [(1 - level) / 2, (1 + level) / 2]
+    for s in range(0, len(un), BOOT_CHUNK):
+        nn = un[s:s + BOOT_CHUNK]
+        ok = np.flatnonzero(nn > 0)
+        p4 = (uw[s:s + BOOT_CHUNK][ok] + 2) / (nn[ok] + 4)
+        draws = rng.binomial(nn[ok, None], p4[:, None], size=(len(ok), samples))
+        qlo, qhi = np.quantile(draws, q, axis=1)
+        lo[s + ok], hi[s + ok] = qlo / nn[ok], qhi / nn[ok]
+    inv = inv.reshape(-1)
+    return lo[inv], hi[inv]
+
+def intervals(wins, games, method: str = "wilson", prior_rate: float = None):
+    """method(CI_METHODS) 구간 (0~1). prior_rate: bayes 사전 승률 (생략 시 입력 전체 승률)"""
+    if method == "wilson":
+        return wilson(wins, games)
+    if method == "bayes":
+        return bayes(wins, games, prior_rate)
+    if method == "bootstrap":
+        return bootstrap(wins, games)
+    raise ValueError(f"unknown interval method: {method}")
+
+def pooled_rate(t: pd.DataFrame):
+    """집계표 전체 승률 (bayes 사전 승률 — 상위 N개만 구간을 계산할 때 자르기 전 표에서 구해 넘긴다)"""
+    g = t["games"].sum()
+    return float(t["wins"].sum() / g) if g > 0 else None
+
+def add_intervals(t: pd.DataFrame, method: str = "wilson", prefix: str = "win", prior_rate: float = None) -> pd.DataFrame:
+    """games/wins 집계표 + <prefix>_lo / <prefix>_hi (%) 열"""
+    lo, hi = intervals(t["wins"].to_numpy(), t["games"].to_numpy(), method, prior_rate)
+    return t.assign(**{f"{prefix}_lo": np.round(lo * 100, 2), f"{prefix}_hi": np.round(hi * 100, 2)})
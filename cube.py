@@ -0,0 +1,183 @@
+# cube.py — 챔피언별 사전 집계 큐브 (오프라인 빌드 → 대시보드는 조회만)
+# 사용법: python cube.py [참가자 CSV 또는 .arrow 저장소] [item_summary CSV] [출력 디렉터리]
+import os, sys, json, glob
+import numpy as np
+import pandas as pd
+
+from analysis import item_columns, champion_counts, panel_counts, encode_attributes, SHARD_COLS
+from catalog import ItemCatalog
+from loaders import read_item_summary
+from store import load_participants, concat_partitions
+
+CUBE_DIR = "aram_cube"
+BATCH_DIR = "batches"   # 큐브 디렉터리 아래, 증분 반영(ingest.py)된 신규 행 — 참가자 프레임/전체 재빌드에 합친다
+
+# 테이블명 -> 챔피언 뒤에 붙는 그룹 키
+CUBE_TABLES = {
+    "items":  ["item_norm"],
+    "cores":  ["core1","core2","core3"],
+    "spells": ["s1_std","s2_std"],
+    "boots":  ["boots"],
+    "runes":  ["rune_core","rune_sub"],
+    "pages":  ["rune_core","rune_sub"] + SHARD_COLS,
+}
+
+# 참가자 식별 키 — ARAM은 한 매치에 같은 챔피언이 없으므로 (매치, 챔피언) = 참가자
+KEY_COLS = ["matchId","champion"]
+
+def source_signature(path: str) -> dict:
+    """원본 파일 식별값(크기, 수정시각) — 큐브 최신 여부 판단용"""
+    st_ = os.stat(path)
+    return {"path": os.path.basename(path), "size": st_.st_size, "mtime": int(st_.st_mtime)}
+
+def _plain(t: pd.DataFrame) -> pd.DataFrame:
+    """categorical 키 컬럼 -> 일반 문자열 (저장소 로드 여부와 무관하게 같은 큐브)"""
+    for c in t.columns:
+        if isinstance(t[c].dtype, pd.CategoricalDtype):
+            t[c] = t[c].astype(object)
+    return t
+
+def build_cube(df: pd.DataFrame, catalog: ItemCatalog) -> dict:
+    """챔피언 × (코어템, 3코어, 스펠쌍, 신발, 룬, 룬 페이지) games/wins 집계"""
+    cube = {"champions": champion_counts(df), **panel_counts(df, catalog, by=["champion"])}
+    cube = {name: _plain(t) for name, t in cube.items()}
+    cube["meta"] = {
+        "rows": int(len(df)),
+        "matches": int(df["matchId"].nunique()) if "matchId" in df.columns else int(len(df)),
+    }
+    return cube
+
+def merge_cubes(base: dict, delta: dict) -> dict:
+    """games/wins/matches 합산. 두 큐브의 참가자(KEY_COLS)가 겹치지 않으면 합친 행의 재빌드와 동일"""
+    out = {}
+    for name, keys in [("champions", []), *CUBE_TABLES.items()]:
+        k = ["champion"] + keys
+        t = pd.concat([x[name] for x in (base, delta) if not x[name].empty], ignore_index=True)
+        num = [c for c in t.columns if c not in k]
+        out[name] = (t.groupby(k, as_index=False)[num].sum().astype({c: "int64" for c in num})
+                     if len(t) else base[name])
+    out["meta"] = {**base["meta"], "rows": base["meta"]["rows"] + delta["meta"]["rows"]}
+    return out
+
+def _write_atomic(path: str, write) -> None:
+    tmp = path + ".tmp"
+    write(tmp)
+    os.replace(tmp, path)
+
+def save_cube(cube: dict, out_dir: str = CUBE_DIR) -> None:
+    """테이블별 Parquet(문자열 컬럼은 dictionary 인코딩) + meta.json(마지막에 기록)"""
+    os.makedirs(out_dir, exist_ok=True)
+    for name, tbl in cube.items():
+        if name == "meta":
+            continue
+        t = tbl.copy()
+        for c in t.columns:
+            if t[c].dtype == object:
+                t[c] = t[c].astype("category")
+        _write_atomic(os.path.join(out_dir, f"{name}.parquet"), lambda p: t.to_parquet(p, index=False))
+
+    def _meta(p):
+        with open(p, "w", encoding="utf-8") as f:
+            json.dump(cube["meta"], f, ensure_ascii=False, indent=2)
+    _write_atomic(os.path.join(out_dir, "meta.json"), _meta)
+
+def cube_version(path: str = CUBE_DIR) -> int:
+    """증분 반영 횟수 (meta.json의 version, 없으면 0) — 대시보드 캐시 키"""
+    try:
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            return int(json.load(f).get("version", 0))
+    except (OSError, ValueError):
+        return 0
+
+# ===== 참가자 키 (증분 반영 시 중복 제거용) =====
+def participant_keys(df: pd.DataFrame) -> pd.DataFrame:
+    return df[KEY_COLS].astype(str).drop_duplicates().reset_index(drop=True)
+
+def read_keys(path: str = CUBE_DIR):
+    p = os.path.join(path, "keys.parquet")
+    return pd.read_parquet(p) if os.path.exists(p) else None
+
+def write_keys(keys: pd.DataFrame, path: str = CUBE_DIR) -> None:
+    os.makedirs(path, exist_ok=True)
+    _write_atomic(os.path.join(path, "keys.parquet"),
+                  lambda p: keys.astype("category").to_parquet(p, index=False))
+
+# ===== 증분 반영 행 (큐브 카운터와 같은 참가자 집합을 행 단위 화면에도) =====
+def read_batches(path: str = CUBE_DIR):
+    """반영된 배치 행 (반영 순서대로 합침). 없으면 None"""
+    files = sorted(glob.glob(os.path.join(path, BATCH_DIR, "batch_*.parquet")))
+    if not files:
+        return None
+    return pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+
+def with_batches(df: pd.DataFrame, path: str = CUBE_DIR, prepare=None) -> pd.DataFrame:
+    """원본 참가자 프레임 + 반영된 배치 행 (원본에 이미 있는 참가자는 제외 — 원본을 다시 만들며 포함된 경우).
+    prepare: 배치 행에 먼저 적용할 함수 (df가 이미 인코딩된 프레임일 때 같은 인코딩). 배치가 없으면 df 그대로"""
+    b = read_batches(path)
+    if b is None:
+        return df
+    have = df[df[KEY_COLS[0]].isin(b[KEY_COLS[0]].unique())]
+    if len(have):
+        keys = pd.MultiIndex.from_frame(have[KEY_COLS].astype(str))
+        b = b[~pd.MultiIndex.from_frame(b[KEY_COLS].astype(str)).isin(keys)].reset_index(drop=True)
+    if b.empty:
+        return df
+    if prepare is not None:
+        b = prepare(b)
+    b = b.reindex(columns=df.columns)
+    for c in df.columns:
+        if isinstance(df[c].dtype, pd.CategoricalDtype):
+            b[c] = b[c].astype("category")
+    return concat_partitions([df, b])
+
+def load_cube(path: str = CUBE_DIR):
+    """디스크 큐브 로드. 없거나 테이블이 빠졌으면(이전 버전 큐브) None"""
+    meta_path = os.path.join(path, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        cube = {"meta": json.load(f)}
+    for name in ["champions", *CUBE_TABLES]:
+        p = os.path.join(path, f"{name}.parquet")
+        if not os.path.exists(p):
+            return None
+        cube[name] = _plain(pd.read_parquet(p))
+    return cube
+
+def index_cube(cube: dict) -> dict:
+    """테이블별 (챔피언 순 정렬표, {챔피언: (시작, 끝)}) — 패널은 champion_table로 한 챔피언 구간만 자른다.
+    챔피언마다 부분표를 미리 만들지 않아 큐브 로드 직후 첫 렌더가 빠르다 (챔피언 안 행 순서는 원본 순서)"""
+    out = {"meta": cube["meta"], "champions": cube["champions"].set_index("champion")}
+    for name, keys in CUBE_TABLES.items():
+        t = cube[name]
+        champ = t["champion"].astype(str).to_numpy()
+        order = np.argsort(champ, kind="stable")
+        uniq, start = np.unique(champ[order], return_index=True)
+        end = np.append(start[1:], len(order))
+        out[name] = (t[keys + ["games","wins"]].iloc[order].reset_index(drop=True),
+                     dict(zip(uniq.tolist(), zip(start.tolist(), end.tolist()))))
+    return out
+
+def champion_table(icube: dict, name: str, champion: str) -> pd.DataFrame:
+    t, spans = icube[name]
+    span = spans.get(champion)
+    if span is None:
+        return pd.DataFrame(columns=CUBE_TABLES[name] + ["games","wins"])
+    return t.iloc[span[0]:span[1]].reset_index(drop=True)
+
+if __name__ == "__main__":
+    players = sys.argv[1] if len(sys.argv) > 1 else "aram_participants_with_icons_superlight.csv"
+    items   = sys.argv[2] if len(sys.argv) > 2 else "item_summary.csv"
+    out_dir = sys.argv[3] if len(sys.argv) > 3 else CUBE_DIR
+
+    catalog = ItemCatalog(read_item_summary(items))
+    df = with_batches(load_participants(players), out_dir)   # 재빌드에도 반영된 배치 행 유지
+    cube = build_cube(encode_attributes(catalog.encode_frame(df, item_columns(df))), catalog)
+    cube["meta"]["source"] = source_signature(players)
+    cube["meta"]["item_source"] = source_signature(items)
+    if os.path.exists(os.path.join(out_dir, "meta.json")):
+        # 기존 큐브를 덮으면 version을 올린다 — 대시보드 캐시가 새로 읽고, 배치 파일 번호도 이어진다
+        cube["meta"]["version"] = cube_version(out_dir) + 1
+    save_cube(cube, out_dir)
+    write_keys(participant_keys(df), out_dir)
+    print(f"cube -> {out_dir}: " + ", ".join(f"{k}={len(v)}" for k, v in cube.items() if k != "meta"))
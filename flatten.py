@@ -0,0 +1,257 @@
+# flatten.py — 원본 매치 상세 JSON(match-v5) → 참가자 CSV 병렬 평탄화
+# 사용법: python flatten.py <JSON 디렉터리[,디렉터리...]> [출력 CSV] [item_summary CSV] [프로세스 수]
+#   디렉터리 아래 *.json(하위 폴더 포함, 파일 하나에 매치 하나 또는 매치 리스트)을 경로 순으로
+#   파일 묶음(FILES_PER_TASK) 단위로 프로세스 풀에 나눠 평탄화하고, 부모가 순서대로 CSV에 이어 쓴다.
+#   - 중복 제거: matchId 기준, 먼저 나온(경로 순) 매치만 기록
+#   - 재개: 묶음마다 <출력>.progress 에 처리한 파일과 기록 후 바이트 위치를 남긴다.
+#           다시 실행하면 마지막 기록 위치로 잘라낸 뒤(중단 시 반쯤 쓴 묶음 제거) 남은 파일만 처리
+#   - ARAM(gameMode) 아닌 매치, 읽을 수 없는 파일은 건너뛰고 개수만 보고
+#   출력 컬럼은 대시보드가 읽는 참가자 스키마(itemN_name, spell/rune 이름, team_champs/enemy_champs, win)
+#   + gameVersion/gameCreation (파티션 저장소가 패치/날짜로 나눌 때 사용).
+#   아이템 id -> 이름은 item_summary icon_url의 파일명 id (match-v5 payload와 같은 id).
+#         python flatten.py check [item_summary CSV]
+#   실제 match-v5 아이템 id로 된 예시 매치(SAMPLE_MATCH)를 평탄화해 아이템 이름이 맞는지 확인
+import os, sys, json, time, tempfile
+import multiprocessing as mp
+import pandas as pd
+
+from loaders import read_item_summary
+
+FLAT_CSV = "aram_participants_flat.csv"
+FILES_PER_TASK = 256   # 작업 하나가 읽는 JSON 파일 수
+
+COLUMNS = (["matchId","summonerName","riotIdGameName","riotIdTagline","teamId","champion","win",
+            "kills","deaths","assists","gold","damage_total","damage_magic","damage_physical","damage_true"]
+           + [f"item{j}_name" for j in range(7)]
+           + ["team_champs","enemy_champs","spell1","spell2","rune_core","rune_sub","rune_shards",
+              "gameVersion","gameCreation"])
+
+SPELL_NAMES = {
+    1:"정화", 3:"탈진", 4:"점멸", 6:"유체화", 7:"회복", 11:"강타", 12:"순간이동",
+    13:"총명", 14:"점화", 21:"방어막", 32:"표식",
+}
+RUNE_STYLES = {8000:"정밀", 8100:"지배", 8200:"마법", 8300:"영감", 8400:"결의"}
+KEYSTONES = {
+    8005:"집중 공격", 8008:"치명적 속도", 8010:"정복자", 8021:"기민한 발놀림",
+    8112:"감전", 8128:"어둠의 수확", 9923:"칼날비",
+    8214:"콩콩이 소환", 8229:"신비로운 유성", 8230:"난입",
+    8437:"착취의 손아귀", 8439:"여진", 8465:"수호자",
+    8351:"빙결 강화", 8360:"봉인 풀린 주문서", 8369:"선제공격",
+}
+# 기존 추출본과 같은 표기 — 여기 없는 파편(5010, 5011, 5013 등)은 id 문자열 그대로
+SHARD_NAMES = {5001:"체력 +15~90", 5005:"공속 +10%", 5007:"스킬가속 +8", 5008:"적응형 능력치 +9"}
+
+ITEM_ICON_ID = r"/item/(\d+)\.png"
+_LOOKUP = {}   # 워커 공유: item id -> 이름
+
+# 실제 match-v5 응답에서 줄인 참가자 두 명 (아이템 id는 payload 그대로) — python flatten.py check
+SAMPLE_MATCH = {
+    "metadata": {"matchId": "KR_7000000001"},
+    "info": {"gameMode": "ARAM", "gameVersion": "15.16.700.1234", "gameCreation": 1755000000000, "participants": [
+        {"riotIdGameName": "A", "riotIdTagline": "KR1", "teamId": 100, "championName": "Lux", "win": True,
+         "item0": 3020, "item1": 6655, "item2": 3089, "item3": 3157, "item4": 3135, "item5": 0, "item6": 2052,
+         "summoner1Id": 4, "summoner2Id": 32},
+        {"riotIdGameName": "B", "riotIdTagline": "KR1", "teamId": 200, "championName": "Ashe", "win": False,
+         "item0": 3006, "item1": 3031, "item2": 3046, "item3": 6672, "item4": 0, "item5": 0, "item6": 2052,
+         "summoner1Id": 4, "summoner2Id": 7},
+    ]},
+}
+SAMPLE_ITEMS = [
+    ["마법사의 신발", "루덴의 동반자", "라바돈의 죽음모자", "존야의 모래시계", "공허의 지팡이", "", "포로 간식"],
+    ["광전사의 군화", "무한의 대검", "유령 무희", "크라켄 학살자", "", "", "포로 간식"],
+]
+
+def item_names(items_path: str) -> dict:
+    """match-v5 item id -> item 이름. id는 icon_url 파일명(…/img/item/3020.png)에서 읽는다 —
+    item_summary의 item_id는 모드별 변형 id(223020 등)가 섞여 매치 payload의 id와 다르다.
+    아이콘이 없는 행만 item_id로 대신한다"""
+    g = read_item_summary(items_path)
+    ids = pd.Series(float("nan"), index=g.index)
+    if "icon_url" in g.columns:
+        ids = pd.to_numeric(g["icon_url"].astype(str).str.extract(ITEM_ICON_ID, expand=False), errors="coerce")
+    if "item_id" in g.columns:
+        ids = ids.fillna(pd.to_numeric(g["item_id"], errors="coerce"))
+    ok = ids.notna()
+    return dict(zip(ids[ok].astype(int), g.loc[ok, "item"].astype(str).str.strip()))
+
+def _name(table: dict, v) -> str:
+    """id -> 이름 (0/없음은 빈 문자열, 미등록 id는 문자열 그대로)"""
+    v = int(v or 0)
+    return "" if v == 0 else table.get(v, str(v))
+
+def _champ_list(names: list) -> str:
+    return "[" + ", ".join(f"'{c}'" for c in names) + "]"
+
+def flatten_match(match: dict, items: dict) -> list:
+    """매치 상세 하나 -> 참가자 행(COLUMNS 순 튜플) 리스트. ARAM이 아니면 빈 리스트"""
+    info = match.get("info", {})
+    if info.get("gameMode", "ARAM") != "ARAM":
+        return []
+    match_id = match.get("metadata", {}).get("matchId") or f"{info.get('platformId', '')}_{info.get('gameId', '')}"
+    parts = info.get("participants", [])
+    teams = {}
+    for p in parts:
+        teams.setdefault(p.get("teamId"), []).append(p.get("championName", ""))
+    rows = []
+    for p in parts:
+        tid = p.get("teamId")
+        enemy = [c for t, cs in teams.items() if t != tid for c in cs]
+        styles = p.get("perks", {}).get("styles", [])
+        prim = next((s for s in styles if s.get("description") == "primaryStyle"), styles[0] if styles else {})
+        sub = next((s for s in styles if s.get("description") == "subStyle"), styles[1] if len(styles) > 1 else {})
+        sel = prim.get("selections") or [{}]
+        stat = p.get("perks", {}).get("statPerks", {})
+        shards = [_name(SHARD_NAMES, stat.get(k)) for k in ("offense", "flex", "defense")]
+        game_name, tag = p.get("riotIdGameName") or "", p.get("riotIdTagline") or ""
+        rows.append((
+            match_id, f"{game_name}#{tag}" if game_name else p.get("summonerName", ""), game_name, tag,
+            tid, p.get("championName", ""), int(bool(p.get("win"))),
+            p.get("kills", 0), p.get("deaths", 0), p.get("assists", 0), p.get("goldEarned", 0),
+            p.get("totalDamageDealtToChampions", 0), p.get("magicDamageDealtToChampions", 0),
+            p.get("physicalDamageDealtToChampions", 0), p.get("trueDamageDealtToChampions", 0),
+            *[_name(items, p.get(f"item{j}")) for j in range(7)],
+            _champ_list(teams[tid]), _champ_list(enemy),
+            _name(SPELL_NAMES, p.get("summoner1Id")), _name(SPELL_NAMES, p.get("summoner2Id")),
+            _name(KEYSTONES, sel[0].get("perk")), _name(RUNE_STYLES, sub.get("style")),
+            "|".join(shards) if any(shards) else "",
+            info.get("gameVersion", ""), info.get("gameCreation", ""),
+        ))
+    return rows
+
+def list_match_files(dirs: list) -> list:
+    """디렉터리들 아래 *.json 경로 (정렬 — 중복 매치는 앞선 경로가 남음)"""
+    out = []
+    for d in dirs:
+        for root, _, files in os.walk(d):
+            out += [os.path.join(root, f) for f in files if f.endswith(".json")]
+    return sorted(out)
+
+def _init_worker(items_path: str) -> None:
+    if not _LOOKUP:
+        _LOOKUP.update(item_names(items_path))
+
+def _flatten_files(paths: list):
+    """파일 묶음 -> (경로들, [(matchId, 행들)], 건너뛴 매치 수, 읽기 실패 파일 수)"""
+    matches, skipped, errors = [], 0, 0
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                obj = json.load(f)
+        except (OSError, ValueError):
+            errors += 1
+            continue
+        for m in obj if isinstance(obj, list) else [obj]:
+            rows = flatten_match(m, _LOOKUP)
+            if rows:
+                matches.append((rows[0][0], rows))
+            else:
+                skipped += 1
+    return paths, matches, skipped, errors
+
+def _progress_path(out: str) -> str:
+    return out + ".progress"
+
+def _resume(out: str):
+    """(처리한 파일 집합, 기록된 matchId 집합, 이어 쓸 바이트 위치). 진행 기록이 없으면 처음부터"""
+    prog = _progress_path(out)
+    if not (os.path.exists(out) and os.path.exists(prog)):
+        return set(), set(), 0
+    done, offset, valid = set(), 0, []
+    with open(prog, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                break   # 기록 도중 중단된 마지막 줄
+            done.update(rec["files"])
+            offset = rec["bytes"]
+            valid.append(line)
+    # 온전한 기록만 남겨 다시 쓴다 — 깨진 줄 뒤에 이어 쓰면 다음 재개 때 그 뒤 기록을 모두 잃는다
+    tmp = prog + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.writelines(valid)
+    os.replace(tmp, prog)
+    with open(out, "r+b") as f:
+        f.truncate(offset)
+    seen = set(pd.read_csv(out, usecols=["matchId"], dtype=str)["matchId"]) if offset else set()
+    return done, seen, offset
+
+def flatten_dirs(dirs: list, out: str = FLAT_CSV, items_path: str = "item_summary.csv", workers: int = None) -> dict:
+    """JSON 디렉터리들 -> 참가자 CSV (재개 가능). 반환: 처리 요약"""
+    t0 = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    done, seen, offset = _resume(out)
+    todo = [p for p in list_match_files(dirs) if p not in done]
+    tasks = [todo[i:i + FILES_PER_TASK] for i in range(0, len(todo), FILES_PER_TASK)]
+    stats = {"files": len(todo), "resumed_files": len(done), "matches": 0, "rows": 0,
+             "duplicates": 0, "skipped": 0, "errors": 0}
+
+    _LOOKUP.clear()
+    _LOOKUP.update(item_names(items_path))
+    resumed = bool(done)   # 기록이 있으면 이어 쓴다 (offset 0 — 앞 묶음들이 행 없이 끝난 경우도 포함)
+    with open(out, "r+b" if resumed else "wb") as sink, open(_progress_path(out), "a" if resumed else "w",
+                                                            encoding="utf-8") as prog:
+        sink.seek(offset)
+
+        def write(result):
+            paths, matches, skipped, errors = result
+            rows = []
+            for mid, mrows in matches:
+                if mid in seen:
+                    stats["duplicates"] += 1
+                    continue
+                seen.add(mid)
+                rows += mrows
+            if rows:
+                frame = pd.DataFrame(rows, columns=COLUMNS)
+                sink.write(frame.to_csv(index=False, header=sink.tell() == 0).encode("utf-8"))
+                sink.flush()
+            stats["rows"] += len(rows)
+            stats["skipped"] += skipped
+            stats["errors"] += errors
+            prog.write(json.dumps({"files": paths, "bytes": sink.tell()}, ensure_ascii=False) + "\n")
+            prog.flush()
+
+        if workers == 1:
+            for t in tasks:
+                write(_flatten_files(t))
+        else:
+            # fork: 부모의 _LOOKUP 상속. 그 외: 워커 초기화에서 로드. imap — 경로 순서대로 기록(재현 가능한 출력)
+            method = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+            with mp.get_context(method).Pool(workers, initializer=_init_worker, initargs=(items_path,)) as pool:
+                for result in pool.imap(_flatten_files, tasks):
+                    write(result)
+
+    stats["matches"] = len(seen)
+    stats["seconds"] = round(time.perf_counter() - t0, 3)
+    return stats
+
+def check_items(items_path: str = "item_summary.csv") -> list:
+    """SAMPLE_MATCH를 디스크에 써서 평탄화한 아이템 이름 vs SAMPLE_ITEMS — 어긋난 (행, 슬롯, 기대, 결과) 목록"""
+    with tempfile.TemporaryDirectory() as tmp:
+        src, out = os.path.join(tmp, "json"), os.path.join(tmp, "flat.csv")
+        os.makedirs(src)
+        with open(os.path.join(src, "match.json"), "w", encoding="utf-8") as f:
+            json.dump(SAMPLE_MATCH, f)
+        flatten_dirs([src], out, items_path, workers=1)
+        got = pd.read_csv(out, dtype=str, keep_default_na=False)
+    return [(i, j, want, got.at[i, f"item{j}_name"])
+            for i, names in enumerate(SAMPLE_ITEMS) for j, want in enumerate(names)
+            if got.at[i, f"item{j}_name"] != want]
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "check":
+        items = sys.argv[2] if len(sys.argv) > 2 else "item_summary.csv"
+        bad = check_items(items)
+        print(f"flatten check: {len(SAMPLE_ITEMS)} participants — "
+              + ("OK (match-v5 item ids resolve to names)" if not bad else f"mismatch {bad}"))
+        sys.exit(0 if not bad else 1)
+    dirs    = sys.argv[1].split(",") if len(sys.argv) > 1 else ["matches"]
+    out     = sys.argv[2] if len(sys.argv) > 2 else FLAT_CSV
+    items   = sys.argv[3] if len(sys.argv) > 3 else "item_summary.csv"
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else None
+
+    s = flatten_dirs(dirs, out, items, workers)
+    print(f"flatten -> {out}: {s['rows']:,} rows from {s['files']:,} files "
+          f"(matches {s['matches']:,}, duplicates {s['duplicates']:,}, non-ARAM {s['skipped']:,}, "
+          f"unreadable {s['errors']:,}, resumed past {s['resumed_files']:,} files) in {s['seconds']}s")
@@ -0,0 +1,96 @@
+# ingest.py — 신규 참가자 배치 증분 반영 (append-only)
+# 사용법: python ingest.py <신규 참가자 CSV 또는 .arrow> [item_summary CSV] [큐브 디렉터리]
+#   배치를 (matchId, champion) 기준으로 중복 제거 → 기존 큐브 카운터에 합산 → 큐브 version 증가.
+#   대시보드는 다음 재실행 때 version이 바뀐 큐브만 다시 읽는다 (과거 참가자 행은 읽지 않음).
+#   반영된 행은 <큐브>/batches/ 에 남고, 행 단위 화면(필터·시너지·빌드 트리·승리 확률)과 api.py,
+#   스냅샷, python cube.py 재빌드가 원본에 합쳐 읽는다 — 큐브 카운터와 같은 참가자 집합.
+#   파티션 기간(aram_partitions)을 고른 화면은 파티션 큐브를 쓰므로 배치 행이 들어가지 않는다.
+#         python ingest.py check <기존 참가자 CSV> <배치 CSV[,배치 CSV...]> [item_summary CSV]
+#   임시 디렉터리에서 기존 행으로 큐브를 만든 뒤 배치를 차례로 반영해, 합친 행 전체 재빌드와 같은지 확인
+import os, sys, tempfile
+import pandas as pd
+
+from analysis import item_columns, encode_attributes
+from catalog import ItemCatalog
+from cube import (CUBE_DIR, CUBE_TABLES, KEY_COLS, BATCH_DIR, build_cube, load_cube, save_cube, merge_cubes,
+                  participant_keys, read_keys, write_keys, with_batches)
+from loaders import read_item_summary
+from store import load_participants
+
+def _key(df: pd.DataFrame) -> pd.Series:
+    return df[KEY_COLS[0]].astype(str) + "\x1f" + df[KEY_COLS[1]].astype(str)
+
+def ingest_batch(batch: pd.DataFrame, catalog: ItemCatalog, cube_dir: str = CUBE_DIR) -> dict:
+    """정리된 참가자 배치를 큐브에 반영. 반환: 추가/중복 행 수와 새 version"""
+    cube, seen = load_cube(cube_dir), read_keys(cube_dir)
+    if cube is None or seen is None:
+        raise FileNotFoundError(f"`{cube_dir}` 큐브/키 파일 없음 — 먼저 python cube.py 로 빌드하세요")
+
+    seen_keys = set(_key(seen))
+    batch = batch.drop_duplicates(KEY_COLS)
+    new = batch[~_key(batch).isin(seen_keys)].reset_index(drop=True)
+    result = {"added": int(len(new)), "duplicates": int(len(batch) - len(new)),
+              "version": int(cube["meta"].get("version", 0))}
+    if new.empty:
+        return result
+
+    delta = build_cube(encode_attributes(catalog.encode_frame(new.copy(), item_columns(new))), catalog)
+    merged = merge_cubes(cube, delta)
+    seen_matches = set(seen[KEY_COLS[0]].astype(str))
+    new_matches = set(new[KEY_COLS[0]].astype(str)) - seen_matches
+    merged["meta"]["matches"] = cube["meta"]["matches"] + len(new_matches)
+    merged["meta"]["version"] = result["version"] = result["version"] + 1
+
+    # 신규 행 보관 → 키 → 카운터 → meta 순으로 기록 (meta.json이 마지막이라 version은 완료 후에만 바뀜)
+    bdir = os.path.join(cube_dir, BATCH_DIR)
+    os.makedirs(bdir, exist_ok=True)
+    new.astype({c: str for c in new.columns if new[c].dtype == object}).to_parquet(
+        os.path.join(bdir, f"batch_{result['version']:06d}.parquet"), index=False)
+    write_keys(pd.concat([seen.astype(str), participant_keys(new)], ignore_index=True), cube_dir)
+    save_cube(merged, cube_dir)
+    return result
+
+def _sorted(t: pd.DataFrame, keys: list) -> pd.DataFrame:
+    t = t.astype({c: str for c in keys}).sort_values(keys, kind="stable").reset_index(drop=True)
+    return t.astype({c: "int64" for c in t.columns if c not in keys})
+
+def check_ingest(base: pd.DataFrame, batches: list, catalog: ItemCatalog) -> dict:
+    """기존 행 큐브 + 배치 증분 반영 vs 중복 제거한 합집합 전체 재빌드.
+    반환: 어긋난 큐브 테이블 / 배치를 합친 참가자 프레임이 합집합과 같은지 / 행 수"""
+    encode = lambda d: encode_attributes(catalog.encode_frame(d.copy(), item_columns(d)))
+    with tempfile.TemporaryDirectory() as tmp:
+        save_cube(build_cube(encode(base), catalog), tmp)
+        write_keys(participant_keys(base), tmp)
+        for b in batches:
+            ingest_batch(b, catalog, tmp)
+        inc, frame = load_cube(tmp), with_batches(base, tmp)
+    union = pd.concat([base, *batches], ignore_index=True).drop_duplicates(KEY_COLS).reset_index(drop=True)
+    full = build_cube(encode(union), catalog)
+    bad = [name for name, keys in [("champions", []), *CUBE_TABLES.items()]
+           if not _sorted(inc[name], ["champion"] + keys).equals(_sorted(full[name], ["champion"] + keys))]
+    if inc["meta"]["matches"] != full["meta"]["matches"] or inc["meta"]["rows"] != full["meta"]["rows"]:
+        bad.append("meta")
+    same_rows = participant_keys(frame).sort_values(KEY_COLS).reset_index(drop=True).equals(
+        participant_keys(union).sort_values(KEY_COLS).reset_index(drop=True))
+    return {"mismatched": bad, "frame_matches": same_rows, "rows": len(union)}
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "check":
+        if len(sys.argv) < 4:
+            sys.exit("사용법: python ingest.py check <기존 참가자 CSV> <배치 CSV[,배치 CSV...]> [item_summary CSV]")
+        items = sys.argv[4] if len(sys.argv) > 4 else "item_summary.csv"
+        r = check_ingest(load_participants(sys.argv[2]), [load_participants(p) for p in sys.argv[3].split(",")],
+                         ItemCatalog(read_item_summary(items)))
+        ok = not r["mismatched"] and r["frame_matches"]
+        print(f"ingest check: {r['rows']:,} rows — "
+              + ("OK (incremental == full rebuild)" if ok else
+                 f"mismatch tables={r['mismatched']} frame_matches={r['frame_matches']}"))
+        sys.exit(0 if ok else 1)
+    if len(sys.argv) < 2:
+        sys.exit("사용법: python ingest.py <신규 참가자 CSV 또는 .arrow> [item_summary CSV] [큐브 디렉터리]")
+    src     = sys.argv[1]
+    items   = sys.argv[2] if len(sys.argv) > 2 else "item_summary.csv"
+    cube_dir = sys.argv[3] if len(sys.argv) > 3 else CUBE_DIR
+
+    r = ingest_batch(load_participants(src), ItemCatalog(read_item_summary(items)), cube_dir)
+    print(f"ingest -> {cube_dir}: +{r['added']:,} rows, {r['duplicates']:,} duplicates skipped, version {r['version']}")
@@ -0,0 +1,86 @@
+# loaders.py — 원본 CSV 로드/정리 (Streamlit 의존성 없음)
+import re
+import pandas as pd
+
+TEXT_COLS = ["spell1","spell2","spell1_name_fix","spell2_name_fix","rune_core","rune_sub","champion","matchId"]
+
+def clean_players(df: pd.DataFrame) -> pd.DataFrame:
+    """참가자 행 정리: win_clean 생성, 아이템 "0" 제거, 텍스트 컬럼 strip"""
+    # 승패 정리
+    if "win_clean" not in df.columns:
+        if "win" in df.columns:
+            df["win_clean"] = df["win"].astype(str).str.lower().isin(["true","1","t","yes"]).astype(int)
+        else:
+            df["win_clean"] = 0
+
+    # 아이템 이름 정리 + "0" 전처리 (아이템 구매 전 종료 케이스 제외)
+    for c in [c for c in df.columns if re.fullmatch(r"item[0-6]_name", c)]:
+        df[c] = df[c].fillna("").astype(str).str.strip()
+        df[c] = df[c].replace({"0": "", 0: ""})
+
+    # 기본 텍스트 컬럼
+    for c in TEXT_COLS:
+        if c in df.columns:
+            df[c] = df[c].fillna("").astype(str).str.strip()
+    return df
+
+def read_players(path: str) -> pd.DataFrame:
+    return clean_players(pd.read_csv(path))
+
+def norm_name(x: str) -> str:
+    """공백 제거 + 소문자 (스펠명/컬럼명 비교용)"""
+    return re.sub(r"\s+", "", str(x)).strip().lower()
+
+def read_item_summary(path: str) -> pd.DataFrame:
+    g = pd.read_csv(path)
+    if "item" in g.columns:
+        g = g[g["item"].astype(str).str.strip() != ""]
+        g = g[g["item"] != "0"]  # 혹시 요약 파일에도 0이 남아있다면 제거
+    return g
+
+# ===== 아이콘 CSV -> 이름별 URL 맵 (localize: URL 컬럼 재작성 함수, 예: AssetCache.localize_column) =====
+def read_champion_icons(path: str, localize=None) -> dict:
+    df = pd.read_csv(path)
+    name_col = next((c for c in ["champion","Champion","championName"] if c in df.columns), None)
+    icon_col = next((c for c in ["champion_icon","icon","icon_url"] if c in df.columns), None)
+    if not name_col or not icon_col:
+        return {}
+    df[name_col] = df[name_col].astype(str).str.strip()
+    return dict(zip(df[name_col], localize(df[icon_col]) if localize else df[icon_col]))
+
+def read_rune_icons(path: str, localize=None) -> dict:
+    df = pd.read_csv(path)
+    for c in ["rune_core_icon","rune_sub_icon","rune_shard_icon","rune_shards_icons"]:
+        if localize and c in df.columns:
+            df[c] = localize(df[c])
+    core_map, sub_map, shard_map = {}, {}, {}
+    if "rune_core" in df.columns:
+        ic = "rune_core_icon" if "rune_core_icon" in df.columns else None
+        if ic: core_map = dict(zip(df["rune_core"].astype(str), df[ic].astype(str)))
+    if "rune_sub" in df.columns:
+        ic = "rune_sub_icon" if "rune_sub_icon" in df.columns else None
+        if ic: sub_map = dict(zip(df["rune_sub"].astype(str), df[ic].astype(str)))
+    if "rune_shard" in df.columns:
+        ic = "rune_shard_icon" if "rune_shard_icon" in df.columns else ("rune_shards_icons" if "rune_shards_icons" in df.columns else None)
+        if ic: shard_map = dict(zip(df["rune_shard"].astype(str), df[ic].astype(str)))
+    return {"core": core_map, "sub": sub_map, "shards": shard_map}
+
+def read_spell_icons(path: str, localize=None) -> dict:
+    """스펠명(여러 형태) -> 아이콘 URL"""
+    df = pd.read_csv(path)
+    if localize:
+        df = df.apply(lambda s: localize(s) if "icon" in str(s.name).lower() else s)
+    cand_name = [c for c in df.columns if norm_name(c) in {"spell","spellname","name","spell1_name_fix","spell2_name_fix","스펠","스펠명"}]
+    cand_icon = [c for c in df.columns if norm_name(c) in {"icon","icon_url","spelli con","spell_icon"} or "icon" in c.lower()]
+    m = {}
+    if cand_name and cand_icon:
+        name_col, icon_col = cand_name[0], cand_icon[0]
+        for n, i in zip(df[name_col].astype(str), df[icon_col].astype(str)):
+            m[norm_name(n)] = i
+            m[str(n).strip()] = i
+    else:
+        if df.shape[1] >= 2:
+            for n, i in zip(df.iloc[:,0].astype(str), df.iloc[:,1].astype(str)):
+                m[norm_name(n)] = i
+                m[str(n).strip()] = i
+    return m
@@ -0,0 +1,120 @@
+# perf.py — 구간별 시간 / 처리 행 수 / 캐시 적중 계측
+# 세션마다 Recorder 하나를 활성화하면 로더(cached)와 화면 구간(lap)이 기록되고,
+# 구간별 최근 WINDOW개 값으로 p50/p90/p99를 계산한다. 기록마다 JSON 한 줄을 "aram.perf" 로거로 남긴다.
+# 비활성(기본) 상태에서는 스레드 로컬 조회 한 번 외에 하는 일이 없다.
+import json, time, logging, threading, functools
+from collections import deque, OrderedDict
+import numpy as np
+
+WINDOW = 200   # 구간별 롤링 표본 수
+
+log = logging.getLogger("aram.perf")
+if not log.handlers:
+    _h = logging.StreamHandler()
+    _h.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(_h)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+_tls = threading.local()   # active: 현재 스레드(세션 실행)의 Recorder, miss: 캐시 본문 실행 여부
+_process = {"rendered": False}   # 이 프로세스에서 첫 렌더가 있었는지 (없으면 다음 첫 렌더가 콜드 스타트)
+
+class Recorder:
+    """구간별 최근 기록 (시간, 행 수, 캐시 적중)"""
+
+    def __init__(self, window: int = WINDOW):
+        self.window = window
+        self.samples = OrderedDict()   # name -> deque[seconds]
+        self.last = {}                 # name -> 마지막 기록
+        self.cache = {}                # name -> [hits, misses]
+        self.t_lap = None
+
+    def record(self, name: str, seconds: float, rows=None, cache: str = None) -> None:
+        self.samples.setdefault(name, deque(maxlen=self.window)).append(seconds)
+        self.last[name] = {"ms": round(seconds * 1000, 2), "rows": rows}
+        if cache:
+            hm = self.cache.setdefault(name, [0, 0])
+            hm[cache == "miss"] += 1
+        log.info(json.dumps({"event": "perf", "section": name, "ms": round(seconds * 1000, 3),
+                             "rows": rows, "cache": cache}, ensure_ascii=False))
+
+    def table(self) -> list:
+        """구간별 요약 행 (Perf 패널용)"""
+        out = []
+        for name, xs in self.samples.items():
+            a = np.asarray(xs) * 1000
+            hits, misses = self.cache.get(name, (None, None))
+            out.append({"section": name, "last_ms": self.last[name]["ms"], "rows": self.last[name]["rows"],
+                        "n": len(a), "p50_ms": round(float(np.percentile(a, 50)), 2),
+                        "p90_ms": round(float(np.percentile(a, 90)), 2),
+                        "p99_ms": round(float(np.percentile(a, 99)), 2),
+                        "hits": hits, "misses": misses})
+        return out
+
+def activate(recorder) -> None:
+    """현재 스레드의 기록기 지정 (None이면 계측 끔). 화면 구간 기준 시각도 초기화"""
+    _tls.active = recorder
+    if recorder is not None:
+        recorder.t_lap = time.perf_counter()
+
+def active():
+    return getattr(_tls, "active", None)
+
+def _rows(obj):
+    if hasattr(obj, "shape"):
+        return int(obj.shape[0])
+    if isinstance(obj, tuple) and obj and hasattr(obj[0], "shape"):
+        return int(obj[0].shape[0])
+    return None
+
+def cached(name: str, cache_decorator):
+    """st.cache_data / st.cache_resource 래핑 — 호출 시간과 적중 여부 기록.
+    캐시 안쪽 본문이 실행됐으면 miss, 아니면 hit"""
+    def deco(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            _tls.miss = True
+            return fn(*args, **kwargs)
+        cached_fn = cache_decorator(inner)
+
+        @functools.wraps(fn)
+        def outer(*args, **kwargs):
+            rec = active()
+            if rec is None:
+                return cached_fn(*args, **kwargs)
+            prev, _tls.miss = getattr(_tls, "miss", False), False
+            t0 = time.perf_counter()
+            try:
+                out = cached_fn(*args, **kwargs)
+            finally:
+                miss, _tls.miss = _tls.miss, prev
+            rec.record(name, time.perf_counter() - t0, _rows(out), "miss" if miss else "hit")
+            return out
+        outer.clear = getattr(cached_fn, "clear", None)
+        return outer
+    return deco
+
+def mark(recorder) -> None:
+    """fragment 시작점 — 세션 기록기를 현재 스레드에 다시 지정하고 구간 기준 시각 재설정.
+    fragment 단독 재실행은 새 스크립트 스레드에서 돌아 전체 실행 때 activate한 기록기가 보이지 않는다"""
+    activate(recorder)
+
+def lap(name: str, rows=None) -> None:
+    """직전 lap(또는 activate) 이후 경과 시간을 name 구간으로 기록 (구간 안 로더 호출 시간 포함)"""
+    rec = active()
+    if rec is None:
+        return
+    now = time.perf_counter()
+    rec.record(name, now - rec.t_lap, rows)
+    rec.t_lap = now
+
+def first_render(seconds: float, **fields) -> float:
+    """세션 첫 렌더까지 걸린 시간 기록 — 계측이 꺼져 있어도 로그는 남긴다(콜드 스타트 추적).
+    프로세스의 첫 렌더면 cold=True. 반환: ms"""
+    cold, _process["rendered"] = not _process["rendered"], True
+    ms = round(seconds * 1000, 3)
+    log.info(json.dumps({"event": "first_render", "ms": ms, "cold": cold, **fields}, ensure_ascii=False))
+    rec = active()
+    if rec is not None:
+        rec.record("first_render_cold" if cold else "first_render", seconds)
+    return ms
@@ -0,0 +1,120 @@
+# report.py — 전 챔피언 정적 JSON 리포트 일괄 생성 (Streamlit 없이)
+# 사용법: python report.py [참가자 CSV 또는 .arrow] [item_summary CSV] [출력 디렉터리] [프로세스 수]
+#   챔피언을 게임수 기준으로 균등한 샤드로 나눠 프로세스 풀에서 집계하고,
+#   챔피언마다 <출력>/<챔피언>.json, 전체 목록은 <출력>/index.json 으로 기록한다.
+#   fork 가능한 플랫폼에서는 부모가 로드한 참가자 프레임을 워커가 그대로 공유한다(복사 없음).
+import os, sys, json, time
+import multiprocessing as mp
+import pandas as pd
+
+from analysis import item_columns, champion_counts, rank_panel, champion_summary, encode_attributes
+from catalog import ItemCatalog
+from cube import CUBE_TABLES, build_cube, index_cube, champion_table, source_signature
+from loaders import read_item_summary
+from store import load_participants
+
+REPORT_DIR = "aram_reports"
+SHARDS_PER_WORKER = 4   # 샤드 수 = 워커 × 4 (큰 챔피언 하나가 끝을 붙잡지 않도록)
+
+_SHARED = {}   # 워커 공유 상태: df(아이템 id 인코딩 완료), catalog, total_matches
+
+def load_inputs(players_path: str, items_path: str) -> dict:
+    """참가자 행 + 카탈로그 로드, 아이템 슬롯·스펠·룬 파편 인코딩, 전체 매치 수"""
+    catalog = ItemCatalog(read_item_summary(items_path))
+    df = load_participants(players_path)
+    df = encode_attributes(catalog.encode_frame(df, item_columns(df)))
+    total = int(df["matchId"].nunique()) if "matchId" in df.columns else int(len(df))
+    return {"df": df, "catalog": catalog, "total_matches": total}
+
+def panel_report(champion: str, tables: dict, summary: dict) -> dict:
+    """요약 + 패널별 games/wins 집계표 -> 리포트 (대시보드와 같은 정렬/상위 N)"""
+    panels = {}
+    for name, t in tables.items():
+        t = rank_panel(t, name, summary["games"]) if len(t) else t
+        panels[name] = t.to_dict("records")
+    return {"champion": champion, **summary, "panels": panels}
+
+def champion_report(icube: dict, champion: str, total_matches: int) -> dict:
+    """인덱스된 큐브 -> 챔피언 한 명의 요약 + 패널별 집계"""
+    cnt = icube["champions"]
+    row = cnt.loc[champion] if champion in cnt.index else {"games": 0, "wins": 0, "matches": 0}
+    summary = champion_summary(row["games"], row["wins"], row["matches"], total_matches)
+    return panel_report(champion, {name: champion_table(icube, name, champion) for name in CUBE_TABLES}, summary)
+
+def shard_champions(counts: pd.DataFrame, n_shards: int) -> list:
+    """게임수 큰 챔피언부터 가장 가벼운 샤드에 배정 (LPT) — 워커 부하 균등화"""
+    shards = [[] for _ in range(max(1, n_shards))]
+    load = [0] * len(shards)
+    for champ, games in counts.sort_values("games", ascending=False)[["champion","games"]].itertuples(index=False):
+        k = load.index(min(load))
+        shards[k].append(str(champ))
+        load[k] += int(games)
+    return [s for s in shards if s]
+
+def report_filename(champion: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in champion) + ".json"
+
+def _write_json(path: str, obj) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, default=int)
+    os.replace(tmp, path)
+
+def _init_worker(players_path: str, items_path: str) -> None:
+    # spawn 플랫폼: 워커가 직접 로드 (.arrow 저장소는 메모리 맵이라 페이지 캐시를 공유)
+    if not _SHARED:
+        _SHARED.update(load_inputs(players_path, items_path))
+
+def _run_shard(args) -> list:
+    champions, out_dir = args
+    df, catalog = _SHARED["df"], _SHARED["catalog"]
+    rows = df[df["champion"].isin(champions)]
+    icube = index_cube(build_cube(rows, catalog))
+    entries = []
+    for champ in champions:
+        rep = champion_report(icube, champ, _SHARED["total_matches"])
+        fname = report_filename(champ)
+        _write_json(os.path.join(out_dir, fname), rep)
+        entries.append({"champion": champ, "games": rep["games"], "win_rate": rep["win_rate"],
+                        "pick_rate": rep["pick_rate"], "file": fname})
+    return entries
+
+def build_reports(players_path: str, items_path: str, out_dir: str = REPORT_DIR, workers: int = None) -> dict:
+    """전 챔피언 리포트 + index.json 기록. 반환: index 내용"""
+    t0 = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(out_dir, exist_ok=True)
+    _SHARED.clear()
+    _SHARED.update(load_inputs(players_path, items_path))
+    shards = shard_champions(champion_counts(_SHARED["df"]), workers * SHARDS_PER_WORKER)
+    tasks = [(s, out_dir) for s in shards]
+
+    if workers == 1:
+        results = [_run_shard(t) for t in tasks]
+    else:
+        # fork: 부모의 _SHARED를 그대로 상속 (copy-on-write). 그 외: 워커 초기화에서 로드
+        method = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+        ctx = mp.get_context(method)
+        init_args = ("", "") if method == "fork" else (players_path, items_path)
+        with ctx.Pool(workers, initializer=_init_worker, initargs=init_args) as pool:
+            results = list(pool.imap_unordered(_run_shard, tasks))
+
+    entries = sorted((e for r in results for e in r), key=lambda e: e["champion"])
+    index = {
+        "source": source_signature(players_path),
+        "rows": int(len(_SHARED["df"])),
+        "matches": _SHARED["total_matches"],
+        "champions": entries,
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
+    _write_json(os.path.join(out_dir, "index.json"), index)
+    return index
+
+if __name__ == "__main__":
+    players = sys.argv[1] if len(sys.argv) > 1 else "aram_participants_with_icons_superlight.csv"
+    items   = sys.argv[2] if len(sys.argv) > 2 else "item_summary.csv"
+    out_dir = sys.argv[3] if len(sys.argv) > 3 else REPORT_DIR
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else None
+
+    idx = build_reports(players, items, out_dir, workers)
+    print(f"reports -> {out_dir}: {len(idx['champions'])} champions in {idx['seconds']}s")
@@ -0,0 +1,90 @@
+# snapshot.py — 대시보드 웜 스타트 스냅샷 (첫 렌더에 필요한 상태를 파일 하나로)
+# 사용법: python snapshot.py [참가자 CSV 또는 .arrow] [item_summary CSV] [출력 파일]
+#   (참가자 기본값은 대시보드와 같은 선택: .arrow 저장소가 CSV보다 최신이면 저장소)
+#   첫 렌더 전에 하던 일 — 참가자/아이템/아이콘 CSV 읽기, 텍스트 정리, 아이템·스펠·룬 인코딩,
+#   아이콘 URL 로컬화, 집계 큐브(챔피언 베이스라인 포함) — 을 미리 해 두고 pickle 한 파일로 저장한다.
+#   부분마다 입력 서명(파일 크기/수정 시각, 아이콘 캐시·큐브 버전)을 함께 기록하고, 대시보드는
+#   서명이 지금 입력과 같은 부분만 꺼내 쓴다 — 어긋난 부분은 원래 로더가 읽는다.
+#   파티션 기간을 고른 경우 참가자/큐브 부분은 서명이 달라 쓰이지 않고 카탈로그/아이콘만 쓰인다.
+#   참가자 부분은 증분 반영 행(ingest.py)까지 합친 프레임 — 서명에 큐브 version이 들어가 반영 후엔 다시 읽는다.
+import os, sys, time, pickle
+
+from analysis import item_columns, encode_attributes
+from assets import ASSET_DIR, AssetCache, assets_version
+from catalog import ItemCatalog
+from cube import CUBE_DIR, build_cube, load_cube, source_signature, cube_version, with_batches
+from loaders import read_item_summary, read_champion_icons, read_rune_icons, read_spell_icons
+from store import STORE_PATH, PLAYER_COLUMNS, load_participants, pick_source
+
+SNAPSHOT_PATH = "aram_snapshot.pkl"
+SNAPSHOT_FORMAT = 1   # 저장 구조를 바꾸면 올린다 (다른 값의 스냅샷은 읽지 않음)
+
+ICON_CSVS = {"champion": "champion_icons.csv", "rune": "rune_icons.csv", "spell": "spell_icons.csv"}
+ICON_READERS = {"champion": read_champion_icons, "rune": read_rune_icons, "spell": read_spell_icons}
+
+def file_signature(path: str):
+    return source_signature(path) if os.path.exists(path) else None
+
+def signatures(players_path: str, items_path: str, icon_paths: dict = ICON_CSVS,
+               asset_dir: str = ASSET_DIR, cube_dir: str = CUBE_DIR) -> dict:
+    """부분별 입력 서명 (stat 몇 번 — 대시보드가 실행마다 계산해 스냅샷과 비교)"""
+    players, items, assets_v = file_signature(players_path), file_signature(items_path), assets_version(asset_dir)
+    version = cube_version(cube_dir)
+    sig = {"players": [players, items, version], "catalog": items, "assets": assets_v,
+           "cube": [players, items, version]}
+    for name, path in icon_paths.items():
+        sig[name] = [file_signature(path), assets_v]
+    return sig
+
+def build_snapshot(players_path: str, items_path: str, icon_paths: dict = ICON_CSVS,
+                   asset_dir: str = ASSET_DIR, cube_dir: str = CUBE_DIR) -> dict:
+    """입력 -> {"format", "sources": 부분별 서명, "parts": 부분별 상태}"""
+    catalog = ItemCatalog(read_item_summary(items_path))
+    df = with_batches(load_participants(players_path, PLAYER_COLUMNS), cube_dir)
+    df = encode_attributes(catalog.encode_frame(df, item_columns(df)))
+    cube = load_cube(cube_dir)
+    if cube is None or cube["meta"].get("source") != source_signature(players_path):
+        cube = build_cube(df, catalog)
+        cube["meta"]["source"] = source_signature(players_path)
+    assets = AssetCache(asset_dir)
+    parts = {"players": df, "catalog": catalog, "assets": assets, "cube": cube}
+    for name, path in icon_paths.items():
+        if os.path.exists(path):
+            parts[name] = ICON_READERS[name](path, assets.localize_column)
+    sources = signatures(players_path, items_path, icon_paths, asset_dir, cube_dir)
+    return {"format": SNAPSHOT_FORMAT, "created": int(time.time()),
+            "sources": {k: v for k, v in sources.items() if k in parts}, "parts": parts}
+
+def save_snapshot(snap: dict, path: str = SNAPSHOT_PATH) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(snap, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+def load_snapshot(path: str = SNAPSHOT_PATH):
+    """스냅샷 로드 (없거나, 형식이 다르거나, 읽을 수 없으면 None — 원래 로더로 폴백)"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            snap = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    return snap if isinstance(snap, dict) and snap.get("format") == SNAPSHOT_FORMAT else None
+
+def warm_part(snap, name: str, sources: dict):
+    """스냅샷 부분 — 기록된 서명이 지금 입력 서명과 같을 때만 (아니면 None)"""
+    if not snap or name not in snap["parts"] or snap["sources"].get(name) != sources.get(name):
+        return None
+    return snap["parts"][name]
+
+if __name__ == "__main__":
+    players = sys.argv[1] if len(sys.argv) > 1 else pick_source(STORE_PATH, "aram_participants_with_icons_superlight.csv")
+    items   = sys.argv[2] if len(sys.argv) > 2 else "item_summary.csv"
+    out     = sys.argv[3] if len(sys.argv) > 3 else SNAPSHOT_PATH
+
+    t0 = time.perf_counter()
+    snap = build_snapshot(players, items)
+    save_snapshot(snap, out)
+    print(f"snapshot -> {out}: {len(snap['parts']['players']):,} rows, parts {', '.join(snap['parts'])} "
+          f"({os.path.getsize(out) / 1e6:.1f} MB) in {time.perf_counter() - t0:.2f}s")
@@ -0,0 +1,295 @@
+# store.py — 참가자 테이블 컬럼형 저장소 (Arrow IPC, dictionary 인코딩, 메모리 맵 로드)
+# 사용법: python store.py [참가자 CSV] [출력 .arrow 또는 파티션 디렉터리]
+#   출력이 .arrow가 아니면 패치/날짜/matchId 구간별 파티션 파일 + manifest.json 으로 기록
+#         python store.py check [참가자 CSV] [청크 크기]
+#   작은 청크(기본 1000행)로 단일 파일/파티션 변환을 해 보고 CSV 로드 결과와 같은지 확인 (여러 청크 경로 점검)
+import os, sys, json, tempfile
+import pandas as pd
+import pyarrow as pa
+from pandas.api.types import union_categoricals
+
+from loaders import clean_players, read_players
+
+STORE_PATH = "aram_participants.arrow"
+PARTITION_DIR = "aram_partitions"
+CATEGORY_MAX_RATIO = 0.5   # 고유값 비율이 이 이하인 텍스트 컬럼만 dictionary(categorical) 인코딩
+MATCH_BUCKET = 10_000_000  # 패치/날짜 컬럼이 없을 때 matchId 숫자 구간 폭 (KR 기준 며칠 분량)
+
+# 대시보드 패널이 읽는 참가자 컬럼 (.arrow 저장소/파티션/스냅샷은 이 컬럼만 — 소환사명 등 식별 문자열 제외)
+PLAYER_COLUMNS = (["matchId","teamId","champion","win","win_clean",
+                   "kills","deaths","assists","gold","damage_total"]
+                  + [f"item{j}_name" for j in range(7)]
+                  + ["team_champs","enemy_champs","spell1","spell2","spell1_name_fix","spell2_name_fix",
+                     "rune_core","rune_sub","rune_shards"])
+
+def to_columnar(df: pd.DataFrame) -> pd.DataFrame:
+    """정리된 참가자 프레임의 텍스트 컬럼 -> categorical(정렬된 카테고리) 또는 Arrow 문자열"""
+    out = df.copy()
+    for c in out.columns:
+        if out[c].dtype != object:
+            continue
+        s = out[c].fillna("").astype(str)
+        if s.nunique() <= CATEGORY_MAX_RATIO * max(len(s), 1):
+            out[c] = s.astype("category")
+        else:
+            out[c] = s.astype(pd.ArrowDtype(pa.string()))
+    return out
+
+def write_store(df: pd.DataFrame, path: str = STORE_PATH) -> None:
+    """압축 없는 Arrow IPC 파일로 저장 (메모리 맵 시 복사 없이 읽힘)"""
+    table = pa.Table.from_pandas(to_columnar(df), preserve_index=False)
+    tmp = path + ".tmp"
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+
+def _chunks(src: str, chunksize: int, dtype: dict = None):
+    for chunk in pd.read_csv(src, chunksize=chunksize, dtype=dtype):
+        yield clean_players(chunk)
+
+def _note_kinds(chunk: pd.DataFrame, kinds: dict) -> None:
+    for c in chunk.columns:
+        kinds.setdefault(c, set()).add(chunk[c].dtype.kind)
+
+def _csv_dtype(src: str, kinds: dict) -> dict:
+    """청크별 dtype 종류 -> 모든 청크에 같은 스키마를 주는 read_csv dtype.
+    한 청크라도 텍스트면 문자열 (숫자만 든 청크 — 예: riotIdTagline '123' — 도 같은 카테고리 컬럼으로),
+    정수/실수가 섞이면 실수 (결측 있는 청크만 실수로 읽힘)"""
+    header = set(pd.read_csv(src, nrows=0).columns)
+    out = {}
+    for c, k in kinds.items():
+        if c not in header:
+            continue
+        if "O" in k:
+            out[c] = str
+        elif "f" in k and k & {"i", "u"}:
+            out[c] = "float64"
+    return out
+
+def _mixed_text(kinds: dict) -> bool:
+    """텍스트 컬럼이 어떤 청크에서 숫자로 읽혔는지 (그 청크 값은 카테고리 수집에서 빠졌으므로 다시 훑는다)"""
+    return any("O" in k and len(k) > 1 for k in kinds.values())
+
+def _scan_text(chunk: pd.DataFrame, cats: dict, strings: set, first: bool) -> None:
+    """텍스트 컬럼별 카테고리 수집 (첫 청크에서 고유값이 많은 컬럼은 Arrow 문자열로 분류)"""
+    for c in chunk.columns:
+        if chunk[c].dtype != object:
+            continue
+        s = chunk[c].fillna("").astype(str)
+        if first and s.nunique() > CATEGORY_MAX_RATIO * len(s):
+            strings.add(c)   # 고유값이 많은 컬럼(소환사명 등)은 Arrow 문자열
+        if c not in strings:
+            cats.setdefault(c, set()).update(s.unique())
+
+def _encode_text(chunk: pd.DataFrame, cats: dict, strings: set) -> pd.DataFrame:
+    for c in chunk.columns:
+        if c in cats:
+            chunk[c] = pd.Categorical(chunk[c].fillna("").astype(str), categories=cats[c])
+        elif c in strings:
+            chunk[c] = chunk[c].fillna("").astype(str).astype(pd.ArrowDtype(pa.string()))
+    return chunk
+
+def _write_batch(sink, state, chunk: pd.DataFrame):
+    """청크 기록 (첫 청크의 스키마로 writer 생성 — 이후 청크는 그 스키마로 맞춤).
+    state: None 또는 (writer, schema). 반환: (writer, schema)"""
+    if state is None:
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        state = (pa.ipc.new_file(sink, table.schema), table.schema)
+    else:
+        table = pa.Table.from_pandas(chunk, schema=state[1], preserve_index=False)
+    state[0].write_table(table)
+    return state
+
+def convert_csv(src: str, out: str = STORE_PATH, chunksize: int = 500_000) -> int:
+    """CSV -> 저장소 변환 (청크 단위, 전체를 메모리에 올리지 않음).
+    1패스: 텍스트 컬럼별 카테고리 + 청크별 dtype 수집 (숫자로 읽힌 텍스트 청크가 있으면 고정 dtype으로 한 번 더) /
+    2패스: 고정 dtype으로 읽고 고정 카테고리로 인코딩해 배치 기록"""
+    dtype = None
+    while True:
+        cats, strings, rows, kinds = {}, set(), 0, {}
+        for i, chunk in enumerate(_chunks(src, chunksize, dtype)):
+            rows += len(chunk)
+            _note_kinds(chunk, kinds)
+            _scan_text(chunk, cats, strings, i == 0)
+        rescan, dtype = dtype is None and _mixed_text(kinds), _csv_dtype(src, kinds)
+        if not rescan:
+            break
+    cats = {c: sorted(v) for c, v in cats.items()}
+
+    tmp, state = out + ".tmp", None
+    with pa.OSFile(tmp, "wb") as sink:
+        for chunk in _chunks(src, chunksize, dtype):
+            state = _write_batch(sink, state, _encode_text(chunk, cats, strings))
+        if state is not None:
+            state[0].close()
+    os.replace(tmp, out)
+    return rows
+
+# ===== 파티션 저장소 (패치 / 날짜 / matchId 구간별 파일) =====
+def partition_keys(df: pd.DataFrame):
+    """행별 파티션 키와 종류. 우선순위: 패치(gameVersion 앞 두 자리) > 날짜(gameCreation, ms) >
+    matchId 숫자 구간(MATCH_BUCKET 폭 — 같은 지역 matchId는 시간순 증가)"""
+    if "gameVersion" in df.columns:
+        v = df["gameVersion"].astype(str).str.split(".")
+        return "patch", v.str[0] + "." + v.str[1].fillna("0")
+    if "gameCreation" in df.columns:
+        return "date", pd.to_datetime(df["gameCreation"], unit="ms").dt.strftime("%Y-%m-%d")
+    mid = df["matchId"].astype(str).str.rsplit("_", n=1)
+    num = pd.to_numeric(mid.str[-1], errors="coerce").fillna(0).astype("int64")
+    region = mid.str[0].where(mid.str.len() > 1, "")
+    return "match", region + "_" + (num // MATCH_BUCKET * (MATCH_BUCKET // 1_000_000)).astype(str) + "M"
+
+def _key_order(kind: str, key: str):
+    """파티션 키 정렬 (오래된 것 -> 최신)"""
+    if kind == "patch":
+        return tuple(int(x) if x.isdigit() else 0 for x in key.split("."))
+    if kind == "match":
+        region, _, start = key.rpartition("_")
+        return (region, int(start.rstrip("M") or 0))
+    return key
+
+def partition_file(key: str) -> str:
+    return "part_" + "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in key) + ".arrow"
+
+def convert_partitioned(src: str, out_dir: str = PARTITION_DIR, chunksize: int = 500_000) -> dict:
+    """CSV -> 파티션별 Arrow 파일 + manifest.json. 카테고리는 파티션마다 따로 수집
+    (matchId 같은 고카디널리티 사전이 모든 파일에 중복되지 않도록). 텍스트/숫자 구분(dtype)은
+    전체 청크에서 한 번 정해 모든 파티션에 같게 적용 — 파티션을 합칠 때 컬럼 종류가 어긋나지 않는다. 반환: manifest"""
+    dtype = None
+    while True:
+        cats, strings, matches, kind, kinds = {}, set(), {}, None, {}
+        for i, chunk in enumerate(_chunks(src, chunksize, dtype)):
+            kind, keys = partition_keys(chunk)
+            _note_kinds(chunk, kinds)
+            if i == 0:
+                _scan_text(chunk, {}, strings, True)
+            for key, part in chunk.groupby(keys.to_numpy(), sort=False):
+                _scan_text(part, cats.setdefault(key, {}), strings, False)
+                matches.setdefault(key, set()).update(part["matchId"].astype(str).unique())
+        rescan, dtype = dtype is None and _mixed_text(kinds), _csv_dtype(src, kinds)
+        if not rescan:
+            break
+    cats = {k: {c: sorted(v) for c, v in d.items()} for k, d in cats.items()}
+
+    os.makedirs(out_dir, exist_ok=True)
+    sinks, writers, rows = {}, {}, {}
+    try:
+        for chunk in _chunks(src, chunksize, dtype):
+            _, keys = partition_keys(chunk)
+            for key, part in chunk.groupby(keys.to_numpy(), sort=False):
+                if key not in sinks:
+                    sinks[key] = pa.OSFile(os.path.join(out_dir, partition_file(key)) + ".tmp", "wb")
+                part = _encode_text(part.reset_index(drop=True), cats[key], strings)
+                writers[key] = _write_batch(sinks[key], writers.get(key), part)   # (writer, schema)
+                rows[key] = rows.get(key, 0) + len(part)
+    finally:
+        for key, sink in sinks.items():
+            if key in writers:
+                writers[key][0].close()
+            sink.close()
+    for key in sinks:
+        path = os.path.join(out_dir, partition_file(key))
+        os.replace(path + ".tmp", path)
+
+    manifest = {"kind": kind, "source": os.path.basename(src), "rows": sum(rows.values()),
+                "partitions": [{"key": k, "file": partition_file(k), "rows": rows[k], "matches": len(matches[k])}
+                               for k in sorted(rows, key=lambda k: _key_order(kind, k))]}
+    tmp = os.path.join(out_dir, "manifest.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, os.path.join(out_dir, "manifest.json"))   # manifest가 마지막 — 완료 후에만 보임
+    return manifest
+
+def read_manifest(out_dir: str = PARTITION_DIR, csv_path: str = None):
+    """파티션 manifest. 없거나 원본 CSV보다 오래됐으면 None"""
+    path = os.path.join(out_dir, "manifest.json")
+    if not os.path.exists(path) or (
+        csv_path and os.path.exists(csv_path) and os.path.getmtime(path) < os.path.getmtime(csv_path)
+    ):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def read_partition(out_dir: str, key: str, columns: list = None) -> pd.DataFrame:
+    """파티션 하나를 메모리 맵으로 열어 필요한 컬럼만 변환"""
+    return read_store(os.path.join(out_dir, partition_file(key)), columns)
+
+def concat_partitions(frames: list) -> pd.DataFrame:
+    """파티션 프레임 합치기 — 파티션마다 다른 카테고리는 정렬된 합집합으로 재코딩(categorical 유지)"""
+    if len(frames) == 1:
+        return frames[0].copy()
+    out = pd.concat(frames, ignore_index=True)
+    for c in frames[0].columns:
+        if isinstance(frames[0][c].dtype, pd.CategoricalDtype) and not isinstance(out[c].dtype, pd.CategoricalDtype):
+            out[c] = union_categoricals([f[c] for f in frames], sort_categories=True)
+    return out
+
+def read_store(path: str = STORE_PATH, columns: list = None) -> pd.DataFrame:
+    """메모리 맵으로 열어 pandas로 변환 (dictionary 컬럼 -> Categorical, 문자열 -> Arrow 백엔드).
+    columns: 변환할 컬럼 (없는 컬럼은 무시, None이면 전체)"""
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    if columns is not None:
+        table = table.select([c for c in columns if c in table.column_names])
+    return table.to_pandas(split_blocks=True,
+                           types_mapper=lambda t: pd.ArrowDtype(t) if pa.types.is_string(t) else None)
+
+def pick_source(store_path: str, csv_path: str) -> str:
+    """저장소가 있고 CSV보다 최신이면 저장소, 아니면 CSV(폴백)"""
+    if os.path.exists(store_path) and (
+        not os.path.exists(csv_path) or os.path.getmtime(store_path) >= os.path.getmtime(csv_path)
+    ):
+        return store_path
+    return csv_path
+
+def load_participants(path: str, columns: list = None) -> pd.DataFrame:
+    """.arrow 저장소면 메모리 맵 로드(columns만), 아니면 CSV 로드 + 정리"""
+    if path.endswith(".arrow"):
+        return read_store(path, columns)
+    return read_players(path)
+
+def _plain(df: pd.DataFrame) -> pd.DataFrame:
+    """비교용 — categorical/Arrow 문자열을 object로, 행 순서는 matchId·teamId·champion 기준"""
+    out = df.copy()
+    for c in out.columns:
+        if isinstance(out[c].dtype, (pd.CategoricalDtype, pd.ArrowDtype)):
+            out[c] = out[c].astype(str).replace("nan", "")
+        elif out[c].dtype == object:
+            out[c] = out[c].fillna("").astype(str)
+    keys = [c for c in ("matchId", "teamId", "champion") if c in out.columns]
+    return out.sort_values(keys, kind="stable").reset_index(drop=True)
+
+def check_conversion(src: str, chunksize: int = 1000) -> dict:
+    """src를 chunksize 청크로 단일 파일/파티션 변환한 결과 vs CSV 로드 — 어긋난 컬럼 목록 (비면 일치)"""
+    expected = _plain(read_players(src))
+    with tempfile.TemporaryDirectory() as tmp:
+        path, part_dir = os.path.join(tmp, "check.arrow"), os.path.join(tmp, "parts")
+        convert_csv(src, path, chunksize=chunksize)
+        m = convert_partitioned(src, part_dir, chunksize=chunksize)
+        got = {"store": _plain(read_store(path)),
+               "partitions": _plain(concat_partitions([read_partition(part_dir, p["key"]) for p in m["partitions"]]))}
+    out = {}
+    for name, df in got.items():
+        bad = [c for c in expected.columns
+               if c not in df.columns or not df[c].reset_index(drop=True).equals(expected[c])]
+        out[name] = {"rows": len(df), "mismatched": bad}
+    out["rows"] = len(expected)
+    return out
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "check":
+        src = sys.argv[2] if len(sys.argv) > 2 else "aram_participants_with_icons_superlight.csv"
+        chunksize = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+        r = check_conversion(src, chunksize)
+        for name in ("store", "partitions"):
+            ok = r[name]["rows"] == r["rows"] and not r[name]["mismatched"]
+            print(f"{name:10s}: {r[name]['rows']:,}/{r['rows']:,} rows, chunksize {chunksize} — "
+                  + ("OK" if ok else f"mismatch {r[name]['mismatched']}"))
+        sys.exit(0 if all(r[n]["rows"] == r["rows"] and not r[n]["mismatched"] for n in ("store", "partitions")) else 1)
+    src = sys.argv[1] if len(sys.argv) > 1 else "aram_participants_with_icons_superlight.csv"
+    out = sys.argv[2] if len(sys.argv) > 2 else STORE_PATH
+    if out.endswith(".arrow"):
+        rows = convert_csv(src, out)
+        print(f"store -> {out}: {rows:,} rows, {os.path.getsize(out)/1e6:.1f} MB")
+    else:
+        m = convert_partitioned(src, out)
+        print(f"partitions -> {out}: {m['rows']:,} rows, {len(m['partitions'])} {m['kind']} partitions")
@@ -0,0 +1,196 @@
+# strategy.py — 5v5 전략 코멘트: 백그라운드 생성 + 조합 키 영구 캐시 + 교체 가능한 백엔드
+# 사용법: python strategy.py serve [포트] [지연 초]   — 로컬 대역 서버 (OpenAI 호환 /v1/chat/completions)
+#   대시보드는 StrategyService.request()로 캐시를 먼저 보고, 없으면 스레드 풀에 생성 작업을 넣은 뒤 바로 돌아간다.
+#   캐시 키 = (아군 정렬, 적군 정렬, 팀 평균 승률 2개, PROMPT_VERSION, 모델) — 프롬프트에 들어가는 값 전부라
+#   같은 프롬프트는 입력 순서와 무관하게 한 번만 생성하고, 승률이 바뀌면(데이터/기간) 새로 생성한다.
+#   백엔드: ARAM_STRATEGY_URL이 있으면 그 주소의 OpenAI 호환 서버(HTTPBackend, 테스트/폐쇄망용 대역 포함),
+#           아니면 API 키로 OpenAI(OpenAIBackend, openai 패키지는 이때만 import).
+import os, sys, json, time, hashlib, threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+STRATEGY_DIR = "strategy_cache"
+PROMPT_VERSION = "v1"    # 프롬프트 문구를 바꾸면 올린다 (이전 답변은 키가 달라져 재사용되지 않음)
+MODEL = "gpt-4o-mini"
+TIMEOUT = 20.0           # 백엔드 호출 제한 시간(초)
+MAX_WORKERS = 2          # 동시 생성 상한
+MAX_PENDING = 8          # 대기 중 작업 상한 (넘으면 busy — 요청을 쌓아 두지 않음)
+ERROR_TTL = 30.0         # 실패 결과를 보여 주는 시간 (그동안 같은 조합을 다시 호출하지 않음)
+STAND_IN_PORT = 8766
+
+def _avg(v):
+    return None if v is None else round(float(v), 2)
+
+def composition_key(ally: list, enemy: list, model: str = MODEL, a_avg=None, b_avg=None) -> str:
+    """아군/적군 순서 무관 조합 + 팀 평균 승률(프롬프트에 들어감) + 프롬프트 버전 + 모델 -> 캐시 키(sha256)"""
+    raw = json.dumps([sorted(ally), sorted(enemy), _avg(a_avg), _avg(b_avg), PROMPT_VERSION, model],
+                     ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def build_prompt(ally: list, enemy: list, a_avg=None, b_avg=None) -> str:
+    """전략 프롬프트 (조합은 정렬해 넣어 같은 키 = 같은 프롬프트)"""
+    a_show = f"{a_avg}%" if a_avg is not None else "N/A"
+    b_show = f"{b_avg}%" if b_avg is not None else "N/A"
+    return f"""
+너는 LoL ARAM 코치다. 아래 정보를 바탕으로 3~5줄 전략을 제시하라.
+
+Team A: {', '.join(sorted(ally))} (avg {a_show})
+Team B: {', '.join(sorted(enemy))} (avg {b_show})
+
+조건:
+- 단순 평균 승률 기반임을 전제(시너지/상성 미반영)
+- 초반/중반/후반 전략 중 핵심 1~2개
+- 과도한 확신/허풍 금지, 간결하게
+""".strip()
+
+# ===== 백엔드 =====
+def _chat_request(model: str, prompt: str) -> dict:
+    return {"model": model, "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.6, "max_tokens": 220}
+
+class HTTPBackend:
+    """OpenAI 호환 chat completions 엔드포인트 (표준 라이브러리만 사용)"""
+
+    def __init__(self, base_url: str, model: str = MODEL, api_key: str = ""):
+        self.url = base_url.rstrip("/") + "/v1/chat/completions"
+        self.model, self.api_key = model, api_key
+
+    def complete(self, prompt: str, timeout: float = TIMEOUT) -> str:
+        req = urllib.request.Request(self.url, data=json.dumps(_chat_request(self.model, prompt)).encode("utf-8"),
+                                     headers={"Content-Type": "application/json",
+                                              **({"Authorization": f"Bearer {self.api_key}"} if self.api_key else {})})
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            body = json.loads(resp.read().decode("utf-8"))
+        return body["choices"][0]["message"]["content"].strip()
+
+class OpenAIBackend:
+    """openai 패키지 클라이언트 (세션별 키, 재시도 없음 — 제한 시간은 TIMEOUT)"""
+
+    def __init__(self, api_key: str, model: str = MODEL, base_url: str = None):
+        self.api_key, self.model, self.base_url = api_key, model, base_url
+
+    def complete(self, prompt: str, timeout: float = TIMEOUT) -> str:
+        import openai   # 키가 입력됐을 때만 로드
+        client = openai.OpenAI(api_key=self.api_key, base_url=self.base_url, timeout=timeout, max_retries=0)
+        resp = client.chat.completions.create(**_chat_request(self.model, prompt))
+        return resp.choices[0].message.content.strip()
+
+def pick_backend(api_key: str = None):
+    """ARAM_STRATEGY_URL(로컬/대역 서버) > OpenAI 키 > 없음(None)"""
+    url = os.environ.get("ARAM_STRATEGY_URL")
+    if url:
+        return HTTPBackend(url, os.environ.get("ARAM_STRATEGY_MODEL", MODEL), api_key or "")
+    if api_key:
+        return OpenAIBackend(api_key)
+    return None
+
+# ===== 캐시 + 백그라운드 생성 =====
+class StrategyService:
+    """조합별 전략 코멘트. request()는 기다리지 않고 상태만 돌려준다:
+    ("done", 답변) / ("pending", None) / ("error", 메시지) / ("busy", None)"""
+
+    def __init__(self, cache_dir: str = STRATEGY_DIR, workers: int = MAX_WORKERS, timeout: float = TIMEOUT,
+                 max_pending: int = MAX_PENDING):
+        self.cache_dir, self.timeout, self.max_pending = cache_dir, timeout, max_pending
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="strategy")
+        self.lock = threading.Lock()
+        self.inflight = {}   # key -> Future
+        self.errors = {}     # key -> (시각, 메시지)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def cached(self, key: str):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["answer"]
+
+    def _store(self, key: str, ally: list, enemy: list, avgs: tuple, model: str, answer: str) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"ally": sorted(ally), "enemy": sorted(enemy), "avg": list(avgs), "prompt_version": PROMPT_VERSION,
+                       "model": model, "answer": answer, "created": int(time.time())}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _run(self, key: str, backend, ally: list, enemy: list, avgs: tuple, prompt: str) -> str:
+        answer = backend.complete(prompt, timeout=self.timeout)
+        self._store(key, ally, enemy, avgs, getattr(backend, "model", ""), answer)
+        return answer
+
+    def _reap(self) -> None:
+        """끝난 작업 정리 (성공은 디스크 캐시에 있음, 실패는 ERROR_TTL 동안 기록) — lock 안에서 호출"""
+        for key, fut in list(self.inflight.items()):
+            if fut.done():
+                del self.inflight[key]
+                err = fut.exception()
+                if err is not None:
+                    self.errors[key] = (time.time(), f"{type(err).__name__}: {err}")
+
+    def request(self, ally: list, enemy: list, backend, a_avg=None, b_avg=None) -> tuple:
+        key = composition_key(ally, enemy, getattr(backend, "model", ""), a_avg, b_avg)
+        answer = self.cached(key)
+        if answer is not None:
+            return "done", answer
+        with self.lock:
+            self._reap()
+            if key in self.inflight:
+                return "pending", None
+            t_err, msg = self.errors.get(key, (0.0, ""))
+            if time.time() - t_err < ERROR_TTL:
+                return "error", msg
+            answer = self.cached(key)   # lock을 기다리는 사이 끝났을 수 있음
+            if answer is not None:
+                return "done", answer
+            if len(self.inflight) >= self.max_pending:
+                return "busy", None
+            self.errors.pop(key, None)
+            self.inflight[key] = self.pool.submit(self._run, key, backend, ally, enemy, (_avg(a_avg), _avg(b_avg)),
+                                                  build_prompt(ally, enemy, a_avg, b_avg))
+        return "pending", None
+
+# ===== 로컬 대역 서버 (네트워크 없이 대시보드/테스트 구동) =====
+class StandInHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        n = int(self.headers.get("Content-Length", 0))
+        req = json.loads(self.rfile.read(n).decode("utf-8"))
+        time.sleep(self.delay)
+        lines = req["messages"][-1]["content"].splitlines()
+        teams = [ln for ln in lines if ln.startswith("Team ")]
+        text = "\n".join([f"[stand-in {req.get('model', '')}] " + " / ".join(teams),
+                          "- 초반: 포킹 교환 후 체력 우위일 때만 진입",
+                          "- 중후반: 핵심 딜러 보호, 한타는 궁극기 쿨 맞춰서"])
+        body = json.dumps({"choices": [{"message": {"role": "assistant", "content": text}}]},
+                          ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass
+
+def make_stand_in(host: str = "127.0.0.1", port: int = STAND_IN_PORT, delay: float = 0.0) -> ThreadingHTTPServer:
+    handler = type("BoundStandIn", (StandInHandler,), {"delay": delay})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        port  = int(sys.argv[2]) if len(sys.argv) > 2 else STAND_IN_PORT
+        delay = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+        server = make_stand_in(port=port, delay=delay)
+        print(f"stand-in -> http://127.0.0.1:{port}  (ARAM_STRATEGY_URL=http://127.0.0.1:{port})")
+        server.serve_forever()
+    else:
+        print("usage: python strategy.py serve [port] [delay]")
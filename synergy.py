@@ -0,0 +1,60 @@
+# synergy.py — 챔피언 시너지(아군) / 상성(적군) 행렬
+# team_champs / enemy_champs 문자열을 한 번만 파싱해 정수 코드 5슬롯 배열로 바꾸고,
+# (자기 챔피언 × 상대 챔피언) 게임수/승수 행렬을 bincount 한 번으로 만든다.
+import numpy as np
+import pandas as pd
+
+from analysis import CHAMP_LIST_RE
+
+SLOTS = 5
+
+def encode_champ_lists(s: pd.Series, ids: dict) -> np.ndarray:
+    """리스트 문자열 컬럼 -> (행 × 5) 챔피언 코드 (빈 칸/미등록 -1). 고유 문자열만 파싱"""
+    codes, uniques = pd.factorize(s)
+    table = np.full((len(uniques) + 1, SLOTS), -1, dtype=np.int16)   # 마지막 행: 결측
+    for k, u in enumerate(uniques):
+        names = CHAMP_LIST_RE.findall(str(u))[:SLOTS]
+        table[k, :len(names)] = [ids.get(n, -1) for n in names]
+    return table[codes]
+
+def champion_ids(df: pd.DataFrame) -> list:
+    """행렬 축 — 참가자 champion 컬럼의 정렬된 고유값"""
+    return sorted(str(c) for c in pd.unique(df["champion"]) if str(c) != "")
+
+def pair_counts(me: np.ndarray, others: np.ndarray, win: np.ndarray, k: int):
+    """행마다 (me, others[슬롯]) 쌍을 세어 (k × k) 게임수/승수 행렬. 자기 자신/빈 칸 제외"""
+    valid = (others >= 0) & (others != me[:, None]) & (me[:, None] >= 0)
+    flat = (me[:, None].astype(np.int64) * k + others)[valid]
+    wins = np.broadcast_to(win[:, None], others.shape)[valid]
+    games = np.bincount(flat, minlength=k * k).reshape(k, k)
+    won = np.bincount(flat, weights=wins, minlength=k * k).reshape(k, k).astype(np.int64)
+    return games, won
+
+def build_matrices(df: pd.DataFrame, names: list = None) -> dict:
+    """아군 시너지 / 적군 상성 행렬 (행: 자기 챔피언, 열: 함께한/상대한 챔피언).
+    names: 축 고정 (필터된 부분 행을 전체 행렬과 같은 축으로 셀 때)"""
+    names = champion_ids(df) if names is None else names
+    ids = {n: i for i, n in enumerate(names)}
+    k = len(names)
+    codes, uniques = pd.factorize(df["champion"])
+    me = np.append([ids.get(str(u), -1) for u in uniques], -1).astype(np.int64)[codes]
+    win = df["win_clean"].to_numpy(dtype=np.int64)
+    out = {"names": names}
+    for side, col in [("ally", "team_champs"), ("enemy", "enemy_champs")]:
+        if col in df.columns:
+            games, wins = pair_counts(me, encode_champ_lists(df[col], ids).astype(np.int64), win, k)
+        else:
+            games = wins = np.zeros((k, k), dtype=np.int64)
+        out[f"{side}_games"], out[f"{side}_wins"] = games, wins
+    return out
+
+def champion_pairs(mats: dict, champion: str, side: str) -> pd.DataFrame:
+    """선택 챔피언의 아군(side="ally") 또는 상대(side="enemy")별 games/wins"""
+    names = mats["names"]
+    if champion not in names:
+        return pd.DataFrame(columns=["champion","games","wins"])
+    i = names.index(champion)
+    t = pd.DataFrame({"champion": names,
+                      "games": mats[f"{side}_games"][i],
+                      "wins": mats[f"{side}_wins"][i]})
+    return t[t["games"] > 0].reset_index(drop=True)
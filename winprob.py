@@ -0,0 +1,137 @@
+# winprob.py — 5v5 승리 확률 모델 (챔피언 지표 로지스틱 회귀)
+# P(A 승) = σ(b + Σ_{c∈A} w_c − Σ_{c∈B} w_c). 팀 단위 표본(매치×팀)으로 오프라인 학습 후
+# 계수만 JSON으로 저장하고, 대시보드는 조합 여러 개를 NumPy 인덱싱 한 번으로 채점한다.
+# 사용법: python winprob.py [참가자 CSV 또는 .arrow] [출력 JSON]
+import os, sys, json, time
+import numpy as np
+import pandas as pd
+
+from synergy import SLOTS, champion_ids, encode_champ_lists
+
+MODEL_PATH = "winprob_model.json"
+PRIOR = 20.0    # 계수 가우시안 사전분포 정밀도 (표본이 적은 챔피언의 과적합 방지)
+CHUNK = 100_000 # 헤시안 누적 시 표본 청크 크기
+
+def team_samples(df: pd.DataFrame, names: list):
+    """참가자 행 -> 팀 단위 표본 (아군 코드 n×5, 적군 코드 n×5, 승패 n)"""
+    team_key = ["matchId", "teamId"] if {"matchId","teamId"}.issubset(df.columns) else ["matchId", "team_champs"]
+    teams = df.drop_duplicates(team_key)
+    ids = {n: i for i, n in enumerate(names)}
+    ally = encode_champ_lists(teams["team_champs"], ids).astype(np.int64)
+    enemy = encode_champ_lists(teams["enemy_champs"], ids).astype(np.int64)
+    return ally, enemy, teams["win_clean"].to_numpy(dtype=np.float64)
+
+def _logits(w: np.ndarray, b: float, ally: np.ndarray, enemy: np.ndarray) -> np.ndarray:
+    w0 = np.append(w, 0.0)          # 코드 -1(빈 칸/미등록) -> 0
+    return b + w0[ally].sum(axis=1) - w0[enemy].sum(axis=1)
+
+def _design(ally: np.ndarray, enemy: np.ndarray, k: int):
+    """희소 설계행렬 (행마다 열 번호 11개, 부호 11개): 아군 +1, 적군 −1, 절편(열 k) +1.
+    빈 칸은 더미 열 k+1, 부호 0"""
+    idx = np.concatenate([ally, enemy, np.full((len(ally), 1), k)], axis=1)
+    sgn = np.concatenate([np.ones_like(ally), -np.ones_like(enemy), np.ones((len(ally), 1), np.int64)], axis=1)
+    sgn = np.where(idx < 0, 0, sgn).astype(np.float64)
+    return np.where(idx < 0, k + 1, idx), sgn
+
+def fit(ally: np.ndarray, enemy: np.ndarray, y: np.ndarray, k: int,
+        prior: float = PRIOR, max_iter: int = 25, tol: float = 1e-8):
+    """로그손실 합 + (prior/2)||w||² 최소화 — 뉴턴(IRLS). 헤시안은 청크별 (열 쌍) bincount로 누적"""
+    n, m = len(y), k + 2
+    if n == 0:
+        return np.zeros(k), 0.0, 0
+    idx, sgn = _design(ally, enemy, k)
+    reg = np.full(k + 1, prior)
+    reg[k] = 1e-9                                   # 절편은 정규화하지 않음
+    theta = np.zeros(m)                             # [w(k), b, 더미]
+    for it in range(1, max_iter + 1):
+        z = (theta[idx] * sgn).sum(axis=1)
+        p = 1.0 / (1.0 + np.exp(-z))
+        grad = np.bincount(idx.ravel(), weights=((p - y)[:, None] * sgn).ravel(), minlength=m)[:k + 1]
+        grad += reg * theta[:k + 1]
+        hess = np.zeros(m * m)
+        d = p * (1 - p)
+        for s in range(0, n, CHUNK):
+            i, sg, dd = idx[s:s + CHUNK], sgn[s:s + CHUNK], d[s:s + CHUNK]
+            pair = (i[:, :, None] * m + i[:, None, :]).ravel()
+            wgt = (dd[:, None, None] * sg[:, :, None] * sg[:, None, :]).ravel()
+            hess += np.bincount(pair, weights=wgt, minlength=m * m)
+        hess = hess.reshape(m, m)[:k + 1, :k + 1] + np.diag(reg)
+        step = np.linalg.solve(hess, grad)
+        theta[:k + 1] -= step
+        if np.abs(step).max() < tol:
+            break
+    return theta[:k], float(theta[k]), it
+
+def log_loss(w, b, ally, enemy, y) -> float:
+    p = np.clip(1.0 / (1.0 + np.exp(-_logits(w, b, ally, enemy))), 1e-12, 1 - 1e-12)
+    return float(-(y * np.log(p) + (1 - y) * np.log(1 - p)).mean())
+
+def train(df: pd.DataFrame, prior: float = PRIOR) -> dict:
+    names = champion_ids(df)
+    ally, enemy, y = team_samples(df, names)
+    t0 = time.perf_counter()
+    w, b, iters = fit(ally, enemy, y, len(names), prior=prior)
+    return {
+        "champions": names,
+        "coef": [round(float(x), 6) for x in w],
+        "intercept": round(b, 6),
+        "prior": prior,
+        "samples": int(len(y)),
+        "iterations": iters,
+        "fit_seconds": round(time.perf_counter() - t0, 3),
+        "log_loss": round(log_loss(w, b, ally, enemy, y), 5),
+    }
+
+def save_model(model: dict, path: str = MODEL_PATH) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(model, f, ensure_ascii=False)
+
+def load_model(path: str = MODEL_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+# ===== 채점 =====
+class WinModel:
+    """계수 로드 후 조합 배치 채점 (행마다 아군 5 / 적군 5 챔피언 이름)"""
+
+    def __init__(self, model: dict):
+        self.names = list(model["champions"])
+        self.ids = {n: i for i, n in enumerate(self.names)}
+        self.w0 = np.append(np.asarray(model["coef"], dtype=np.float64), 0.0)   # 미등록 -> 0
+        self.b = float(model["intercept"])
+
+    def encode(self, comps: list) -> np.ndarray:
+        return np.array([[self.ids.get(c, -1) for c in comp] for comp in comps], dtype=np.int64).reshape(-1, SLOTS)
+
+    def score_codes(self, ally: np.ndarray, enemy: np.ndarray) -> np.ndarray:
+        """(m×5, m×5) 코드 -> 아군 승리 확률 m개"""
+        z = self.b + self.w0[ally].sum(axis=1) - self.w0[enemy].sum(axis=1)
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def score(self, ally: list, enemy: list) -> float:
+        return float(self.score_codes(self.encode([ally]), self.encode([enemy]))[0])
+
+    def best_fifth(self, allies4: list, enemy: list, top: int = 10) -> pd.DataFrame:
+        """아군 4명 + 적군 5명 고정, 남은 모든 챔피언을 5번째 픽으로 한 번에 채점"""
+        taken = set(allies4) | set(enemy)
+        cand = [n for n in self.names if n not in taken]
+        if not cand:
+            return pd.DataFrame(columns=["champion","win_prob"])
+        base = self.encode([allies4 + [cand[0]]])
+        ally = np.repeat(base, len(cand), axis=0)
+        ally[:, SLOTS - 1] = [self.ids[c] for c in cand]
+        enemy_codes = np.repeat(self.encode([enemy]), len(cand), axis=0)
+        p = self.score_codes(ally, enemy_codes)
+        out = pd.DataFrame({"champion": cand, "win_prob": (p * 100).round(2)})
+        return out.sort_values("win_prob", ascending=False).head(top).reset_index(drop=True)
+
+if __name__ == "__main__":
+    from store import load_participants
+    src = sys.argv[1] if len(sys.argv) > 1 else "aram_participants_with_icons_superlight.csv"
+    out = sys.argv[2] if len(sys.argv) > 2 else MODEL_PATH
+    model = train(load_participants(src))
+    save_model(model, out)
+    print(f"model -> {out}: {model['samples']:,} team samples, {len(model['champions'])} champions, "
+          f"{model['iterations']} iters in {model['fit_seconds']}s, log_loss {model['log_loss']}")